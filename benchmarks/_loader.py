@@ -0,0 +1,34 @@
+"""Import integration modules without Home Assistant.
+
+The package ``__init__`` modules import Home Assistant; the protocol,
+checksum and parser modules do not. Registering the packages as bare
+namespaces lets the benchmarks import those modules directly.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "custom_components.home_energy_hub"
+PACKAGE_DIR = ROOT / "custom_components" / "home_energy_hub"
+
+
+def _register(name: str, path: Path) -> None:
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
+
+
+def load(module: str):
+    """Return ``custom_components.home_energy_hub.<module>``."""
+    _register("custom_components", ROOT / "custom_components")
+    _register(PACKAGE, PACKAGE_DIR)
+    for init in PACKAGE_DIR.rglob("__init__.py"):
+        package_dir = init.parent
+        if package_dir != PACKAGE_DIR:
+            relative = package_dir.relative_to(PACKAGE_DIR).parts
+            _register(".".join([PACKAGE, *relative]), package_dir)
+    return importlib.import_module(f"{PACKAGE}.{module}")
@@ -0,0 +1,50 @@
+"""Timing and memory measurements shared by the benchmarks."""
+
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+
+def latency_stats(func: Callable[[], object], rounds: int) -> Dict[str, float]:
+    """Call *func* *rounds* times and return per-call latency statistics."""
+    samples: List[int] = []
+    clock = time.perf_counter_ns
+    for _ in range(rounds):
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    samples.sort()
+    total = sum(samples)
+    return {
+        "calls_per_sec": rounds / (total / 1e9) if total else float("inf"),
+        "mean_us": total / rounds / 1e3,
+        "p50_us": samples[len(samples) // 2] / 1e3,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1e3,
+        "max_us": samples[-1] / 1e3,
+    }
+
+
+def memory_profile(func: Callable[[], object], iterations: int = 200) -> Dict[str, float]:
+    """Measure memory use of *func* with tracemalloc.
+
+    CPython exposes no cumulative allocation counter outside debug builds,
+    so this reports the peak transient memory of one call (temporaries
+    included) and the number of memory blocks its result keeps alive.
+    """
+    tracemalloc.start()
+    try:
+        func()  # warm caches
+        before = tracemalloc.take_snapshot()
+        results = []
+        peak = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            current_before, _ = tracemalloc.get_traced_memory()
+            results.append(func())
+            _, top = tracemalloc.get_traced_memory()
+            peak = max(peak, top - current_before)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {"peak_bytes": peak, "retained_blocks": retained / iterations}
@@ -0,0 +1,110 @@
+"""Bus throughput: full polls per second through the real connectors.
+
+    python benchmarks/bench_bus.py [--packs N] [--seconds S] [--latency L] [--echo] [--turnaround T]
+
+Starts the BMS simulator in-process and polls every pack through the V2
+serial and TCP clients and the V3 serial and TCP functions. Reports
+pack polls per second and p50/p99 poll latency per transport. The
+"shared" case polls V2 and V3 concurrently over one TCP bridge, so both
+go through the same bus arbiter. The serial cases need pyserial; the V3
+serial case also prints the link calibration it ran on first use.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from _loader import load
+from bms_simulator import V3_BLOCKS, BmsSimulator
+
+v3_parser = load("integrations.seplos_v3.data_parser")
+
+
+def _percentile(samples, fraction: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+
+async def _run(label: str, poll, addresses, seconds: float) -> None:
+    latencies = []
+    complete = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for address in addresses:
+            start = time.perf_counter()
+            responses = await poll(address)
+            latencies.append(time.perf_counter() - start)
+            complete += all(responses)
+    rate = len(latencies) / seconds
+    print(f"{label:<14} {rate:8.1f} pack polls/s  p50 {_percentile(latencies, 0.5) * 1e3:7.1f} ms"
+          f"  p99 {_percentile(latencies, 0.99) * 1e3:7.1f} ms  complete {complete}/{len(latencies)}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    simulator = BmsSimulator(args.packs, latency=args.latency, echo=args.echo,
+                             noise=args.noise, drop=args.drop, turnaround=args.turnaround)
+    tcp_port = await simulator.start_tcp()
+    v2_addresses = [f"0x{a:02X}" for a in simulator.v2_packs]
+    v3_commands = {
+        address: [v3_parser.build_read_command(address, start, count) for start, count in V3_BLOCKS.items()]
+        for address in simulator.v3_packs
+    }
+    config = {}
+
+    try:
+        import serial  # noqa: F401
+    except ImportError:
+        serial = None
+        print("pyserial not installed: skipping the serial cases")
+
+    try:
+        if serial is not None:
+            pty_path = await simulator.start_pty()
+            usb_serial = load("connectors.usb_serial")
+            client = usb_serial.SeplosV2SerialClient(pty_path)
+            await client.connect()
+            await _run("V2 serial", lambda a: client.read_seplos_data(config, address=a),
+                       v2_addresses, args.seconds)
+            await client.close()
+
+        telnet_serial = load("connectors.telnet_serial")
+        client = telnet_serial.SeplosV2TelnetClient("127.0.0.1", tcp_port)
+        await client.connect()
+        await _run("V2 TCP", lambda a: client.read_seplos_data(config, address=a),
+                   v2_addresses, args.seconds)
+
+        v3_serial = load("connectors.seplos_v3_serial")
+        if serial is not None:
+            await _run("V3 serial", lambda a: v3_serial.send_serial_commands_async(v3_commands[a], pty_path),
+                       list(v3_commands), args.seconds)
+            print(f"{'':<14} calibration {v3_serial._CALIBRATIONS.get(f'serial:{pty_path}')}")
+        await _run("V3 TCP", lambda a: v3_serial.send_telnet_commands_async(v3_commands[a], "127.0.0.1", tcp_port),
+                   list(v3_commands), args.seconds)
+
+        # V2 and V3 pollers contending for one bridge
+        bus = load("connectors.bus")
+        v3_bus = bus.tcp_bus("127.0.0.1", tcp_port)
+        await asyncio.gather(
+            _run("shared V2", lambda a: client.read_seplos_data(config, address=a), v2_addresses, args.seconds),
+            _run("shared V3", lambda a: v3_serial.send_modbus_commands(v3_bus, v3_commands[a], 3),
+                 list(v3_commands), args.seconds),
+        )
+        print(f"shared bus      {v3_bus.stats}")
+        await client.close()
+        await bus.async_release_bus(v3_bus)
+    finally:
+        await simulator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packs", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--echo", action="store_true")
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--drop", type=float, default=0.0)
+    parser.add_argument("--turnaround", type=float, default=0.0)
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,71 @@
+"""Micro-benchmark: CRC-16/Modbus implementations.
+
+    python benchmarks/bench_crc.py [--frames N]
+
+Compares the previous bit-by-bit loop with the shared table-driven
+implementation (and crcmod when installed) on V3 PIA/PIB-sized frames.
+"""
+
+import argparse
+import os
+import struct
+import timeit
+
+from _loader import load
+
+checksum = load("connectors.checksum")
+
+
+def bitwise_crc16(data: bytes) -> int:
+    """The implementation previously duplicated in the V3 modules."""
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return crc
+
+
+def make_frames(count: int) -> list:
+    """Random PIA (41 byte) and PIB (57 byte) responses with valid CRCs."""
+    frames = []
+    for i in range(count):
+        data_len = 0x24 if i % 2 == 0 else 0x34
+        payload = bytes((0x01, 0x04, data_len)) + os.urandom(data_len)
+        frames.append(payload + struct.pack("<H", bitwise_crc16(payload)))
+    return frames
+
+
+def bench(label: str, func, frames: list, repeat: int) -> None:
+    best = min(timeit.repeat(lambda: func(frames), number=1, repeat=repeat))
+    rate = len(frames) / best
+    print(f"{label:<28} {best * 1e3:9.2f} ms  {rate:12,.0f} frames/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames)
+    table_crc16 = checksum._table_crc16
+
+    for frame in frames[:100]:
+        assert table_crc16(frame) == bitwise_crc16(frame) == checksum.modbus_crc16(frame)
+
+    print(f"{args.frames} frames, backend: {checksum.CRC_BACKEND}")
+    bench("bitwise (previous)", lambda fs: [bitwise_crc16(f) for f in fs], frames, args.repeat)
+    bench("table", lambda fs: [table_crc16(f) for f in fs], frames, args.repeat)
+    if checksum.CRC_BACKEND != "table":
+        bench(checksum.CRC_BACKEND, lambda fs: [checksum.modbus_crc16(f) for f in fs],
+              frames, args.repeat)
+    bench("frame_crc_ok", lambda fs: [checksum.frame_crc_ok(f) for f in fs], frames, args.repeat)
+    bench("verify_frames (batch)", checksum.verify_frames, frames, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
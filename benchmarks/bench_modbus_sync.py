@@ -0,0 +1,131 @@
+"""Micro-benchmark: V3 Modbus RTU response synchronisation.
+
+    python benchmarks/bench_modbus_sync.py [--frames N] [--chunk B]
+
+Feeds PIA/PIB responses, each behind an RS485 echo and some line noise,
+to three synchronisers:
+
+  per-byte   the old pyserial reader: one ser.read() per header byte
+  buffered   the first buffered extractor, run on every received chunk
+  scanner    connectors.modbus_rtu.ModbusFrameScanner, run the way
+             FrameStream.read_matching does (only once the bytes it
+             asked for have arrived)
+
+and reports reads (or reader wake-ups) per frame, time per frame and
+frames lost. The per-byte reader loses a frame whenever a noise byte
+equals the slave address, since it drops the real address byte after it.
+--chunk sets how many bytes the driver delivers per read; at 19200 baud
+the event loop typically sees a few bytes at a time.
+"""
+
+import argparse
+import logging
+import os
+import random
+import time
+
+import legacy_v3
+from _loader import load
+
+checksum = load("connectors.checksum")
+modbus_rtu = load("connectors.modbus_rtu")
+
+BLOCKS = ((0x1000, 0x12), (0x1100, 0x1A))
+
+
+def _with_crc(frame: bytes) -> bytes:
+    return frame + checksum.modbus_crc(frame)
+
+
+def make_exchanges(count: int, rng: random.Random) -> list:
+    """Return (request, received bytes, expected response) triples."""
+    exchanges = []
+    for i in range(count):
+        start, registers = BLOCKS[i % 2]
+        request = _with_crc(bytes((0x01, 0x04, start >> 8, start & 0xFF, 0, registers)))
+        response = _with_crc(bytes((0x01, 0x04, 2 * registers)) + os.urandom(2 * registers))
+        noise = bytes(rng.randrange(256) for _ in range(rng.randint(0, 3)))
+        exchanges.append((request, request + noise + response, response))
+    return exchanges
+
+
+class _FakeSerial:
+    """Just enough of serial.Serial for the per-byte reader."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+        self.reads = 0
+
+    def read(self, size: int = 1) -> bytes:
+        self.reads += 1
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += size
+        return chunk
+
+
+def per_byte(exchanges, chunk: int):
+    reads = lost = 0
+    for request, received, response in exchanges:
+        ser = _FakeSerial(received)
+        ser.read(len(request))  # the old fixed-length echo read
+        lost += legacy_v3._read_modbus_frame(ser, 0x01, len(response) - 5, 0.001) != response
+        reads += ser.reads
+    return reads, lost
+
+
+def buffered(exchanges, chunk: int):
+    calls = lost = 0
+    for request, received, response in exchanges:
+        buf = bytearray()
+        for i in range(0, len(received), chunk):
+            buf += received[i:i + chunk]
+            calls += 1
+            frame = legacy_v3._take_modbus_frame(buf, 0x01, len(response) - 5)
+            if frame:
+                break
+        lost += frame != response
+    return calls, lost
+
+
+def scanner(exchanges, chunk: int):
+    calls = lost = 0
+    for request, received, response in exchanges:
+        scan = modbus_rtu.ModbusFrameScanner(request)
+        buf = bytearray()
+        wanted = 0
+        for i in range(0, len(received), chunk):
+            buf += received[i:i + chunk]
+            if len(buf) < wanted:
+                continue
+            calls += 1
+            frame = scan(buf)
+            if isinstance(frame, int):
+                wanted = frame
+            elif frame:
+                break
+            else:
+                wanted = 0
+        lost += frame != response
+    return calls, lost
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--chunk", type=int, default=4, help="bytes per driver read")
+    args = parser.parse_args()
+    # The per-byte reader logs every lost frame
+    logging.basicConfig(level=logging.CRITICAL)
+
+    exchanges = make_exchanges(args.frames, random.Random(0))
+    print(f"{'sync':<10}{'reads/frame':>13}{'us/frame':>11}{'lost':>7}")
+    for name, func in (("per-byte", per_byte), ("buffered", buffered), ("scanner", scanner)):
+        start = time.perf_counter()
+        reads, lost = func(exchanges, args.chunk)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10}{reads / args.frames:>13.1f}{elapsed / args.frames * 1e6:>11.2f}{lost:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Replay the fixture corpus through the V2 and V3 parsers.
+
+    python benchmarks/bench_replay.py [--rounds N] [--json FILE] [--compare FILE]
+
+Runs offline, without Home Assistant. Every frame in fixtures/ is parsed
+on its own, and every poll (the frames sharing a poll number) is parsed
+the way the coordinators do it. For each case the harness reports
+parses/s, p50/p99 latency, peak memory per parse and retained blocks, plus
+how many frames of each kind (valid, corrupt, truncated, ...) yielded data.
+
+--json writes the results; --compare checks them against an earlier
+--json run and exits non-zero if a case lost more than --tolerance of its
+throughput.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Union
+
+from _loader import load
+from _stats import latency_stats, memory_profile
+
+v2_processor = load("integrations.seplos_v2.modbus_processor")
+v3_parser = load("integrations.seplos_v3.data_parser")
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+V2_CONFIG = {"name_prefix": "Seplos "}
+
+
+class Frame(NamedTuple):
+    poll: int
+    kind: str  # CID2 for V2, register block for V3
+    case: str
+    frame: Union[str, bytes]  # ASCII frame for V2, raw bytes for V3
+
+
+def load_fixture(name: str, binary: bool = False) -> List[Frame]:
+    """Read a fixture file: poll, kind, case, frame per line.
+
+    With *binary* the hex frames are converted to bytes once, here, the
+    way the V3 transport delivers them (a truncated frame ending in half
+    a byte loses that nibble).
+    """
+    frames = []
+    for line in (FIXTURES / name).read_text().splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        poll, kind, case, frame = line.split()
+        frames.append(Frame(int(poll), kind, case, bytes.fromhex(frame[:len(frame) & ~1]) if binary else frame))
+    return frames
+
+
+def group_polls(frames: List[Frame]) -> List[List[Frame]]:
+    polls = defaultdict(list)
+    for frame in frames:
+        polls[frame.poll].append(frame)
+    return [polls[poll] for poll in sorted(polls)]
+
+
+def parse_v3_frame(frame: Frame) -> dict:
+    return v3_parser.decode_response(frame.kind, frame.frame)
+
+
+def parse_v3_poll(poll: List[Frame]):
+    """Merge the blocks of one poll, as the V3 coordinator does."""
+    return v3_parser.merge_blocks({frame.kind: parse_v3_frame(frame) for frame in poll})
+
+
+def build_cases() -> Dict[str, dict]:
+    """Return {case name: {"func", "frames", optional "units"}}."""
+    v2_frames = load_fixture("seplos_v2.txt")
+    v3_frames = load_fixture("seplos_v3.txt", binary=True)
+    cases = {}
+
+    def replay(frames, parse):
+        return lambda: [parse(frame) for frame in frames]
+
+    for cid2 in ("42", "44", "47", "51"):
+        frames = [f for f in v2_frames if f.kind == cid2]
+        cases[f"v2 {cid2}H frames"] = {
+            "func": replay(frames, lambda f: v2_processor.parse_seplos_section(f.kind, f.frame, V2_CONFIG)),
+            "frames": frames,
+        }
+    v2_polls = group_polls(v2_frames)
+    cases["v2 polls (parse_seplos_response)"] = {
+        "func": lambda: [v2_processor.parse_seplos_response([f.frame for f in poll], V2_CONFIG)
+                         for poll in v2_polls],
+        "frames": v2_frames,
+        "units": len(v2_polls),
+    }
+
+    for block in ("pia", "pib"):
+        frames = [f for f in v3_frames if f.kind == block]
+        cases[f"v3 {block.upper()} frames"] = {"func": replay(frames, parse_v3_frame), "frames": frames}
+    v3_polls = group_polls(v3_frames)
+    cases["v3 polls (decode_response)"] = {
+        "func": lambda: [parse_v3_poll(poll) for poll in v3_polls],
+        "frames": v3_frames,
+        "units": len(v3_polls),
+    }
+    return cases
+
+
+def frame_outcomes(frames: List[Frame], is_v2: bool) -> Dict[str, str]:
+    """Return {case: "parsed/total"} for a list of fixture frames."""
+    totals = defaultdict(lambda: [0, 0])
+    for frame in frames:
+        if is_v2:
+            result = v2_processor.parse_seplos_section(frame.kind, frame.frame, V2_CONFIG)
+        else:
+            result = parse_v3_frame(frame)
+        totals[frame.case][0] += bool(result)
+        totals[frame.case][1] += 1
+    return {case: f"{parsed}/{total}" for case, (parsed, total) in sorted(totals.items())}
+
+
+def run(rounds: int) -> Dict[str, dict]:
+    results = {}
+    for name, case in build_cases().items():
+        units = case.get("units", len(case["frames"]))
+        latency = latency_stats(case["func"], rounds)
+        memory = memory_profile(case["func"], iterations=20)
+        results[name] = {
+            "parses_per_sec": latency["calls_per_sec"] * units,
+            "p50_us": latency["p50_us"] / units,
+            "p99_us": latency["p99_us"] / units,
+            "peak_bytes": memory["peak_bytes"] / units,
+            "retained_blocks": memory["retained_blocks"] / units,
+            "outcomes": frame_outcomes(case["frames"], name.startswith("v2")),
+        }
+    return results
+
+
+def report(results: Dict[str, dict]) -> None:
+    print(f"{'case':<38}{'parses/s':>12}{'p50 us':>9}{'p99 us':>9}{'peak B':>9}{'blocks':>8}  parsed")
+    for name, r in results.items():
+        outcomes = " ".join(f"{case}={count}" for case, count in r["outcomes"].items())
+        print(f"{name:<38}{r['parses_per_sec']:>12,.0f}{r['p50_us']:>9.2f}{r['p99_us']:>9.2f}"
+              f"{r['peak_bytes']:>9,.0f}{r['retained_blocks']:>8.1f}  {outcomes}")
+
+
+def compare(results: Dict[str, dict], baseline_path: str, tolerance: float) -> bool:
+    """Print throughput changes against a baseline; return False on regression."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    ok = True
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["parses_per_sec"]
+        change = r["parses_per_sec"] / before - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{name:<38}{change:>+9.1%}{flag}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--json", metavar="FILE", help="write results to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="compare with an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed throughput loss for --compare (default 0.2)")
+    args = parser.parse_args()
+
+    # Corrupt and truncated frames log errors by design
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = run(args.rounds)
+    report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        print()
+        return 0 if compare(results, args.compare, args.tolerance) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
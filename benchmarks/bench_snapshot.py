@@ -0,0 +1,125 @@
+"""Micro-benchmark: per-refresh pack data, dicts vs PackSnapshot.
+
+    python benchmarks/bench_snapshot.py [--packs N] [--iterations N]
+
+Builds the coordinator data for --packs packs from already parsed
+sections, the way each refresh does, and then reads every entity value
+of every pack the way the entities do. Compares the previous dict merge
+(a nested state/attributes dict per V2 cell, a float per cell and
+temperature, see legacy_v2.py) with PackSnapshot. Reports time per
+refresh, time to read all entities, and per refresh the peak transient
+memory and the memory blocks the result keeps alive (via tracemalloc).
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+import legacy_v2
+from _loader import load
+from _stats import memory_profile
+
+processor = load("integrations.seplos_v2.modbus_processor")
+v3_parser = load("integrations.seplos_v3.data_parser")
+snapshot = load("snapshot")
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+V2_CONFIG = {"name_prefix": "Seplos "}
+
+
+def _fixture_poll(name: str, poll: str = "0") -> dict:
+    """Return {kind: frame} for the valid frames of one fixture poll."""
+    frames = {}
+    for line in (FIXTURES / name).read_text().splitlines():
+        if line.startswith("#") or not line.strip():
+            continue
+        number, kind, case, frame = line.split()
+        if number == poll and case == "valid":
+            frames[kind] = frame
+    return frames
+
+
+def v2_sections() -> tuple:
+    """Return the current and the previous (list/float 42H) V2 sections."""
+    sections = {code: processor.parse_seplos_section(code, frame, V2_CONFIG)
+                for code, frame in _fixture_poll("seplos_v2.txt").items()}
+    telemetry = dict(sections["42"])
+    telemetry["cellVoltage"] = list(telemetry["cellVoltage"])
+    telemetry["temperatures"] = [(kelvin - 2731) / 10 for kelvin in telemetry["temperatures"]]
+    return sections, dict(sections, **{"42": telemetry})
+
+
+def v3_sections() -> tuple:
+    """Return the current and the previous (flat float) V3 sections."""
+    sections = {key: v3_parser.decode_response(key, bytes.fromhex(frame))
+                for key, frame in _fixture_poll("seplos_v3.txt").items()}
+    flat = {key: dict(v3_parser.merge_blocks({key: section})) for key, section in sections.items()}
+    return sections, flat
+
+
+def legacy_v2_read(pack: dict, key: str):
+    data = pack.get(key)
+    if isinstance(data, dict) and 'state' in data:
+        return data['state']
+    return data
+
+
+def bench(label: str, func, iterations: int, repeat: int, units: int) -> None:
+    best = min(timeit.repeat(func, number=iterations, repeat=repeat))
+    memory = memory_profile(func, iterations=50)
+    print(f"{label:<30} {best / iterations * 1e6:9.2f} us  peak {memory['peak_bytes'] / units:8,.0f} B/pack"
+          f"  retained {memory['retained_blocks'] / units:6.1f} blocks/pack")
+
+
+def bench_reads(label: str, readers, iterations: int, repeat: int) -> None:
+    def read_all():
+        for read, pack in readers:
+            read(pack)
+
+    best = min(timeit.repeat(read_all, number=iterations, repeat=repeat))
+    print(f"{label:<30} {best / iterations * 1e6:9.2f} us  ({len(readers)} entity reads)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packs", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    packs, iterations, repeat = args.packs, args.iterations, args.repeat
+
+    v2_now, v2_prev = v2_sections()
+    v3_now, v3_prev = v3_sections()
+
+    v2_snapshot = processor.merge_seplos_sections(v2_now, V2_CONFIG)
+    v2_dict = legacy_v2.legacy_merge_sections(v2_prev)
+    assert sorted(v2_snapshot) == sorted(v2_dict)
+    assert all(v2_snapshot[key] == legacy_v2_read(v2_dict, key) for key in v2_dict)
+    v3_snapshot = v3_parser.merge_blocks(v3_now)
+    v3_dict = {key: value for section in v3_prev.values() for key, value in section.items()}
+    assert dict(v3_snapshot) == v3_dict
+
+    print(f"{packs} packs, {len(v2_dict)} V2 and {len(v3_dict)} V3 values per pack")
+    bench("V2 refresh, dicts (prev)", lambda: [legacy_v2.legacy_merge_sections(v2_prev) for _ in range(packs)],
+          iterations, repeat, packs)
+    bench("V2 refresh, PackSnapshot",
+          lambda: [processor.merge_seplos_sections(v2_now, V2_CONFIG) for _ in range(packs)],
+          iterations, repeat, packs)
+    bench("V3 refresh, dicts (prev)",
+          lambda: [{key: value for section in v3_prev.values() for key, value in section.items()}
+                   for _ in range(packs)],
+          iterations, repeat, packs)
+    bench("V3 refresh, PackSnapshot", lambda: [v3_parser.merge_blocks(v3_now) for _ in range(packs)],
+          iterations, repeat, packs)
+
+    bench_reads("V2 entity reads, dicts (prev)",
+                [(lambda pack, key=key: legacy_v2_read(pack, key), v2_dict) for key in v2_dict] * packs,
+                iterations, repeat)
+    bench_reads("V2 entity reads, accessors",
+                [(snapshot.make_accessor(key, processor.CELL_VOLTAGES, processor.TEMPERATURES), v2_snapshot)
+                 for key in v2_snapshot] * packs,
+                iterations, repeat)
+
+
+if __name__ == "__main__":
+    main()
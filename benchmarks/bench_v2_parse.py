@@ -0,0 +1,78 @@
+"""Micro-benchmark: Seplos V2 42H/44H parsing.
+
+    python benchmarks/bench_v2_parse.py [--iterations N]
+
+Compares the previous string-cursor parsers (one int(hex_substring, 16)
+per value, see legacy_v2.py) with the bytes/memoryview parsers, which
+also validate LENGTH and CHKSUM. For each it reports time per parse, peak transient memory while parsing and
+the number of memory blocks the result keeps alive (both via
+tracemalloc).
+"""
+
+import argparse
+import random
+import struct
+import timeit
+
+from _loader import load
+from _stats import memory_profile
+from legacy_v2 import legacy_parse_42h, legacy_parse_44h
+
+processor = load("integrations.seplos_v2.modbus_processor")
+protocol = load("connectors.seplos_v2_protocol")
+
+
+def make_frame(info: bytes) -> str:
+    info_hex = info.hex().upper()
+    body = "2000" + "4600" + protocol.v2_length_field(len(info_hex)) + info_hex
+    return f"~{body}{protocol.v2_checksum(body)}"
+
+
+def telemetry_frame(cells: int = 16, temps: int = 6) -> str:
+    info = bytes((0, 1, cells))
+    info += b"".join(struct.pack(">H", random.randint(3200, 3400)) for _ in range(cells))
+    info += bytes((temps,))
+    info += b"".join(struct.pack(">H", random.randint(2900, 3100)) for _ in range(temps))
+    info += struct.pack(">hHHBHHHHHH", -1234, 5312, 18000, 10, 20000, 900, 20000, 123, 1000, 5312)
+    return make_frame(info)
+
+
+def alarm_frame(cells: int = 16, temps: int = 6) -> str:
+    info = bytes((0, 1, cells)) + bytes(cells) + bytes((temps,)) + bytes(temps)
+    info += bytes((0, 0, 0, 1, 2, 4, 8, 16, 32, 3, 0x0F, 0x01, 0, 0, 0, 0, 0))
+    return make_frame(info)
+
+
+def bench(label: str, func, iterations: int, repeat: int) -> None:
+    best = min(timeit.repeat(func, number=iterations, repeat=repeat))
+    memory = memory_profile(func)
+    print(f"{label:<26} {best / iterations * 1e6:8.2f} us  {iterations / best:10,.0f} parses/s"
+          f"  peak {memory['peak_bytes']:6,d} B  retained {memory['retained_blocks']:5.1f} blocks")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    telemetry = telemetry_frame()
+    alarms = alarm_frame()
+    new_42h = processor._parse_42h_codes(telemetry, "")
+    assert legacy_parse_42h(telemetry, "") == dict(
+        new_42h,
+        cellVoltage=list(new_42h["cellVoltage"]),
+        temperatures=[(kelvin - 2731) / 10 for kelvin in new_42h["temperatures"]],
+    )
+    assert legacy_parse_44h(alarms, "") == processor._parse_44h_codes(alarms, "")
+
+    for label, func in (
+        ("42H string cursor (prev)", lambda: legacy_parse_42h(telemetry, "")),
+        ("42H bytes", lambda: processor._parse_42h_codes(telemetry, "")),
+        ("44H string cursor (prev)", lambda: legacy_parse_44h(alarms, "")),
+        ("44H bytes", lambda: processor._parse_44h_codes(alarms, "")),
+    ):
+        bench(label, func, args.iterations, args.repeat)
+
+if __name__ == "__main__":
+    main()
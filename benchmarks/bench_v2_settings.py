@@ -0,0 +1,63 @@
+"""Micro-benchmark: Seplos V2 47H (settings) decoding.
+
+    python benchmarks/bench_v2_settings.py [--iterations N]
+
+Compares a slice-per-field decoder (how 47H was parsed before) with the
+table-compiled struct.Struct decoder, on the bare DATAI block and on a
+full response frame.
+"""
+
+import argparse
+import os
+import timeit
+
+from _loader import load
+
+fields = load("integrations.seplos_v2.settings_fields")
+processor = load("integrations.seplos_v2.modbus_processor")
+protocol = load("connectors.seplos_v2_protocol")
+
+
+def slice_decode(datai: bytes) -> dict:
+    """One int.from_bytes() on a fresh slice per field."""
+    settings = {}
+    for field in fields.SETTINGS_FIELDS:
+        width = 1 if field.fmt == "B" else 2
+        raw = int.from_bytes(datai[field.offset:field.offset + width], "big",
+                             signed=field.fmt == "h")
+        if field.scale != 1 or field.bias:
+            raw = (raw - field.bias) / field.scale
+        settings[field.key] = raw
+    return settings
+
+
+def make_frame(datai: bytes) -> str:
+    info = ("00" + "%02X" % len(fields.SETTINGS_FIELDS) + datai.hex() + "00000000").upper()
+    body = "2000" + "4600" + protocol.v2_length_field(len(info)) + info
+    return f"~{body}{protocol.v2_checksum(body)}"
+
+
+def bench(label: str, func, iterations: int, repeat: int) -> None:
+    best = min(timeit.repeat(func, number=iterations, repeat=repeat))
+    print(f"{label:<28} {best / iterations * 1e6:8.2f} us  {iterations / best:10,.0f} parses/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    datai = os.urandom(fields.SETTINGS_STRUCT.size)
+    frame = make_frame(datai)
+    assert slice_decode(datai) == fields.decode_settings(datai)
+
+    print(f"{len(fields.SETTINGS_FIELDS)} fields, struct format {fields.SETTINGS_STRUCT.size} bytes")
+    bench("slices (previous)", lambda: slice_decode(datai), args.iterations, args.repeat)
+    bench("decode_settings", lambda: fields.decode_settings(datai), args.iterations, args.repeat)
+    bench("_parse_47h_codes (frame)", lambda: processor._parse_47h_codes(frame, ""),
+          args.iterations, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
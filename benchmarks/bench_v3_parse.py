@@ -0,0 +1,73 @@
+"""Micro-benchmark: Seplos V3 PIA/PIB decoding.
+
+    python benchmarks/bench_v3_parse.py [--iterations N]
+
+Compares the previous hex-string decoders (bytes.fromhex, then one
+convert_bytes_to_data call per register into a V3PIA/V3PIB object, see
+legacy_v3.py) with the struct layouts in seplos_v3/data_parser, which
+decode a bytes frame with one unpack_from per block into a PackSnapshot.
+For each it reports time per poll (PIA + PIB), peak transient memory and
+the number of memory blocks the result keeps alive (both via
+tracemalloc).
+"""
+
+import argparse
+import random
+import struct
+import timeit
+
+import legacy_v3
+from _loader import load
+from _stats import memory_profile
+
+checksum = load("connectors.checksum")
+parser = load("integrations.seplos_v3.data_parser")
+
+
+def make_frame(registers) -> bytes:
+    body = bytes((0x01, 0x04, 2 * len(registers))) + struct.pack(f">{len(registers)}H", *registers)
+    return body + checksum.modbus_crc(body)
+
+
+def pia_frame() -> bytes:
+    return make_frame((5312, 65536 - 1234, 18000, 28000, 120, 650, 1000, 42,
+                       3312, 2981, 3340, 3290, 2995, 2970, 0, 0, 150, 100))
+
+
+def pib_frame() -> bytes:
+    cells = [random.randint(3200, 3400) for _ in range(16)]
+    temps = [random.randint(2900, 3100) for _ in range(4)]
+    return make_frame(cells + temps + [0] * 4 + [2981, 3010])
+
+
+def decode_poll(pia: bytes, pib: bytes):
+    return parser.merge_blocks({"pia": parser.decode_response("pia", pia),
+                                "pib": parser.decode_response("pib", pib)})
+
+
+def bench(label: str, func, iterations: int, repeat: int) -> None:
+    best = min(timeit.repeat(func, number=iterations, repeat=repeat))
+    memory = memory_profile(func)
+    print(f"{label:<26} {best / iterations * 1e6:8.2f} us  {iterations / best:10,.0f} polls/s"
+          f"  peak {memory['peak_bytes']:6,d} B  retained {memory['retained_blocks']:5.1f} blocks")
+
+
+def main() -> None:
+    args_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args_parser.add_argument("--iterations", type=int, default=20000)
+    args_parser.add_argument("--repeat", type=int, default=5)
+    args = args_parser.parse_args()
+
+    pia, pib = pia_frame(), pib_frame()
+    poll_hex = [pia.hex(), pib.hex()]
+    assert legacy_v3.extract_data_from_message(poll_hex) == dict(decode_poll(pia, pib))
+
+    for label, func in (
+        ("hex + V3PIA/V3PIB (prev)", lambda: legacy_v3.extract_data_from_message(poll_hex)),
+        ("bytes + struct layouts", lambda: decode_poll(pia, pib)),
+    ):
+        bench(label, func, args.iterations, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Seplos BMS simulator on a pseudo-terminal and/or a TCP port.
+
+    python benchmarks/bms_simulator.py --packs 4 --pty --tcp 8023 \\
+        [--latency 0.05] [--jitter 0.01] [--echo] [--noise 0.01] [--drop 0.001] \\
+        [--turnaround 0.02]
+
+Answers V2 ASCII requests (42H/44H/47H/51H), Modbus RTU 0x04 reads of
+the V3 PIA/PIB input registers and 0x01 reads of the PIC coils for N
+virtual packs sharing one bus. V2
+packs answer at addresses --v2-base.., V3 packs at --v3-base.. . Point
+the integration (or the connectors directly) at the printed pty path or
+TCP port.
+
+Bus impairments, all seeded for repeatable runs:
+  --latency/--jitter  delay before each response
+  --echo              echo every request back first (RS485 adapters)
+  --noise P           with probability P, prefix a response with garbage
+  --drop P            drop each response byte with probability P
+  --turnaround T      ignore requests arriving within T s of the last
+                      response (packs that need bus idle time)
+
+Import BmsSimulator to run it inside a benchmark or test process.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import struct
+import time
+import tty
+from typing import Callable, Dict, List, Optional
+
+from _loader import load
+
+checksum = load("connectors.checksum")
+v2_protocol = load("connectors.seplos_v2_protocol")
+settings_fields = load("integrations.seplos_v2.settings_fields")
+
+_LOGGER = logging.getLogger("bms_simulator")
+
+CELLS = 16
+V2_TEMPERATURES = 6  # 4 cells, power, environment
+
+# V3 input register blocks: start register -> register count
+V3_PIA = 0x1000
+V3_PIB = 0x1100
+V3_BLOCKS = {V3_PIA: 0x12, V3_PIB: 0x1A}
+# V3 coil blocks: start coil -> coil count
+V3_PIC = 0x1200
+V3_COILS = {V3_PIC: 0x90}
+
+# Modbus exception codes
+_ILLEGAL_FUNCTION = 0x01
+_ILLEGAL_ADDRESS = 0x02
+
+
+class VirtualPack:
+    """One battery pack with slowly drifting, plausible readings."""
+
+    def __init__(self, index: int, rng: random.Random) -> None:
+        self.index = index
+        self._rng = rng
+        self.soc = 900 - 37 * index  # 0.1 %
+        self.rated = 28000  # 0.01 Ah
+        self.cycles = 150 + index
+        self.current = 0  # 0.01 A, positive = charging
+
+    def _step(self) -> None:
+        self.current = max(-3000, min(3000, self.current + self._rng.randint(-150, 150)))
+        self.soc = max(50, min(1000, self.soc + (1 if self.current > 0 else -1)))
+
+    def _cells(self) -> List[int]:
+        base = 3250 + self.soc // 20 + self.current // 200
+        return [base + self._rng.randint(-8, 8) for _ in range(CELLS)]
+
+    def _kelvin(self, celsius: float) -> int:
+        return round(celsius * 10) + 2731
+
+    # -- V2 ---------------------------------------------------------------
+
+    def v2_info(self, cid2: str, address: int) -> bytes:
+        """Return the INFO field answering *cid2*."""
+        self._step()
+        if cid2 == v2_protocol.CID2_TELEMETRY:
+            cells = self._cells()
+            temps = [self._kelvin(22 + self._rng.random() * 3) for _ in range(4)]
+            temps += [self._kelvin(30.5), self._kelvin(21.0)]
+            info = bytes((0, address, CELLS)) + struct.pack(f">{CELLS}H", *cells)
+            info += bytes((len(temps),)) + struct.pack(f">{len(temps)}H", *temps)
+            res_cap = self.rated * self.soc // 1000
+            info += struct.pack(">hHHBHHHHHH", self.current, sum(cells) // 10, res_cap, 10,
+                                self.rated, self.soc, self.rated, self.cycles, 1000, sum(cells) // 10)
+            return info
+        if cid2 == v2_protocol.CID2_ALARMS:
+            balancing = 1 << self._rng.randrange(CELLS) if self._rng.random() < 0.2 else 0
+            states = bytes((0, 0, 0, 0, 0, 0, 0, 0, 0, 0x03, balancing & 0xFF, balancing >> 8, 0x06, 0, 0, 0, 0))
+            return bytes((0, address, CELLS)) + bytes(CELLS) + bytes((V2_TEMPERATURES,)) \
+                + bytes(V2_TEMPERATURES) + states
+        if cid2 == v2_protocol.CID2_SETTINGS:
+            return bytes((0, len(settings_fields.SETTINGS_FIELDS))) + _settings_block() + bytes(4)
+        if cid2 == v2_protocol.CID2_DEVICE_INFO:
+            return b"1101-SP76 " + struct.pack(">H", 655) + b"SEPLOS      " + bytes(6)
+        raise KeyError(cid2)
+
+    # -- V3 ---------------------------------------------------------------
+
+    def v3_registers(self, start: int) -> List[int]:
+        """Return the input register block starting at *start*."""
+        self._step()
+        if start == V3_PIA:
+            cells = self._cells()
+            return [sum(cells) // 10, self.current & 0xFFFF, self.rated * self.soc // 1000, self.rated,
+                    500 + self.cycles, self.soc, 1000, self.cycles, sum(cells) // CELLS,
+                    self._kelvin(23.0), max(cells), min(cells), self._kelvin(25.0),
+                    self._kelvin(21.5), 0, 0, 1500, 1500]
+        if start == V3_PIB:
+            temps = [self._kelvin(22 + self._rng.random() * 3) for _ in range(4)]
+            return self._cells() + temps + [0] * 4 + [self._kelvin(21.0), self._kelvin(30.5)]
+        raise KeyError(start)
+
+    def v3_coils(self, start: int, count: int) -> bytes:
+        """Return *count* coils from *start*, packed LSB first."""
+        # Mostly idle flags with the odd balancing cell (coils 0x1260..)
+        bits = (1 << (0x60 + self._rng.randrange(CELLS))) if self._rng.random() < 0.2 else 0
+        bits |= 0b101 << 0x80  # a couple of steady status flags
+        bits = (bits >> (start - V3_PIC)) & ((1 << count) - 1)
+        return bits.to_bytes((count + 7) // 8, "little")
+
+
+def _settings_block() -> bytes:
+    """Return a 47H DATAI block with typical factory settings."""
+    block = bytearray(settings_fields.SETTINGS_STRUCT.size)
+    for field in settings_fields.SETTINGS_FIELDS:
+        if field.unit == "V":
+            value = 3.55 if field.scale == 1000.0 else 56.8
+        elif field.unit == "°C":
+            value = -10.0 if "low" in field.key or "under" in field.key else 55.0
+        elif field.unit == "A":
+            value = -3.0 if field.scale > 100 else (-150.0 if "discharge" in field.key else 100.0)
+        elif field.unit == "Ah":
+            value = 280.0
+        else:
+            value = 5
+        struct.pack_into(">" + field.fmt, block, field.offset, round(value * field.scale + field.bias))
+    return bytes(block)
+
+
+def _v2_response(address: int, info: bytes, rtn: int = 0) -> bytes:
+    info_hex = info.hex().upper()
+    body = (f"{v2_protocol.V2_VERSION:02X}{address:02X}{v2_protocol.V2_CID1_BATTERY:02X}{rtn:02X}"
+            f"{v2_protocol.v2_length_field(len(info_hex))}{info_hex}")
+    return f"~{body}{v2_protocol.v2_checksum(body)}\r".encode("ascii")
+
+
+def _modbus_response(address: int, function: int, payload: bytes) -> bytes:
+    frame = bytes((address, function)) + payload
+    return frame + checksum.modbus_crc(frame)
+
+
+def take_request(buf: bytearray) -> Optional[bytes]:
+    """Extract the next V2 or Modbus request from *buf*, dropping junk."""
+    while buf:
+        if buf[0] == ord("~"):
+            end = buf.find(b"\r")
+            if end < 0:
+                return None
+            request = bytes(buf[:end + 1])
+            del buf[:end + 1]
+            return request
+        if len(buf) < 8:
+            # A Modbus read request is 8 bytes
+            return None
+        if checksum.frame_crc_ok(memoryview(buf)[:8]):
+            request = bytes(buf[:8])
+            del buf[:8]
+            return request
+        del buf[:1]
+    return None
+
+
+class BmsSimulator:
+    """A bus of virtual packs answering V2 and V3 requests."""
+
+    def __init__(self, packs: int = 1, v2_base: int = 0x00, v3_base: int = 0x01,
+                 latency: float = 0.0, jitter: float = 0.0, echo: bool = False,
+                 noise: float = 0.0, drop: float = 0.0, seed: int = 0,
+                 turnaround: float = 0.0) -> None:
+        self._rng = random.Random(seed)
+        self.v2_packs = {v2_base + i: VirtualPack(i, self._rng) for i in range(packs)}
+        self.v3_packs = {v3_base + i: VirtualPack(i, self._rng) for i in range(packs)}
+        self.latency = latency
+        self.jitter = jitter
+        self.echo = echo
+        self.noise = noise
+        self.drop = drop
+        self.turnaround = turnaround
+        self._last_response = 0.0
+        self.requests = 0
+        self.responses = 0
+        self.pty_path: Optional[str] = None
+        self.tcp_port: Optional[int] = None
+        self._pty_fds: Optional[tuple] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -- Request handling -------------------------------------------------
+
+    def respond(self, request: bytes) -> Optional[bytes]:
+        """Return the response to *request*, or None if no pack answers."""
+        self.requests += 1
+        if request.startswith(b"~"):
+            return self._respond_v2(request[1:-1].decode("ascii", errors="replace"))
+        return self._respond_v3(request)
+
+    def _respond_v2(self, body: str) -> Optional[bytes]:
+        if len(body) < 12 or v2_protocol.v2_checksum(body[:-4]) != body[-4:].upper():
+            return None
+        address = int(body[2:4], 16)
+        pack = self.v2_packs.get(address)
+        if pack is None:
+            return None
+        try:
+            info = pack.v2_info(body[6:8], address)
+        except KeyError:
+            return _v2_response(address, b"", rtn=0x04)  # CID2 invalid
+        return _v2_response(address, info)
+
+    def _respond_v3(self, request: bytes) -> Optional[bytes]:
+        address, function, start, count = struct.unpack_from(">BBHH", request)
+        pack = self.v3_packs.get(address)
+        if pack is None:
+            return None
+        if function == 0x01:
+            if not V3_PIC <= start or start + count > V3_PIC + V3_COILS[V3_PIC]:
+                return _modbus_response(address, 0x81, bytes((_ILLEGAL_ADDRESS,)))
+            coils = pack.v3_coils(start, count)
+            return _modbus_response(address, 0x01, bytes((len(coils),)) + coils)
+        if function != 0x04:
+            return _modbus_response(address, function | 0x80, bytes((_ILLEGAL_FUNCTION,)))
+        if V3_BLOCKS.get(start, 0) < count:
+            return _modbus_response(address, 0x84, bytes((_ILLEGAL_ADDRESS,)))
+        registers = pack.v3_registers(start)[:count]
+        return _modbus_response(address, 0x04, bytes((2 * count,)) + struct.pack(f">{count}H", *registers))
+
+    def _impair(self, response: bytes) -> bytes:
+        if self.noise and self._rng.random() < self.noise:
+            response = bytes(self._rng.randrange(256) for _ in range(self._rng.randint(1, 6))) + response
+        if self.drop:
+            response = bytes(b for b in response if self._rng.random() >= self.drop)
+        return response
+
+    async def _serve(self, request: bytes, write: Callable[[bytes], None]) -> None:
+        if self.echo:
+            write(request)
+        if self.turnaround and time.monotonic() - self._last_response < self.turnaround:
+            self.requests += 1
+            return
+        response = self.respond(request)
+        if response is None:
+            return
+        delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.responses += 1
+        write(self._impair(response))
+        self._last_response = time.monotonic()
+
+    async def _handle_stream(self, data_source, write: Callable[[bytes], None]) -> None:
+        """Serve requests from received chunks, one at a time like a bus."""
+        buf = bytearray()
+        async for chunk in data_source:
+            buf += chunk
+            while (request := take_request(buf)) is not None:
+                await self._serve(request, write)
+
+    # -- Transports -------------------------------------------------------
+
+    async def start_pty(self) -> str:
+        """Open a pseudo-terminal and serve it; return the device path."""
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        self._pty_fds = (master, slave)
+        self.pty_path = os.ttyname(slave)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_readable() -> None:
+            try:
+                queue.put_nowait(os.read(master, 4096))
+            except (BlockingIOError, OSError):
+                pass
+
+        async def chunks():
+            while True:
+                yield await queue.get()
+
+        def write(data: bytes) -> None:
+            os.write(master, data)
+
+        loop.add_reader(master, on_readable)
+        self._pty_task = asyncio.create_task(self._handle_stream(chunks(), write))
+        return self.pty_path
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen on *host*:*port* (0 picks a free port); return the port."""
+
+        async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            async def chunks():
+                while data := await reader.read(4096):
+                    yield data
+            try:
+                await self._handle_stream(chunks(), writer.write)
+            finally:
+                writer.close()
+
+        self._server = await asyncio.start_server(on_connect, host, port)
+        self.tcp_port = self._server.sockets[0].getsockname()[1]
+        return self.tcp_port
+
+    async def close(self) -> None:
+        """Stop serving and release the pty and TCP port."""
+        if self._pty_fds is not None:
+            asyncio.get_running_loop().remove_reader(self._pty_fds[0])
+            self._pty_task.cancel()
+            for fd in self._pty_fds:
+                os.close(fd)
+            self._pty_fds = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def _main(args: argparse.Namespace) -> None:
+    simulator = BmsSimulator(args.packs, args.v2_base, args.v3_base, args.latency, args.jitter,
+                             args.echo, args.noise, args.drop, args.seed, args.turnaround)
+    if args.pty:
+        print(f"pty: {await simulator.start_pty()}")
+    if args.tcp is not None:
+        print(f"tcp: 127.0.0.1:{await simulator.start_tcp(args.bind, args.tcp)}")
+    print(f"{args.packs} pack(s): V2 from 0x{args.v2_base:02X}, V3 from 0x{args.v3_base:02X}")
+    start = time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(10)
+            elapsed = time.monotonic() - start
+            print(f"{simulator.requests} requests, {simulator.responses} responses in {elapsed:.0f}s")
+    finally:
+        await simulator.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packs", type=int, default=1)
+    parser.add_argument("--pty", action="store_true", help="serve a pseudo-terminal")
+    parser.add_argument("--tcp", type=int, metavar="PORT", help="serve TCP on PORT (0 = any free port)")
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--v2-base", type=lambda v: int(v, 0), default=0x00)
+    parser.add_argument("--v3-base", type=lambda v: int(v, 0), default=0x01)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--echo", action="store_true")
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--drop", type=float, default=0.0)
+    parser.add_argument("--turnaround", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not args.pty and args.tcp is None:
+        parser.error("choose --pty and/or --tcp")
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Previous V2 code from modbus_processor, kept as the benchmark baseline.
+
+legacy_parse_42h/44h are the string-cursor parsers from before the move
+to bytes parsing. legacy_merge_sections and the _create_* helpers built
+the coordinator dict, with a nested state/attributes dict per cell,
+before PackSnapshot. Copied unchanged; not used by the integration.
+"""
+
+from typing import Any, Dict, List
+
+from _loader import load
+
+_interpret_alarm = load("integrations.seplos_v2.modbus_processor")._interpret_alarm
+
+
+def legacy_parse_42h(info_str: str, name_prefix: str) -> Dict[str, Any]:
+    """Parse 42H codes (main battery data)."""
+    if info_str.startswith("~"):
+        info_str = info_str[1:]
+        
+    msg_wo_chk_sum = info_str[:-4]
+    info_str = msg_wo_chk_sum[12:]
+    cursor = 4
+
+    cellsCount = int(info_str[cursor:cursor+2], 16)
+    cursor += 2
+    
+    cellVoltage = []
+    for _ in range(cellsCount):
+        cellVoltage.append(int(info_str[cursor:cursor+4], 16))
+        cursor += 4
+
+    tempCount = int(info_str[cursor:cursor+2], 16)
+    cursor += 2
+    
+    temperatures = []
+    for _ in range(tempCount):
+        temperature = (int(info_str[cursor:cursor+4], 16) - 2731) / 10
+        temperatures.append(temperature)
+        cursor += 4
+
+    current = int(info_str[cursor:cursor+4], 16)
+    if current > 32767:
+        current -= 65536
+    current /= 100
+    cursor += 4
+    
+    voltage = int(info_str[cursor:cursor+4], 16) / 100
+    cursor += 4
+    
+    resCap = int(info_str[cursor:cursor+4], 16) / 100
+    cursor += 4
+    
+    customNumber = int(info_str[cursor:cursor+2], 16)
+    cursor += 2
+    
+    capacity = int(info_str[cursor:cursor+4], 16) / 100
+    cursor += 4
+    
+    soc = int(info_str[cursor:cursor+4], 16) / 10
+    cursor += 4
+    
+    ratedCapacity = int(info_str[cursor:cursor+4], 16) / 100
+    cursor += 4
+    
+    cycles = int(info_str[cursor:cursor+4], 16)
+    cursor += 4
+    
+    soh = int(info_str[cursor:cursor+4], 16) / 10
+    cursor += 4
+    
+    portVoltage = int(info_str[cursor:cursor+4], 16) / 100
+
+    # Add customNumber to returned data
+
+    # Calculate derived values
+    highest_voltage = max(enumerate(cellVoltage), key=lambda x: x[1])
+    lowest_voltage = min(enumerate(cellVoltage), key=lambda x: x[1])
+    highest_voltage_cell_number = highest_voltage[0] + 1
+    highest_voltage_value = highest_voltage[1]
+    lowest_voltage_cell_number = lowest_voltage[0] + 1
+    lowest_voltage_value = lowest_voltage[1]
+    cell_difference = highest_voltage_value - lowest_voltage_value
+    nominal_voltage = cellsCount * 3.3125
+
+    return {
+        'cellsCount': cellsCount,
+        'cellVoltage': cellVoltage,
+        'temperatures': temperatures,
+        'current': current,
+        'voltage': voltage,
+        'resCap': resCap,
+        'capacity': capacity,
+        'soc': soc,
+        'ratedCapacity': ratedCapacity,
+        'cycles': cycles,
+        'soh': soh,
+        'portVoltage': portVoltage,
+        'customNumber': customNumber,  # Add missing customNumber
+        'highest_cell_voltage': highest_voltage_value,
+        'highest_cell_number': highest_voltage_cell_number,
+        'lowest_cell_voltage': lowest_voltage_value,
+        'lowest_cell_number': lowest_voltage_cell_number,
+        'cell_difference': cell_difference,
+        'battery_watts': int(voltage * current),
+        'full_charge_watts': int((capacity - resCap) * nominal_voltage),
+        'full_charge_amps': int((capacity - resCap)),
+        'remaining_watts': int(resCap * nominal_voltage),
+        'capacity_watts': nominal_voltage * capacity,
+    }
+
+def legacy_parse_44h(info_str: str, name_prefix: str) -> Dict[str, Any]:
+    """Parse 44H codes (alarms and states)."""
+    if info_str.startswith("~"):
+        info_str = info_str[1:]
+
+    msg_wo_chk_sum = info_str[:-4]
+    info_str = msg_wo_chk_sum[12:]
+    cursor = 4
+    result = {}
+
+    def remaining_length():
+        return len(info_str) - cursor
+
+    # Assign cellsCount to the result dictionary
+    result['cellsCount'] = int(info_str[cursor:cursor+2], 16)
+    cursor += 2
+
+    # Initialize cellAlarm as a list in the result dictionary
+    result['cellAlarm'] = []
+    for _ in range(result['cellsCount']):
+        if remaining_length() < 2:
+            return result
+        result['cellAlarm'].append(int(info_str[cursor:cursor+2], 16))
+        cursor += 2
+
+    # Assign tempCount to the result dictionary
+    result['tempCount'] = int(info_str[cursor:cursor+2], 16)
+    cursor += 2
+
+    # Initialize tempAlarm as a list in the result dictionary
+    result['tempAlarm'] = []
+    for _ in range(result['tempCount']):
+        if remaining_length() < 2:
+            return result
+        result['tempAlarm'].append(int(info_str[cursor:cursor+2], 16))
+        cursor += 2
+
+    # Add other attributes to the result dictionary
+    for attribute in ['currentAlarm', 'voltageAlarm', 'customAlarms', 'alarmEvent1', 'alarmEvent2', 'alarmEvent3', 'alarmEvent4', 'alarmEvent5', 'alarmEvent6', 'onOffState', 'equilibriumState0', 'equilibriumState1', 'systemState', 'disconnectionState0', 'disconnectionState1', 'alarmEvent7', 'alarmEvent8']:
+        if remaining_length() < 2:
+            return result
+        result[attribute] = int(info_str[cursor:cursor+2], 16)
+        cursor += 2
+
+    # Interpret alarms and states
+    interpreted_data = {}
+    for alarm_key in ['currentAlarm', 'voltageAlarm', 'alarmEvent1', 'alarmEvent2', 'alarmEvent3', 'alarmEvent4', 'alarmEvent5', 'alarmEvent6', 'alarmEvent7', 'alarmEvent8', 'onOffState', 'equilibriumState0', 'equilibriumState1', 'systemState', 'disconnectionState0', 'disconnectionState1']:
+        if alarm_key in result:
+            interpreted_data[alarm_key] = _interpret_alarm(alarm_key, result[alarm_key])
+    
+    # Store raw equilibrium states for cell voltage attributes
+    interpreted_data['equilibriumState0_raw'] = result.get('equilibriumState0', 0)
+    interpreted_data['equilibriumState1_raw'] = result.get('equilibriumState1', 0)
+
+    # Generate binary sensor data for balancing states
+    equilibrium_state0 = result.get('equilibriumState0', 0)
+    equilibrium_state1 = result.get('equilibriumState1', 0)
+    
+    # Create binary sensor entries for each cell's balancing state
+    for i in range(result['cellsCount']):
+        if i < 8:
+            # Check equilibriumState0 bits (cells 1-8)
+            balancer_active = bool(equilibrium_state0 & (1 << i))
+        else:
+            # Check equilibriumState1 bits (cells 9-16)
+            balancer_active = bool(equilibrium_state1 & (1 << (i - 8)))
+        
+        interpreted_data[f'balancerActiveCell{i+1}'] = balancer_active
+
+    return interpreted_data
+
+
+V2_COMMAND_CODES = ("42", "44", "47", "51")
+
+
+def legacy_merge_sections(sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-command parse results into the coordinator data dict.
+
+    Expects the 42H section in its old form: cellVoltage and
+    temperatures as lists, temperatures already in degrees.
+    """
+    name_prefix = ""
+    processed_data = {}
+
+    for code in V2_COMMAND_CODES:
+        processed_data.update(sections.get(code, {}))
+
+    # Add cell voltage sensors for each cell
+    if 'cellVoltage' in processed_data:
+        # Get equilibrium states from 44H codes parsing
+        equilibrium_state0 = processed_data.get('equilibriumState0_raw', 0)
+        equilibrium_state1 = processed_data.get('equilibriumState1_raw', 0)
+        highest_voltage = processed_data.get('highest_cell_voltage', 0)
+        lowest_voltage = processed_data.get('lowest_cell_voltage', 0)
+
+        processed_data.update(_create_cell_voltage_sensors(
+            processed_data['cellVoltage'],
+            name_prefix,
+            highest_voltage,
+            lowest_voltage,
+            equilibrium_state0,
+            equilibrium_state1
+        ))
+        # Remove the original list to avoid sensor creation
+        del processed_data['cellVoltage']
+
+    # Add temperature sensors
+    if 'temperatures' in processed_data:
+        processed_data.update(_create_temperature_sensors(processed_data['temperatures'], name_prefix))
+        # Remove the original list to avoid sensor creation
+        del processed_data['temperatures']
+
+    return processed_data
+
+
+def _create_cell_voltage_sensors(cellVoltage: List[int], name_prefix: str, highest_voltage_value: int, lowest_voltage_value: int, equilibrium_state0: int, equilibrium_state1: int) -> Dict[str, Any]:
+    """Create individual cell voltage sensors with balancing attributes."""
+    sensors = {}
+    for i, voltage in enumerate(cellVoltage):
+        cell_num = i + 1
+        sensor_key = f"cell_{cell_num}_voltage"
+        
+        # Determine if this cell has the highest or lowest voltage
+        cell_state_lowest = (voltage == lowest_voltage_value)
+        cell_state_highest = (voltage == highest_voltage_value)
+        
+        # Determine if this cell is currently balancing
+        if i < 8:
+            # Check equilibriumState0 bits (cells 1-8)
+            cell_state_balancing = bool(equilibrium_state0 & (1 << i))
+        else:
+            # Check equilibriumState1 bits (cells 9-16)
+            cell_state_balancing = bool(equilibrium_state1 & (1 << (i - 8)))
+        
+        sensors[sensor_key] = {
+            'state': voltage,
+            'attributes': {
+                'CELL_STATE_LOWEST': cell_state_lowest,
+                'CELL_STATE_HIGHEST': cell_state_highest,
+                'CELL_STATE_BALANCING': cell_state_balancing
+            }
+        }
+    return sensors
+
+def _create_temperature_sensors(temperatures: List[float], name_prefix: str) -> Dict[str, Any]:
+    """Create temperature sensors."""
+    sensors = {}
+    tempCount = len(temperatures)
+    
+    for i, temp in enumerate(temperatures):
+        if i < tempCount - 2:
+            # For the first (tempCount - 2) temperatures, label them as Cell 1 Temp, Cell 2 Temp, etc.
+            sensor_key = f"cell_temperature_{i+1}"
+        elif i == tempCount - 2:
+            # The second last temperature is Power Temp
+            sensor_key = "power_temperature"
+        else:
+            # The last temperature is Environment Temp
+            sensor_key = "environment_temperature"
+
+        sensors[sensor_key] = temp
+        
+    return sensors
\ No newline at end of file
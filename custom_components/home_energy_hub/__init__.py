@@ -3,10 +3,12 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
-from .const import DOMAIN
+from .const import CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP, DOMAIN
+from .entry_cache import EntryCache
+from .integrations import get_integration
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -147,35 +149,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             }
             hass.config_entries.async_update_entry(entry, data=new_data)
 
-    integration_type = entry.data.get("integration_type")
+    integration = get_integration(entry)
+    if integration is None:
+        return False
 
-    # Set up coordinator
-    if integration_type == "geo_ihd":
-        from .integrations.geo_ihd.coordinator import GeoIhdCoordinator
-        coordinator = GeoIhdCoordinator(hass, entry)
-        await coordinator.async_config_entry_first_refresh()
-    elif integration_type == "seplos_v2":
-        from .integrations.seplos_v2.coordinator import SeplosV2Coordinator
-        coordinator = SeplosV2Coordinator(hass, entry)
-        await coordinator.async_config_entry_first_refresh()
-    elif integration_type == "seplos_v3":
-        from .integrations.seplos_v3.coordinator import SeplosV3Coordinator
-        coordinator = SeplosV3Coordinator(hass, entry)
-        await coordinator.async_config_entry_first_refresh()
+    coordinator = integration.create_coordinator(hass, entry)
+    coordinator.entry_cache = cache = EntryCache(hass, entry, integration.entity_schema, integration.dump_data)
+    schema = await cache.async_load()
+    restored = cache.restore(integration.load_data)
+    if entry.data.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP) and (restored or (integration.FAST_STARTUP and schema)):
+        # Entities are created from the restored data (marked stale) or
+        # the stored schema (unavailable) and updated by the first read,
+        # which must not hold up startup
+        coordinator.data = restored or {}
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+        )
     else:
-        return False
+        await coordinator.async_config_entry_first_refresh()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    integration.prepare_registries(hass, entry, coordinator)
 
-    # Store coordinator (only for integrations that use one)
-    if coordinator is not None:
-        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    @callback
+    def async_update_cache() -> None:
+        cache.async_update(coordinator.data)
+
+    async_update_cache()
+    entry.async_on_unload(coordinator.async_add_listener(async_update_cache))
 
-    # Forward to sensor platform
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    await hass.config_entries.async_forward_entry_setups(entry, integration.PLATFORMS)
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Remove coordinator
-    hass.data[DOMAIN].pop(entry.entry_id, None)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, get_integration(entry).PLATFORMS)
+
+    # Remove coordinator and release its connection
+    coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if coordinator is not None:
+        await coordinator.async_shutdown()
+
+    return unload_ok
+
 
-    return await hass.config_entries.async_unload_platforms(entry, ["sensor"])
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored state of a removed config entry."""
+    await EntryCache(hass, entry).async_remove()
@@ -0,0 +1,14 @@
+"""Binary sensor platform for Home Energy Hub."""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .integrations import async_setup_platform_entities
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up binary sensors for the entry's integration."""
+    async_setup_platform_entities(hass, entry, "binary_sensor", async_add_entities)
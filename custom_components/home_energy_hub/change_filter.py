@@ -0,0 +1,151 @@
+"""Filter entity state writes: change detection, deadbands, rate limits.
+
+A DataUpdateCoordinator calls every entity after every refresh, and each
+call writes a state. Most values (settings, device info, cells at rest)
+are the same from one poll to the next, and telemetry such as current
+jitters around a steady value. ChangeFilteredEntity compares what the
+entity would write with what it wrote last and skips the write unless
+
+  - availability or the attributes changed, or
+  - the value moved by more than the deadband (absolute, per device
+    class, or relative) and the minimum publish interval has passed, or
+  - nothing has been written for the heartbeat interval.
+
+The settings come from the config entry (see entry_filter).
+"""
+
+import time
+from typing import Any, Callable, Mapping, NamedTuple, Optional
+
+from homeassistant.core import callback
+
+from .const import (
+    CONF_DEADBAND_CURRENT, CONF_DEADBAND_PERCENT, CONF_DEADBAND_POWER,
+    CONF_DEADBAND_TEMPERATURE, CONF_DEADBAND_VOLTAGE, CONF_HEARTBEAT_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL, DEFAULT_DEADBAND_CURRENT, DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_DEADBAND_POWER, DEFAULT_DEADBAND_TEMPERATURE, DEFAULT_DEADBAND_VOLTAGE,
+    DEFAULT_HEARTBEAT_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL,
+)
+
+# Deadbands are held in the base unit of their device class; sensors in
+# one of these units get them scaled
+_UNIT_SCALE = {"mV": 1000, "mA": 1000, "kW": 0.001, "kWh": 0.001}
+
+
+class FilterSettings(NamedTuple):
+    """How the entities of one config entry filter their state writes."""
+
+    deadbands: Mapping[str, float] = {}  # device class -> base unit
+    relative: float = 0.0  # fraction of the last written value
+    min_interval: float = 0.0  # seconds between value changes
+    heartbeat: float = 0.0  # seconds; 0 never forces a write
+
+
+def entry_filter(data: Mapping[str, Any]) -> FilterSettings:
+    """Return the filter settings of a config entry."""
+    return FilterSettings(
+        deadbands={
+            # Entered in mV
+            "voltage": data.get(CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE) / 1000,
+            "current": data.get(CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT),
+            "power": data.get(CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER),
+            "temperature": data.get(CONF_DEADBAND_TEMPERATURE, DEFAULT_DEADBAND_TEMPERATURE),
+        },
+        relative=data.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT) / 100,
+        min_interval=data.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL),
+        heartbeat=data.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL),
+    )
+
+
+# Used by coordinators that do not set their own
+DEFAULT_FILTER = entry_filter({})
+
+
+def deadband_for(deadbands: Mapping[str, float], device_class: Optional[str], unit: Optional[str]) -> float:
+    """Return the deadband of a sensor, in its native unit."""
+    if not device_class:
+        return 0.0
+    return deadbands.get(str(device_class), 0.0) * _UNIT_SCALE.get(unit, 1)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ValueWatch:
+    """Remember the last state written and tell whether a new one is due."""
+
+    __slots__ = ("_read", "_deadband", "_relative", "_min_interval", "_heartbeat",
+                 "_state", "_written_at")
+
+    def __init__(self, read: Callable[[], tuple], deadband: float = 0.0,
+                 settings: FilterSettings = DEFAULT_FILTER) -> None:
+        # read() returns (available, value, attributes)
+        self._read = read
+        self._deadband = deadband
+        self._relative = settings.relative
+        self._min_interval = settings.min_interval
+        self._heartbeat = settings.heartbeat
+        self._state: tuple = ()
+        self._written_at: Optional[float] = None
+
+    def changed(self, now: Optional[float] = None) -> bool:
+        """Return True, and remember the new state, if it should be written."""
+        now = time.monotonic() if now is None else now
+        state = self._read()
+        if self._written_at is not None and not self._due(state, now - self._written_at):
+            return False
+        self._state = state
+        self._written_at = now
+        return True
+
+    def _due(self, state: tuple, elapsed: float) -> bool:
+        available, value, attributes = state
+        last_available, last_value, last_attributes = self._state
+        if available != last_available or attributes != last_attributes:
+            return True
+        if self._heartbeat and elapsed >= self._heartbeat:
+            return True
+        if value == last_value or elapsed < self._min_interval:
+            return False
+        if not (_is_number(value) and _is_number(last_value)):
+            return True
+        band = max(self._deadband, abs(last_value) * self._relative)
+        return abs(value - last_value) > band if band else True
+
+
+class ChangeFilteredEntity:
+    """Mixin for CoordinatorEntity subclasses: filter state writes.
+
+    List it before CoordinatorEntity. The coordinator provides the
+    FilterSettings in its ``change_filter`` attribute; sensors without a
+    device class only use the relative deadband.
+    """
+
+    _change_watch: Optional[ValueWatch] = None
+
+    def _watched_state(self) -> tuple:
+        return self.available, self._watched_value(), self.extra_state_attributes
+
+    def _watched_value(self) -> Any:
+        """Return the value compared between updates."""
+        return self.native_value
+
+    def _watch(self) -> ValueWatch:
+        if self._change_watch is None:
+            settings = getattr(self.coordinator, "change_filter", DEFAULT_FILTER)
+            unit = getattr(self, "native_unit_of_measurement", None)
+            self._change_watch = ValueWatch(
+                self._watched_state, deadband_for(settings.deadbands, self.device_class, unit), settings
+            )
+        return self._change_watch
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The state is written when the entity is added
+        self._watch().changed()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._watch().changed():
+            self.async_write_ha_state()
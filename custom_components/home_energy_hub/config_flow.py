@@ -11,7 +11,14 @@ from homeassistant.helpers import selector
 from .const import (
     DOMAIN, CONF_INTEGRATION_TYPE, INTEGRATION_TYPES, INTEGRATION_CATEGORIES,
     CONF_CONNECTOR_TYPE, CONNECTOR_TYPES, CONF_HOST, CONF_PORT, CONF_SERIAL_PORT, CONF_BAUD_RATE,
-    CONF_BATTERY_ADDRESS, CONF_NAME_PREFIX, CONF_POLL_INTERVAL
+    CONF_BATTERY_ADDRESS, CONF_NAME_PREFIX, CONF_POLL_INTERVAL, CONF_PACK_COUNT, DEFAULT_PACK_COUNT,
+    CONF_ALARM_POLL_INTERVAL, CONF_SETTINGS_POLL_INTERVAL, CONF_INFO_POLL_INTERVAL,
+    DEFAULT_ALARM_POLL_INTERVAL, DEFAULT_SETTINGS_POLL_INTERVAL, DEFAULT_INFO_POLL_INTERVAL,
+    CONF_DEADBAND_VOLTAGE, CONF_DEADBAND_CURRENT, CONF_DEADBAND_POWER, CONF_DEADBAND_TEMPERATURE,
+    CONF_DEADBAND_PERCENT, CONF_MIN_PUBLISH_INTERVAL, CONF_HEARTBEAT_INTERVAL,
+    DEFAULT_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_CURRENT, DEFAULT_DEADBAND_POWER, DEFAULT_DEADBAND_TEMPERATURE,
+    DEFAULT_DEADBAND_PERCENT, DEFAULT_MIN_PUBLISH_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL,
+    CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -151,7 +158,8 @@ class HomeEnergyHubFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         from .const import (
             CONF_SERIAL_PORT, CONF_BAUD_RATE, DEFAULT_BAUD_RATE,
             CONF_BATTERY_ADDRESS, BATTERY_ADDRESSES,
-            CONF_NAME_PREFIX, CONF_POLL_INTERVAL
+            CONF_NAME_PREFIX, CONF_POLL_INTERVAL,
+            CONF_PACK_COUNT, DEFAULT_PACK_COUNT,
         )
         
         base_schema = {}
@@ -174,6 +182,9 @@ class HomeEnergyHubFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     translation_key="battery_address"
                 )
             ),
+            vol.Optional(CONF_PACK_COUNT, default=DEFAULT_PACK_COUNT): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=16, mode="box")
+            ),
             vol.Optional(CONF_NAME_PREFIX, default="Seplos BMS HA"): str,
             vol.Optional(CONF_POLL_INTERVAL, default=10): selector.NumberSelector(
                 selector.NumberSelectorConfig(min=5, max=300, mode="box")
@@ -303,6 +314,7 @@ class HomeEnergyHubOptionsFlowHandler(config_entries.OptionsFlow):
         # Build schema based on connector type
         schema_fields = {
             vol.Optional("poll_interval", default=self._config_entry.data.get("poll_interval", 10)): int,
+            vol.Optional(CONF_PACK_COUNT, default=self._config_entry.data.get(CONF_PACK_COUNT, DEFAULT_PACK_COUNT)): vol.All(int, vol.Range(min=1, max=16)),
         }
         
         if connector_type == "usb_serial":
@@ -316,6 +328,31 @@ class HomeEnergyHubOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional("port", default=self._config_entry.data.get("port", 23)): int,
             })
         
+        # Per-command refresh intervals (seconds, 0 = every poll); V3
+        # reads its alarm/status block on the alarm interval
+        schema_fields[vol.Optional(CONF_ALARM_POLL_INTERVAL, default=self._config_entry.data.get(CONF_ALARM_POLL_INTERVAL, DEFAULT_ALARM_POLL_INTERVAL))] = int
+        if self._config_entry.data.get(CONF_INTEGRATION_TYPE) == "seplos_v2":
+            schema_fields.update({
+                vol.Optional(CONF_SETTINGS_POLL_INTERVAL, default=self._config_entry.data.get(CONF_SETTINGS_POLL_INTERVAL, DEFAULT_SETTINGS_POLL_INTERVAL)): int,
+                vol.Optional(CONF_INFO_POLL_INTERVAL, default=self._config_entry.data.get(CONF_INFO_POLL_INTERVAL, DEFAULT_INFO_POLL_INTERVAL)): int,
+            })
+        
+        # State write filtering (deadbands, rate limit, heartbeat)
+        for key, default, validator in (
+            (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, vol.Coerce(float)),
+            (CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT, vol.Coerce(float)),
+            (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, vol.Coerce(float)),
+            (CONF_DEADBAND_TEMPERATURE, DEFAULT_DEADBAND_TEMPERATURE, vol.Coerce(float)),
+            (CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT, vol.Coerce(float)),
+            (CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL, int),
+            (CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL, int),
+        ):
+            schema_fields[vol.Optional(key, default=self._config_entry.data.get(key, default))] = vol.All(
+                validator, vol.Range(min=0)
+            )
+
+        schema_fields[vol.Optional(CONF_FAST_STARTUP, default=self._config_entry.data.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP))] = bool
+
         schema = vol.Schema(schema_fields)
         return self.async_show_form(step_id="seplos_v2", data_schema=schema)
 
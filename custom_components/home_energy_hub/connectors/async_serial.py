@@ -0,0 +1,129 @@
+"""Non-blocking serial transport driven by the event loop.
+
+The port is opened and closed in the executor (both can block on USB
+adapters). Once open, the file descriptor is registered with the event
+loop: incoming bytes are appended to a buffer from a reader callback and
+writes go straight to the non-blocking descriptor, so no serial I/O ever
+runs on (or stalls) the event loop. POSIX only, like Home Assistant.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from typing import Optional
+
+import serial
+
+from .frame_stream import FrameStream
+
+_LOGGER = logging.getLogger(__name__)
+
+_READ_CHUNK = 4096
+
+
+class AsyncSerialTransport(FrameStream):
+    """Serial port exposing awaitable write() and read_frame()."""
+
+    def __init__(self, port: str, baudrate: int = 19200) -> None:
+        super().__init__()
+        self.port = port
+        self.baudrate = baudrate
+        self._ser: Optional[serial.Serial] = None
+        self._fd: Optional[int] = None
+
+        # Instrumentation: time spent in loop callbacks should stay ~0
+        self.callback_seconds = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while the port is open and healthy."""
+        return self._fd is not None and self._error is None
+
+    def _not_open_error(self) -> Exception:
+        return serial.SerialException(f"{self.port} is not open")
+
+    async def open(self) -> None:
+        """Open the port in the executor and start watching it."""
+        self._loop = asyncio.get_running_loop()
+        self._ser = await self._loop.run_in_executor(
+            None,
+            functools.partial(
+                serial.Serial,
+                port=self.port,
+                baudrate=self.baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=0,
+                write_timeout=0,
+            ),
+        )
+        # pyserial opens the device with O_NONBLOCK on POSIX
+        self._fd = self._ser.fileno()
+        self._error = None
+        self._loop.add_reader(self._fd, self._on_readable)
+
+    async def close(self) -> None:
+        """Stop watching the port and close it in the executor."""
+        if self._fd is not None and self._loop is not None:
+            self._loop.remove_reader(self._fd)
+            self._loop.remove_writer(self._fd)
+        self._fd = None
+        ser, self._ser = self._ser, None
+        if ser is not None and ser.is_open:
+            await asyncio.get_running_loop().run_in_executor(None, ser.close)
+        self._buffer.clear()
+
+    def _on_readable(self) -> None:
+        """Move whatever the driver has into the buffer."""
+        start = time.perf_counter()
+        try:
+            chunk = os.read(self._fd, _READ_CHUNK)
+            if not chunk:
+                raise serial.SerialException(f"{self.port} disconnected")
+        except BlockingIOError:
+            return
+        except (OSError, serial.SerialException) as err:
+            self._fail(err)
+            return
+        else:
+            self._feed(chunk)
+        finally:
+            self.callback_seconds += time.perf_counter() - start
+
+    def _fail(self, err: Exception) -> None:
+        """Record a fatal port error and stop watching the port."""
+        _LOGGER.debug("Serial error on %s: %s", self.port, err)
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        super()._fail(err)
+
+    async def write(self, data: bytes) -> None:
+        """Write *data*, waiting for the driver if its buffer is full."""
+        view = memoryview(data)
+        while view:
+            self._raise_if_failed()
+            try:
+                written = os.write(self._fd, view)
+            except BlockingIOError:
+                written = 0
+            self.bytes_written += written
+            view = view[written:]
+            if view:
+                await self._wait_writable()
+
+    async def _wait_writable(self) -> None:
+        waiter = self._loop.create_future()
+        self._loop.add_writer(self._fd, waiter.set_result, None)
+        try:
+            await waiter
+        finally:
+            self._loop.remove_writer(self._fd)
+
+    def reset_input_buffer(self) -> None:
+        """Discard buffered input, both ours and the driver's."""
+        super().reset_input_buffer()
+        if self._ser is not None:
+            self._ser.reset_input_buffer()
@@ -0,0 +1,226 @@
+"""Process-wide arbitration of shared RS485 buses.
+
+Several config entries can talk to packs on the same physical bus (a V2
+and a V3 entry on one USB adapter, or two entries behind one TCP
+bridge). Each bus is represented by a single BusArbiter keyed by serial
+port or host:port. It owns the one open transport and grants it to one
+exchange at a time, so request/response pairs from different
+coordinators never interleave on the wire.
+
+Waiting exchanges are served by priority, first come first served
+within a priority. A waiter's priority improves the longer it waits, so
+low-priority reads are delayed but never starved.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from .frame_stream import FrameStream
+
+_LOGGER = logging.getLogger(__name__)
+
+# Exchange priorities (lower is served first)
+PRIORITY_HIGH = 0    # live telemetry
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2     # settings, device info
+
+# A waiter gains one priority level per this many seconds of waiting
+_AGING_SECONDS = 5.0
+
+
+class _Waiter:
+    __slots__ = ("priority", "sequence", "enqueued", "future")
+
+    def __init__(self, priority: int, sequence: int, future: asyncio.Future) -> None:
+        self.priority = priority
+        self.sequence = sequence
+        self.enqueued = time.monotonic()
+        self.future = future
+
+    def rank(self, now: float) -> tuple:
+        return (self.priority - int((now - self.enqueued) / _AGING_SECONDS), self.sequence)
+
+
+class BusArbiter:
+    """Serialise exchanges on one bus and share its open transport."""
+
+    def __init__(self, key: str, factory: Callable[[], FrameStream],
+                 baudrate: Optional[int] = None) -> None:
+        self.key = key
+        self._factory = factory
+        # Line speed of a serial bus, fixed by its first user
+        self.baudrate = baudrate
+        self._transport: Optional[FrameStream] = None
+        self._held = False
+        self._waiters: List[_Waiter] = []
+        self._sequence = 0
+        self._users = 0
+        self._created = time.monotonic()
+        # When the last exchange ended (time.monotonic()); another process
+        # may have used the bus just before we opened it
+        self.idle_since = self._created
+
+        # Statistics
+        self.grants = 0
+        self.opens = 0
+        self.busy_seconds = 0.0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of exchanges waiting for the bus."""
+        return len(self._waiters)
+
+    @property
+    def stats(self) -> Dict[str, object]:
+        """Return a snapshot of the arbiter statistics."""
+        uptime = time.monotonic() - self._created
+        return {
+            "bus": self.key,
+            "baudrate": self.baudrate,
+            "users": self._users,
+            "transport_open": self._transport is not None and self._transport.is_open,
+            "opens": self.opens,
+            "queue_depth": self.queue_depth,
+            "grants": self.grants,
+            "wait_avg": round(self.total_wait / self.grants, 4) if self.grants else 0.0,
+            "wait_max": round(self.max_wait, 4),
+            "wait_last": round(self.last_wait, 4),
+            "utilisation": round(self.busy_seconds / uptime, 4) if uptime else 0.0,
+        }
+
+    async def async_open(self) -> FrameStream:
+        """Return the open transport, (re)opening it if needed."""
+        if self._transport is None or not self._transport.is_open:
+            if self._transport is not None:
+                await self._transport.close()
+            transport = self._factory()
+            await transport.open()
+            self._transport = transport
+            self.opens += 1
+            _LOGGER.debug("Bus %s opened (open #%d)", self.key, self.opens)
+        return self._transport
+
+    async def async_close(self) -> None:
+        """Close the transport; the next exchange reopens it."""
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            try:
+                await transport.close()
+            except Exception as err:
+                _LOGGER.debug("Error closing bus %s: %s", self.key, err)
+
+    async def _acquire(self, priority: int) -> float:
+        """Wait for the bus; return the time spent waiting."""
+        start = time.monotonic()
+        if not self._held and not self._waiters:
+            self._held = True
+            return 0.0
+
+        self._sequence += 1
+        waiter = _Waiter(priority, self._sequence, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as we were cancelled: pass the bus on
+                self._release()
+            raise
+        return time.monotonic() - start
+
+    def _release(self) -> None:
+        """Hand the bus to the best-ranked waiter, or mark it free."""
+        now = time.monotonic()
+        while self._waiters:
+            waiter = min(self._waiters, key=lambda w: w.rank(now))
+            self._waiters.remove(waiter)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self._held = False
+
+    @asynccontextmanager
+    async def exclusive(self, priority: int = PRIORITY_NORMAL) -> AsyncIterator[FrameStream]:
+        """Hold the bus for one exchange and yield its open transport.
+
+        If the exchange raises, the transport is closed so the next
+        holder starts from a fresh connection.
+        """
+        wait = await self._acquire(priority)
+        self.grants += 1
+        self.last_wait = wait
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        start = time.monotonic()
+        try:
+            transport = await self.async_open()
+            yield transport
+        except BaseException:
+            await self.async_close()
+            raise
+        finally:
+            self.idle_since = time.monotonic()
+            self.busy_seconds += self.idle_since - start
+            self._release()
+
+
+_BUSES: Dict[str, BusArbiter] = {}
+
+
+def acquire_bus(key: str, factory: Callable[[], FrameStream],
+                baudrate: Optional[int] = None) -> BusArbiter:
+    """Return the arbiter for *key*, creating it on first use.
+
+    Every acquire_bus() must be matched by an async_release_bus().
+    """
+    bus = _BUSES.get(key)
+    if bus is None:
+        bus = _BUSES[key] = BusArbiter(key, factory, baudrate)
+    bus._users += 1
+    return bus
+
+
+async def async_release_bus(bus: BusArbiter) -> None:
+    """Drop one user of *bus*; the last user closes it."""
+    bus._users -= 1
+    if bus._users <= 0 and _BUSES.get(bus.key) is bus:
+        del _BUSES[bus.key]
+        await bus.async_close()
+
+
+def serial_bus(port: str, baudrate: int = 19200) -> BusArbiter:
+    """Acquire the arbiter for serial *port*."""
+
+    def factory() -> FrameStream:
+        from .async_serial import AsyncSerialTransport
+
+        return AsyncSerialTransport(port, baudrate)
+
+    bus = acquire_bus(f"serial:{port}", factory, baudrate)
+    if bus.baudrate != baudrate:
+        # The port is already open at the first user's speed: packs
+        # configured for another one will only time out
+        _LOGGER.error("Serial bus %s is shared at %d baud; ignoring the configured %d baud",
+                      port, bus.baudrate, baudrate)
+    elif bus._users > 1:
+        _LOGGER.debug("Sharing serial bus %s (%d users)", port, bus._users)
+    return bus
+
+
+def tcp_bus(host: str, port: int = 23) -> BusArbiter:
+    """Acquire the arbiter for the TCP bridge at *host*:*port*."""
+
+    def factory() -> FrameStream:
+        from .tcp_bridge import TcpBridgeTransport
+
+        return TcpBridgeTransport(host, port)
+
+    return acquire_bus(f"tcp:{host}:{port}", factory)
@@ -0,0 +1,75 @@
+"""CRC-16/Modbus shared by the V3 transports and parser.
+
+Table driven: one lookup per byte instead of eight shift/xor steps. When
+the optional ``crcmod`` package (with its C extension) is installed it is
+used instead; the result is identical either way.
+"""
+
+from typing import Iterable, List, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_POLY = 0xA001  # 0x8005 reflected
+
+
+def _build_table() -> tuple:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ _POLY if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _build_table()
+
+
+def _table_crc16(data: Buffer) -> int:
+    """Return the CRC-16/Modbus of *data* as an int."""
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+try:
+    from crcmod.predefined import mkPredefinedCrcFun
+except ImportError:
+    mkPredefinedCrcFun = None
+
+if mkPredefinedCrcFun is not None:
+    # Accepts any buffer (bytes, bytearray, memoryview) without copying
+    modbus_crc16 = mkPredefinedCrcFun("modbus")
+    CRC_BACKEND = "crcmod"
+else:
+    modbus_crc16 = _table_crc16
+    CRC_BACKEND = "table"
+
+
+def modbus_crc(data: Buffer) -> bytes:
+    """Return the CRC-16/Modbus of *data* as 2 bytes, little-endian."""
+    crc = modbus_crc16(data)
+    return bytes((crc & 0xFF, crc >> 8))
+
+
+def frame_crc_ok(frame: Buffer) -> bool:
+    """Check that the last 2 bytes of *frame* are a valid Modbus CRC."""
+    if len(frame) < 4:
+        return False
+    view = memoryview(frame)
+    return modbus_crc16(view[:-2]) == (view[-2] | (view[-1] << 8))
+
+
+def verify_frames(frames: Iterable[Buffer]) -> List[bool]:
+    """Check the CRC of each frame in *frames*, in order."""
+    crc16 = modbus_crc16
+    results = []
+    for frame in frames:
+        if len(frame) < 4:
+            results.append(False)
+            continue
+        view = memoryview(frame)
+        results.append(crc16(view[:-2]) == (view[-2] | (view[-1] << 8)))
+    return results
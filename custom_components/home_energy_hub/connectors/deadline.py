@@ -0,0 +1,41 @@
+"""Adaptive response deadlines for request/response transports."""
+
+from typing import Dict, Hashable
+
+
+class AdaptiveDeadline:
+    """Track response times per request kind and derive a read deadline.
+
+    Uses the smoothed round-trip estimate from TCP (RFC 6298): the
+    deadline is the smoothed response time plus four times its mean
+    deviation, clamped to [minimum, maximum]. Until a kind has been
+    answered, and after it times out, the full maximum is allowed.
+    """
+
+    def __init__(self, minimum: float, maximum: float) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self._srtt: Dict[Hashable, float] = {}
+        self._rttvar: Dict[Hashable, float] = {}
+
+    def timeout(self, kind: Hashable) -> float:
+        """Return the deadline in seconds for the next *kind* request."""
+        srtt = self._srtt.get(kind)
+        if srtt is None:
+            return self.maximum
+        return min(max(srtt + 4 * self._rttvar[kind], self.minimum), self.maximum)
+
+    def record(self, kind: Hashable, elapsed: float) -> None:
+        """Record a response to *kind* that took *elapsed* seconds."""
+        srtt = self._srtt.get(kind)
+        if srtt is None:
+            self._srtt[kind] = elapsed
+            self._rttvar[kind] = elapsed / 2
+            return
+        self._rttvar[kind] = 0.75 * self._rttvar[kind] + 0.25 * abs(srtt - elapsed)
+        self._srtt[kind] = 0.875 * srtt + 0.125 * elapsed
+
+    def record_timeout(self, kind: Hashable) -> None:
+        """Forget the estimate for *kind* so the next request gets the maximum."""
+        self._srtt.pop(kind, None)
+        self._rttvar.pop(kind, None)
@@ -0,0 +1,140 @@
+"""Receive buffer with frame-delimited awaitable reads.
+
+Shared by the event-loop driven transports (serial and TCP bridge): the
+transport feeds received bytes in from a loop callback and readers await
+whole frames, returning the moment one is complete.
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from typing import Callable, Optional, Union
+
+# Takes the receive buffer, consumes what it no longer needs and returns a
+# complete frame, or None if more bytes are required. It may instead
+# return the buffer length to wait for, so the reader is not woken for
+# every chunk of a frame whose size is already known.
+FrameExtractor = Callable[[bytearray], Union[bytes, int, None]]
+
+
+def take_delimited_frame(buf: bytearray, start: bytes, end: bytes) -> Optional[bytes]:
+    """Extract the next *start*...*end* frame from *buf*.
+
+    Bytes before *start* are discarded; bytes after *end* stay buffered.
+    """
+    head = buf.find(start)
+    if head < 0:
+        # Keep a possible partial start marker only
+        del buf[:max(len(buf) - len(start) + 1, 0)]
+        return None
+    if head:
+        del buf[:head]
+    tail = buf.find(end, len(start))
+    if tail < 0:
+        return None
+    tail += len(end)
+    frame = bytes(buf[:tail])
+    del buf[:tail]
+    return frame
+
+
+class FrameStream(ABC):
+    """Base class for transports that buffer input from the event loop."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buffer = bytearray()
+        self._data_event = asyncio.Event()
+        self._error: Optional[Exception] = None
+        # Buffer length at which a waiting reader is woken
+        self._wanted = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    @property
+    @abstractmethod
+    def is_open(self) -> bool:
+        """Return True while the transport is open and healthy."""
+
+    @abstractmethod
+    async def open(self) -> None:
+        """Open the transport."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the transport."""
+
+    def _not_open_error(self) -> Exception:
+        """Return the exception raised when using a closed transport."""
+        return ConnectionError("Transport is not open")
+
+    def _feed(self, data: bytes) -> None:
+        """Append received bytes and wake any reader."""
+        self._buffer += data
+        self.bytes_read += len(data)
+        if len(self._buffer) >= self._wanted:
+            self._data_event.set()
+
+    def _fail(self, err: Exception) -> None:
+        """Record a fatal transport error and wake any reader."""
+        self._error = err
+        self._data_event.set()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if not self.is_open:
+            raise self._not_open_error()
+
+    @abstractmethod
+    async def write(self, data: bytes) -> None:
+        """Write *data* to the transport."""
+
+    def reset_input_buffer(self) -> None:
+        """Discard buffered input."""
+        self._buffer.clear()
+        self._data_event.clear()
+
+    def read_available(self) -> bytes:
+        """Return and clear everything received so far."""
+        self._raise_if_failed()
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    async def read_matching(self, extract: FrameExtractor, timeout: float) -> bytes:
+        """Wait until *extract* yields a frame from the buffer and return it.
+
+        Returns b"" if no complete frame arrives within *timeout* seconds.
+        """
+        deadline = self._loop.time() + timeout
+        try:
+            while True:
+                self._raise_if_failed()
+                frame = extract(self._buffer)
+                if isinstance(frame, int):
+                    self._wanted = frame
+                elif frame:
+                    return frame
+                else:
+                    self._wanted = 0
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    return b""
+                self._data_event.clear()
+                try:
+                    await asyncio.wait_for(self._data_event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return b""
+        finally:
+            self._wanted = 0
+
+    async def read_frame(self, start: bytes, end: bytes, timeout: float) -> bytes:
+        """Wait for the next *start*...*end* frame and return it.
+
+        Bytes before *start* are discarded; bytes after *end* stay buffered
+        for the next call. Returns b"" if no complete frame arrives within
+        *timeout* seconds.
+        """
+        return await self.read_matching(
+            lambda buf: take_delimited_frame(buf, start, end), timeout
+        )
@@ -0,0 +1,139 @@
+"""Modbus RTU response framing on a shared receive buffer.
+
+A response can arrive split over many reads, behind an RS485 echo of the
+request, behind line noise, or behind a stale frame for another request.
+ModbusFrameScanner finds it with bytes.find on whatever has been
+buffered, checks the CRC on a memoryview slice, and copies only the
+frame it returns. Bytes after that frame stay buffered for the next
+read. While a frame is incomplete the scanner reports how many bytes it
+still needs, so the reader is not woken for every chunk the driver
+delivers.
+
+Used as a FrameExtractor with FrameStream.read_matching, so the serial
+and TCP bridge transports share it.
+"""
+
+import logging
+from typing import Optional, Union
+
+from .checksum import frame_crc_ok
+
+_LOGGER = logging.getLogger(__name__)
+
+# address + function + byte count ... CRC
+_HEADER_LEN = 3
+_CRC_LEN = 2
+# address + (function | 0x80) + exception code + CRC
+_EXCEPTION_LEN = 5
+# Read functions whose count is in bits (coils, discrete inputs)
+_BIT_READS = (0x01, 0x02)
+
+
+def read_request_data_len(request: bytes) -> int:
+    """Return the data byte count a read *request* asks for."""
+    count = (request[4] << 8) | request[5]
+    if request[1] in _BIT_READS:
+        return (count + 7) // 8
+    return count * 2
+
+
+class ModbusFrameScanner:
+    """Frame extractor for the response to one Modbus RTU request.
+
+    Call it with the receive buffer: it returns the CRC-valid response
+    frame (or an exception response from the same slave), None if
+    nothing usable is buffered yet, or the buffer length to wait for when
+    a frame has started but is incomplete. Everything before the frame is
+    consumed; everything after it is left in place.
+
+    The input buffer is expected to be reset before *request* is written,
+    so an echo, if the adapter produces one, is the first thing to
+    arrive; ``echo`` records whether it did. Pass *echo* once it is known
+    for the link: False skips the echo check, True waits for the echo and
+    the start of the response together.
+    """
+
+    def __init__(self, request: bytes, data_len: Optional[int] = None,
+                 echo: Optional[bool] = None) -> None:
+        self.request = request
+        self.address = request[0]
+        self.function = request[1]
+        self.data_len = read_request_data_len(request) if data_len is None else data_len
+        self._header = bytes((self.address, self.function, self.data_len))
+        self._exception_header = bytes((self.address, self.function | 0x80))
+        self._expect_echo = echo
+        self.echo: Optional[bool] = False if echo is False else None
+
+    @property
+    def frame_len(self) -> int:
+        """Return the length of a complete normal response."""
+        return _HEADER_LEN + self.data_len + _CRC_LEN
+
+    def __call__(self, buf: bytearray) -> Union[bytes, int, None]:
+        if self.echo is None:
+            waiting = self._strip_echo(buf)
+            if waiting:
+                return waiting
+
+        while True:
+            head = buf.find(self._header)
+            exception = buf.find(self._exception_header, 0, head if head >= 0 else len(buf))
+            if exception >= 0:
+                frame = self._take(buf, exception, _EXCEPTION_LEN)
+                if frame is not None:
+                    return frame if isinstance(frame, int) else self._exception(frame)
+                continue
+            if head < 0:
+                # Keep a tail that may be the start of the next header
+                del buf[:max(len(buf) - _HEADER_LEN + 1, 0)]
+                return None
+
+            frame = self._take(buf, head, self.frame_len)
+            if frame is not None:
+                return frame
+
+    def _strip_echo(self, buf: bytearray) -> int:
+        """Drop a leading echo of the request; return bytes still needed."""
+        size = min(len(buf), len(self.request))
+        # An echoing adapter sends the echo, then at least a short response
+        wanted = len(self.request) + _EXCEPTION_LEN if self._expect_echo else len(self.request)
+        if not size:
+            return wanted if self._expect_echo else 0
+        if buf[:size] != self.request[:size]:
+            self.echo = False
+            return 0
+        if size < len(self.request):
+            return wanted
+        self.echo = True
+        del buf[:size]
+        return 0
+
+    def _take(self, buf: bytearray, start: int, length: int) -> Union[bytes, int, None]:
+        """Return the frame at *start*, the length still needed, or None.
+
+        None means the candidate failed its CRC; one byte of it has been
+        dropped so the caller can search again.
+        """
+        if start:
+            del buf[:start]
+        if len(buf) < length:
+            return length
+        with memoryview(buf) as view:
+            valid = frame_crc_ok(view[:length])
+        if not valid:
+            _LOGGER.debug("CRC mismatch on %d byte candidate: %s", length, buf[:length].hex())
+            del buf[:1]
+            return None
+        frame = bytes(buf[:length])
+        del buf[:length]
+        return frame
+
+    def _exception(self, frame: bytes) -> bytes:
+        _LOGGER.warning("Slave 0x%02X answered function 0x%02X with exception 0x%02X",
+                        self.address, self.function, frame[2])
+        return frame
+
+
+def is_exception_response(frame: bytes) -> bool:
+    """Return True if *frame* is a Modbus exception response."""
+    return len(frame) == _EXCEPTION_LEN and bool(frame[1] & 0x80)
@@ -0,0 +1,127 @@
+"""Seplos V2 request/response exchange shared by the V2 connectors."""
+
+from abc import ABC, abstractmethod
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from ..const import CONF_BATTERY_ADDRESS
+from .bus import PRIORITY_HIGH, PRIORITY_LOW, BusArbiter, async_release_bus
+from .deadline import AdaptiveDeadline
+from .seplos_v2_protocol import (
+    CID2_ALARMS, CID2_TELEMETRY, V2_COMMAND_CODES, V2_EOI, V2_MIN_RESPONSE_TIMEOUT, V2_SOI,
+    get_v2_commands,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SeplosV2StreamClient(ABC):
+    """Seplos V2 client over a shared bus.
+
+    Subclasses choose the bus (serial port or TCP bridge); the command
+    exchange is the same for both. Every exchange holds the bus for its
+    duration, so other clients on the same bus wait their turn.
+    """
+
+    def __init__(self, timeout: float = 2):
+        self.timeout = timeout
+        self._bus: Optional[BusArbiter] = None
+        self._deadlines = AdaptiveDeadline(V2_MIN_RESPONSE_TIMEOUT, timeout)
+
+    @abstractmethod
+    def _acquire_bus(self) -> BusArbiter:
+        """Return the arbiter for this client's bus (see connectors.bus)."""
+
+    @property
+    def bus_stats(self) -> dict:
+        """Return the statistics of the shared bus."""
+        return self._bus.stats if self._bus else {}
+
+    async def connect(self):
+        """Join the bus and make sure its transport is open."""
+        self._bus = self._acquire_bus()
+        try:
+            await self._bus.async_open()
+        except Exception:
+            await self.close()
+            raise
+        return self
+
+    async def close(self):
+        """Leave the bus; the last client on it closes the transport."""
+        bus, self._bus = self._bus, None
+        if bus is not None:
+            await async_release_bus(bus)
+
+    async def send_serial_commands(self, commands: List[str], priority: int = PRIORITY_HIGH) -> List[str]:
+        """Send serial commands and collect one response frame per command.
+
+        Each read returns as soon as the ``~``...CR frame arrives, with a
+        deadline adapted to how fast the pack has been answering that
+        command. A command that gets no reply yields "" so the responses
+        stay aligned with *commands*.
+        """
+        responses = []
+        _LOGGER.debug("Sending commands: %s", commands)
+        loop = asyncio.get_running_loop()
+
+        try:
+            async with self._bus.exclusive(priority) as transport:
+                # The connection stays open between exchanges, so drop any
+                # late bytes left over from the previous one.
+                transport.reset_input_buffer()
+
+                for command in commands:
+                    responses.append(await self._exchange(transport, command, loop))
+
+            _LOGGER.debug("Received responses: %s", responses)
+            return responses
+
+        except Exception as err:
+            _LOGGER.error("Seplos V2 communication error: %s", err)
+            raise
+
+    async def _exchange(self, transport, command: str, loop) -> str:
+        """Send one command and return its response frame, or ""."""
+        request = command.encode()
+        kind = command[7:9]  # CID2
+        timeout = self._deadlines.timeout(kind)
+        start = loop.time()
+        await transport.write(request)
+
+        frame = await transport.read_frame(V2_SOI, V2_EOI, timeout)
+        if frame == request:
+            # RS485 adapter echoed our own request back
+            frame = await transport.read_frame(
+                V2_SOI, V2_EOI, max(timeout - (loop.time() - start), 0)
+            )
+
+        if not frame:
+            _LOGGER.debug("No response to %s within %.2f s", command.strip(), timeout)
+            self._deadlines.record_timeout(kind)
+            return ""
+
+        self._deadlines.record(kind, loop.time() - start)
+        return frame[:-len(V2_EOI)].decode('ascii', errors='ignore')
+
+    async def read_seplos_data(self, config: dict, codes: Optional[List[str]] = None,
+                               address: Optional[str] = None) -> List[str]:
+        """Read Seplos V2 data.
+
+        *codes* selects which CID2 commands to send (all four by default);
+        responses are returned in the same order. *address* overrides the
+        configured battery address when polling several packs on one bus.
+        """
+        start = time.perf_counter()
+
+        battery_address = address or config.get(CONF_BATTERY_ADDRESS, "0x00")
+        codes = codes or V2_COMMAND_CODES
+        commands = get_v2_commands(battery_address, codes)
+        # Live data goes ahead of settings/info reads from other entries
+        live = CID2_TELEMETRY in codes or CID2_ALARMS in codes
+        result = await self.send_serial_commands(commands, PRIORITY_HIGH if live else PRIORITY_LOW)
+
+        _LOGGER.debug("Seplos V2 read finished in %.3f seconds", time.perf_counter() - start)
+        return result
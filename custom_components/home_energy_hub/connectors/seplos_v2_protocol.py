@@ -0,0 +1,80 @@
+"""Seplos V2 ASCII protocol commands.
+
+Frame layout (all fields ASCII hex):
+  SOI '~' | VER | ADR | CID1 | CID2 | LENGTH | INFO | CHKSUM | EOI CR
+
+LENGTH is a 4-bit LCHKSUM followed by the 12-bit LENID (number of INFO
+characters). CHKSUM is the two's complement of the sum of all characters
+between SOI and CHKSUM.
+"""
+
+from typing import Iterable, List
+
+# CID2 command codes, in the order the V2 parser expects their responses
+CID2_TELEMETRY = "42"
+CID2_ALARMS = "44"
+CID2_SETTINGS = "47"
+CID2_DEVICE_INFO = "51"
+
+V2_COMMAND_CODES = (CID2_TELEMETRY, CID2_ALARMS, CID2_SETTINGS, CID2_DEVICE_INFO)
+
+V2_VERSION = 0x20
+V2_CID1_BATTERY = 0x46
+
+# Frame delimiters
+V2_SOI = b"~"
+V2_EOI = b"\r"
+
+# Shortest read deadline allowed once a pack's response time is known
+V2_MIN_RESPONSE_TIMEOUT = 0.25
+
+
+def v2_length_field(info_len: int) -> str:
+    """Return the 4-character LENGTH field for an INFO of *info_len* chars."""
+    lenid = info_len & 0x0FFF
+    lchksum = (-((lenid >> 8) + ((lenid >> 4) & 0xF) + (lenid & 0xF))) & 0xF
+    return f"{lchksum:X}{lenid:03X}"
+
+
+def v2_checksum(body: str) -> str:
+    """Return the 4-character CHKSUM for the characters between SOI and CHKSUM."""
+    return f"{(-sum(body.encode('ascii'))) & 0xFFFF:04X}"
+
+
+def build_v2_command(address: int, cid2: str) -> str:
+    """Build a V2 request frame for pack *address*.
+
+    The pack address goes in both the ADR header field and the one-byte
+    INFO (command value), as expected by packs on a shared RS485 bus.
+    """
+    info = f"{address:02X}"
+    body = f"{V2_VERSION:02X}{address:02X}{V2_CID1_BATTERY:02X}{cid2}{v2_length_field(len(info))}{info}"
+    return f"~{body}{v2_checksum(body)}\r"
+
+
+def get_v2_commands(battery_address: str, codes: Iterable[str] = V2_COMMAND_CODES) -> List[str]:
+    """Return the command frames for *codes* at *battery_address*."""
+    address = int(battery_address, 0)
+    return [build_v2_command(address, code) for code in codes]
+
+
+def v2_frame_info(frame: str) -> bytes:
+    """Validate a V2 response frame and return its INFO field as bytes.
+
+    *frame* may include the leading SOI; the EOI must already be stripped.
+    Raises ValueError if the frame is too short, or its LENGTH or CHKSUM
+    field does not match.
+    """
+    body = frame[1:] if frame.startswith("~") else frame
+    if len(body) < 16:
+        raise ValueError(f"V2 frame too short ({len(body)} characters)")
+
+    payload, checksum = body[:-4], body[-4:]
+    if v2_checksum(payload) != checksum.upper():
+        raise ValueError(f"V2 checksum mismatch: got {checksum}, expected {v2_checksum(payload)}")
+
+    info = payload[12:]
+    if v2_length_field(len(info)) != payload[8:12].upper():
+        raise ValueError(f"V2 LENGTH field {payload[8:12]} does not match {len(info)} INFO characters")
+
+    return bytes.fromhex(info)
@@ -1,257 +1,241 @@
-"""Modbus RTU serial/Telnet transport for Seplos BMS V3.
+"""Modbus RTU serial/TCP-bridge transport for Seplos BMS V3.
 
 Ported from bms_connector with full RS485 half-duplex handling:
   - reset_input_buffer() before each command
-  - Explicit echo consumption — some USB-RS485 adapters loop back
-    transmitted bytes into the RX buffer.
-  - Byte-level frame synchronisation on [addr, 0x04, LEN] to avoid
-    confusing echo bytes or stale frames with the real response.
-  - CRC-16 Modbus validation on every received frame.
+  - Echo tolerance — some USB-RS485 adapters loop back transmitted
+    bytes into the RX buffer; they are skipped by the frame sync.
+  - Frame synchronisation on [addr, 0x04, LEN] plus CRC-16 validation
+    (connectors.modbus_rtu), so echo bytes or stale frames are never
+    confused with the real response.
+
+Serial ports and TCP bridges are reached through connectors.bus, so a
+V3 entry can share its adapter with other entries without the
+request/response pairs interleaving.
+
+On a serial port the link is calibrated on first use: whether the
+adapter echoes, and the shortest inter-command gap the packs tolerate
+at that baud rate. The result is kept per port and applied to every
+later exchange (see calibrate_link).
 """
 
 import asyncio
 import logging
-import serial
-import struct
-import telnetlib
 import time
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from .bus import PRIORITY_HIGH, BusArbiter, async_release_bus, serial_bus, tcp_bus
+from .modbus_rtu import ModbusFrameScanner, is_exception_response
 
 _LOGGER = logging.getLogger(__name__)
 
-# Known data-byte counts for V3 Modbus responses
-# PIA : 18 registers × 2 = 36 = 0x24
-# PIB : 26 registers × 2 = 52 = 0x34
-_VALID_DATA_LENS = (0x24, 0x34)
+# Gap between commands on a serial bus until the link is calibrated
+SERIAL_COMMAND_GAP = 0.3
 
-# ---------------------------------------------------------------------------
-# CRC-16 Modbus
-# ---------------------------------------------------------------------------
+# Inter-command gaps tried by calibration, shortest first
+_GAP_CANDIDATES = (0.0, 0.005, 0.02, 0.05, 0.1, SERIAL_COMMAND_GAP)
+# Back-to-back rounds a gap must survive to be accepted
+_CALIBRATION_ROUNDS = 3
 
-def _modbus_crc(data: bytes) -> bytes:
-    """Return CRC-16 (Modbus) as 2 bytes, little-endian."""
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return struct.pack("<H", crc)
 
+class LinkCalibration(NamedTuple):
+    """Timing learned for one serial port."""
 
-def _frame_crc_ok(frame: bytes) -> bool:
-    """Check that the last 2 bytes of *frame* are a valid Modbus CRC."""
-    if len(frame) < 4:
-        return False
-    payload = frame[:-2]
-    expected = _modbus_crc(payload)
-    return frame[-2:] == expected
+    echo: bool   # the adapter loops transmitted bytes back
+    gap: float   # idle time needed between a response and the next request
 
 
-def _expected_data_len(command_hex: str) -> int:
-    """Derive the expected response data byte count from a Modbus command."""
-    try:
-        raw = bytes.fromhex(command_hex)
-        count = (raw[4] << 8) | raw[5]
-        return count * 2
-    except Exception:
-        return 0
+# Calibrations by bus key; kept for the life of the process
+_CALIBRATIONS: Dict[str, LinkCalibration] = {}
+
+# Seconds before calibrating again after the probed pack did not answer
+_CALIBRATION_RETRY = 600
+# Bus key -> time.monotonic() before which calibration is not retried
+_CALIBRATION_BACKOFF: Dict[str, float] = {}
 
 
 # ---------------------------------------------------------------------------
-# Serial transport
+# Link calibration
 # ---------------------------------------------------------------------------
 
-def _read_modbus_frame(ser, expected_addr: int, expected_data_len: int,
-                       sync_timeout: float = 2.0) -> bytes:
-    """Read one Modbus RTU response frame with byte-level synchronisation."""
-    deadline = time.monotonic() + sync_timeout
-
-    while time.monotonic() < deadline:
-        # Phase 1 — find [addr, 0x04]
-        addr_byte = ser.read(1)
-        if not addr_byte:
-            continue
-        if addr_byte[0] != expected_addr:
-            continue
-
-        cmd_byte = ser.read(1)
-        if not cmd_byte:
-            continue
-        if cmd_byte[0] != 0x04:
-            continue
-
-        # Phase 2 — read LEN byte
-        len_byte = ser.read(1)
-        if not len_byte:
-            continue
-        data_len = len_byte[0]
-
-        if data_len not in _VALID_DATA_LENS:
-            _LOGGER.debug("Sync false-positive — LEN=0x%02X not in %s, resyncing",
-                          data_len, _VALID_DATA_LENS)
-            continue
-
-        if data_len != expected_data_len:
-            _LOGGER.debug("Skipping frame LEN=0x%02X (expected 0x%02X) — wrong type",
-                          data_len, expected_data_len)
-            ser.read(data_len + 2)
-            continue
-
-        # Phase 3 — read data + CRC
-        frame = bytes([expected_addr, 0x04, data_len]) + ser.read(data_len + 2)
-
-        if len(frame) < 3 + data_len + 2:
-            _LOGGER.warning("Incomplete frame — got %d bytes, expected %d",
-                            len(frame), 3 + data_len + 2)
-            continue
-
-        if not _frame_crc_ok(frame):
-            _LOGGER.warning("CRC mismatch on frame (%d bytes): %s",
-                            len(frame), frame.hex())
-            continue
-
-        return frame
-
-    _LOGGER.warning("Timeout — no valid Modbus frame found for addr=0x%02X in %.1fs",
-                    expected_addr, sync_timeout)
-    return b""
-
-
-def send_serial_commands(commands: List[str], port: str,
-                         baudrate: int = 19200, timeout: int = 2) -> List[str]:
-    """Send Modbus RTU commands over RS485 and return hex-string responses."""
-    responses = []
-    _LOGGER.debug("send_serial_commands: commands=%s port=%s", commands, port)
-
-    try:
-        with serial.Serial(
-            port,
-            baudrate=baudrate,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            bytesize=serial.EIGHTBITS,
-            timeout=0.2,
-        ) as ser:
-
-            for command in commands:
-                try:
-                    cmd_bytes = bytes.fromhex(command)
-                except Exception as e:
-                    _LOGGER.error("Invalid command: %s — %s", command, e)
-                    responses.append("")
-                    continue
-
-                expected_addr = cmd_bytes[0]
-                expected_data_len = _expected_data_len(command)
-
-                # Flush, write, consume echo
-                ser.reset_input_buffer()
-                ser.write(cmd_bytes)
-
-                saved_timeout = ser.timeout
-                ser.timeout = 0.15
-                echo = ser.read(len(cmd_bytes))
-                ser.timeout = saved_timeout
-
-                if len(echo) == len(cmd_bytes):
-                    _LOGGER.debug("Echo consumed (%d bytes)", len(echo))
-                elif len(echo) > 0:
-                    _LOGGER.debug("Partial echo (%d/%d bytes)", len(echo), len(cmd_bytes))
-
-                # Read Modbus response frame
-                raw = _read_modbus_frame(ser, expected_addr, expected_data_len)
-                responses.append(raw.hex() if raw else "")
-
-                time.sleep(0.3)  # Gap between commands
-
-    except serial.SerialException as e:
-        _LOGGER.error("Serial error on %s: %s", port, e)
-        return [""] * len(commands)
-
-    return responses
+class _Reply(NamedTuple):
+    response: bytes  # b"" on timeout
+    echo: Optional[bool]
+    elapsed: float
+
+
+async def _exchange(transport, request: bytes, timeout: float,
+                    quiet_since: float = 0.0, gap: float = 0.0,
+                    echo: Optional[bool] = None) -> _Reply:
+    """Write one request once the bus has been quiet for *gap* seconds.
+
+    *quiet_since* is when the bus last went quiet (time.monotonic()).
+    *echo* is whether the adapter echoes, None if not known yet.
+    """
+    delay = quiet_since + gap - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    scanner = ModbusFrameScanner(request, echo=echo)
+    transport.reset_input_buffer()
+    start = time.monotonic()
+    await transport.write(request)
+    response = await transport.read_matching(scanner, timeout)
+    return _Reply(response, scanner.echo, time.monotonic() - start)
+
+
+def frame_gap(baudrate: int) -> float:
+    """Return the Modbus RTU t3.5 inter-frame silence for *baudrate*."""
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * 11 / baudrate
+
+
+def link_calibration(bus: BusArbiter) -> Optional[LinkCalibration]:
+    """Return the stored calibration for *bus*, if it has one."""
+    return _CALIBRATIONS.get(bus.key)
+
+
+async def calibrate_link(transport, commands: List[bytes], timeout: float,
+                         baudrate: int, quiet_since: float = 0.0) -> Optional[LinkCalibration]:
+    """Measure echo and the shortest safe inter-command gap.
+
+    Sends the first command once, after the default gap, to see whether
+    the adapter echoes and how long the pack takes to answer. Then
+    replays the first two commands back to back with increasing gaps
+    (never below t3.5) until one gap survives every round. Returns None
+    if the pack does not answer at all; the caller then uses the default
+    gap and retries calibration later.
+    """
+    probe = commands[:2]
+
+    first = await _exchange(transport, probe[0], timeout, quiet_since, SERIAL_COMMAND_GAP)
+    if not first.response:
+        return None
+    # Probes fail fast: a healthy answer arrives well within this
+    probe_timeout = min(timeout, max(4 * first.elapsed, 0.1))
+
+    echo = bool(first.echo)
+    minimum = frame_gap(baudrate)
+    for gap in sorted({max(candidate, minimum) for candidate in _GAP_CANDIDATES}):
+        if await _probe_gap(transport, probe, gap, probe_timeout, echo):
+            return LinkCalibration(echo, gap)
+    return LinkCalibration(echo, SERIAL_COMMAND_GAP)
+
+
+async def _probe_gap(transport, probe, gap: float, timeout: float, echo: bool) -> bool:
+    # Start from a quiet bus so a failed shorter gap cannot spill over
+    quiet_since = time.monotonic() + SERIAL_COMMAND_GAP
+    for _ in range(_CALIBRATION_ROUNDS):
+        for request in probe:
+            if not (await _exchange(transport, request, timeout, quiet_since, gap, echo)).response:
+                return False
+            quiet_since = time.monotonic()
+    return True
 
 
 # ---------------------------------------------------------------------------
-# Telnet transport
+# Exchange
 # ---------------------------------------------------------------------------
 
-def send_telnet_commands(commands: List[str], host: str, port: int = 23,
-                         timeout: int = 8) -> List[str]:
-    """Send Modbus RTU commands via Telnet and return hex-string responses."""
+async def send_modbus_commands(bus: BusArbiter, commands: List[bytes], timeout: float,
+                               priority: int = PRIORITY_HIGH,
+                               baudrate: Optional[int] = None,
+                               optional: Optional[Sequence[bool]] = None) -> List[bytes]:
+    """Send Modbus RTU requests over *bus* and return the response frames.
+
+    The bus is held for the whole batch. Each response is returned the
+    moment a complete, CRC-valid frame has arrived; *timeout* is the
+    per-command deadline. A command that gets no reply yields b"".
+
+    *baudrate* marks a serial bus: the link is calibrated on first use,
+    commands are spaced by the calibrated gap and the echo is only
+    expected if calibration saw one. TCP bridges pace the serial side
+    themselves, so their commands go out back to back.
+
+    *optional* flags, per command, reads the pack may not implement: they
+    are not used to calibrate, and a missed one does not mean the gap is
+    too short.
+    """
+    if optional is None:
+        optional = [False] * len(commands)
     responses = []
-    _LOGGER.debug("send_telnet_commands: connecting to %s:%s", host, port)
-
-    try:
-        tn = telnetlib.Telnet(host, port, timeout=5)
-
-        try:
-            for command in commands:
-                try:
-                    cmd_bytes = bytes.fromhex(command)
-                except Exception as e:
-                    _LOGGER.error("Invalid command: %s — %s", command, e)
-                    responses.append("")
-                    continue
-
-                tn.write(cmd_bytes)
-                time.sleep(0.5)
-
-                chunks = []
-                last_data = time.monotonic()
-                deadline_time = last_data + timeout
-
-                while time.monotonic() < deadline_time:
-                    try:
-                        chunk = tn.read_very_eager()
-                        if chunk:
-                            chunks.append(chunk)
-                            last_data = time.monotonic()
-                        else:
-                            if time.monotonic() - last_data > 0.9:
-                                break
-                    except EOFError:
-                        break
-                    time.sleep(0.03)
-
-                raw = b"".join(chunks)
-                responses.append(raw.hex())
-                _LOGGER.debug("Telnet response for %s: %d bytes",
-                              command[:20], len(raw))
-
-        finally:
-            tn.close()
-
-    except Exception as e:
-        _LOGGER.error("Telnet error on %s:%s — %s", host, port, e)
-        return [""] * len(commands)
+    answered, missed = set(), set()
+    async with bus.exclusive(priority) as transport:
+        gap = 0.0
+        echo = None
+        quiet_since = bus.idle_since
+        if baudrate is not None:
+            calibration = _CALIBRATIONS.get(bus.key)
+            if calibration is None and time.monotonic() >= _CALIBRATION_BACKOFF.get(bus.key, 0.0):
+                required = [request for request, skip in zip(commands, optional) if not skip] or commands
+                calibration = await calibrate_link(transport, required, timeout, baudrate, quiet_since)
+                quiet_since = time.monotonic()
+                if calibration is not None:
+                    _LOGGER.info("Calibrated %s: echo=%s, gap=%.1f ms",
+                                 bus.key, calibration.echo, calibration.gap * 1000)
+                    _CALIBRATIONS[bus.key] = calibration
+                    _CALIBRATION_BACKOFF.pop(bus.key, None)
+                else:
+                    # Do not pay the probe timeout again on every poll
+                    _LOGGER.info("Calibration of %s got no answer from 0x%02X; using %.0f ms for %d s",
+                                 bus.key, required[0][0], SERIAL_COMMAND_GAP * 1000, _CALIBRATION_RETRY)
+                    _CALIBRATION_BACKOFF[bus.key] = time.monotonic() + _CALIBRATION_RETRY
+            if calibration is not None:
+                gap, echo = calibration.gap, calibration.echo
+            else:
+                gap = SERIAL_COMMAND_GAP
+
+        for request, skip in zip(commands, optional):
+            raw = (await _exchange(transport, request, timeout, quiet_since, gap, echo)).response
+            quiet_since = time.monotonic()
+            if is_exception_response(raw):
+                # The pack is there but rejected the read
+                answered.add(request[0])
+                raw = b""
+            elif raw:
+                answered.add(request[0])
+            elif skip:
+                _LOGGER.debug("No reply to optional read %s on %s", request.hex(), bus.key)
+            else:
+                missed.add(request[0])
+                _LOGGER.warning("Timeout — no valid Modbus frame for addr=0x%02X in %.1fs",
+                                request[0], timeout)
+            responses.append(raw)
+            _LOGGER.debug("Response for %s on %s: %d bytes",
+                          request.hex(), bus.key, len(raw))
+
+    if baudrate is not None and answered & missed:
+        # A pack answered one command but missed a required one: the gap
+        # may be too short for this bus now, so measure it again next poll.
+        _CALIBRATIONS.pop(bus.key, None)
 
     return responses
 
 
-# ---------------------------------------------------------------------------
-# Async factory
-# ---------------------------------------------------------------------------
-
-async def send_serial_commands_async(commands: List[str], port: str,
+async def send_serial_commands_async(commands: List[bytes], port: str,
                                      baudrate: int = 19200,
-                                     timeout: int = 2) -> List[str]:
-    """Async wrapper for send_serial_commands (runs in executor)."""
-    import functools
-    return await asyncio.get_event_loop().run_in_executor(
-        None,
-        functools.partial(send_serial_commands, commands, port, baudrate, timeout),
-    )
+                                     timeout: float = 2) -> List[bytes]:
+    """Send Modbus RTU requests over RS485 and return the response frames."""
+    _LOGGER.debug("send_serial_commands: commands=%s port=%s", commands, port)
+    bus = serial_bus(port, baudrate)
+    try:
+        return await send_modbus_commands(bus, commands, timeout, baudrate=baudrate)
+    except Exception as e:
+        _LOGGER.error("Serial error on %s: %s", port, e)
+        return [b""] * len(commands)
+    finally:
+        await async_release_bus(bus)
 
 
-async def send_telnet_commands_async(commands: List[str], host: str,
+async def send_telnet_commands_async(commands: List[bytes], host: str,
                                      port: int = 23,
-                                     timeout: int = 8) -> List[str]:
-    """Async wrapper for send_telnet_commands (runs in executor)."""
-    import functools
-    return await asyncio.get_event_loop().run_in_executor(
-        None,
-        functools.partial(send_telnet_commands, commands, host, port, timeout),
-    )
+                                     timeout: float = 3) -> List[bytes]:
+    """Send Modbus RTU requests via a TCP serial bridge."""
+    _LOGGER.debug("send_telnet_commands: connecting to %s:%s", host, port)
+    bus = tcp_bus(host, port)
+    try:
+        return await send_modbus_commands(bus, commands, timeout)
+    except Exception as e:
+        _LOGGER.error("Bridge error on %s:%s — %s", host, port, e)
+        return [b""] * len(commands)
+    finally:
+        await async_release_bus(bus)
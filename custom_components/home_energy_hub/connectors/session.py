@@ -0,0 +1,87 @@
+"""Long-lived connector session owned by a coordinator."""
+
+import asyncio
+from datetime import datetime
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectorSession:
+    """Keep one connector client open across polls.
+
+    The client is created on first use and reused by every following poll,
+    so a steady-state poll is only write + read. When a poll fails the
+    client is dropped and the next poll reconnects.
+    """
+
+    def __init__(self, hass: HomeAssistant, config: Dict[str, Any], integration_type: str) -> None:
+        self._hass = hass
+        self._config = config
+        self._integration_type = integration_type
+        self._client = None
+        self._lock = asyncio.Lock()
+
+        # Health state
+        self.connect_count = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[datetime] = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while a client is open."""
+        return self._client is not None
+
+    @property
+    def health(self) -> Dict[str, Any]:
+        """Return a snapshot of the connection health."""
+        return {
+            "connected": self.connected,
+            "connect_count": self.connect_count,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            # Shared bus statistics, for clients that go through connectors.bus
+            "bus": getattr(self._client, "bus_stats", {}),
+        }
+
+    async def async_get_client(self) -> Any:
+        """Return the open client, connecting lazily if needed."""
+        async with self._lock:
+            if self._client is None:
+                from . import create_connector_client
+
+                self._client = await create_connector_client(
+                    self._hass, self._config, self._integration_type
+                )
+                self.connect_count += 1
+                _LOGGER.debug("Connector opened (connect #%d)", self.connect_count)
+            return self._client
+
+    def record_success(self) -> None:
+        """Mark the last exchange as successful."""
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.last_success = datetime.now()
+
+    async def async_record_failure(self, err: Exception) -> None:
+        """Drop the client after a failed exchange so the next poll reconnects."""
+        self.consecutive_failures += 1
+        self.last_error = str(err)
+        _LOGGER.debug("Connector failure #%d: %s", self.consecutive_failures, err)
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the client if one is open."""
+        async with self._lock:
+            client, self._client = self._client, None
+            if client is None:
+                return
+            try:
+                await client.close()
+            except Exception as err:
+                _LOGGER.debug("Error closing connector: %s", err)
@@ -0,0 +1,71 @@
+"""Raw TCP serial-bridge transport (replaces telnetlib).
+
+Talks to serial-to-network bridges (ser2net, ESP-Link, USR modules, ...)
+over a plain asyncio connection. Received bytes are fed straight from
+the protocol callback into the frame buffer, so a reader wakes the
+moment a complete frame has arrived, with no thread hop or polling.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from .frame_stream import FrameStream
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _BridgeProtocol(asyncio.Protocol):
+    """Forward connection events to the owning transport."""
+
+    def __init__(self, stream: "TcpBridgeTransport") -> None:
+        self._stream = stream
+
+    def data_received(self, data: bytes) -> None:
+        self._stream._feed(data)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._stream._fail(exc or ConnectionResetError(
+            f"{self._stream.host}:{self._stream.port} closed the connection"
+        ))
+
+
+class TcpBridgeTransport(FrameStream):
+    """TCP connection exposing awaitable write() and read_frame()."""
+
+    def __init__(self, host: str, port: int = 23, connect_timeout: float = 5) -> None:
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self._transport: Optional[asyncio.Transport] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while the connection is open and healthy."""
+        return self._transport is not None and self._error is None
+
+    def _not_open_error(self) -> Exception:
+        return ConnectionError(f"{self.host}:{self.port} is not connected")
+
+    async def open(self) -> None:
+        """Connect to the bridge."""
+        self._loop = asyncio.get_running_loop()
+        self._error = None
+        self._transport, _ = await asyncio.wait_for(
+            self._loop.create_connection(lambda: _BridgeProtocol(self), self.host, self.port),
+            self.connect_timeout,
+        )
+
+    async def close(self) -> None:
+        """Close the connection."""
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+        self._buffer.clear()
+
+    async def write(self, data: bytes) -> None:
+        """Queue *data* on the connection."""
+        self._raise_if_failed()
+        self._transport.write(data)
+        self.bytes_written += len(data)
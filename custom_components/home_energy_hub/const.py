@@ -49,6 +49,43 @@ CONF_ESP_HOME_DEVICE_ID = "esphome_device_id"  # For ESPHome
 CONF_BATTERY_ADDRESS = "battery_address"
 CONF_NAME_PREFIX = "name_prefix"
 CONF_POLL_INTERVAL = "poll_interval"
+CONF_PACK_COUNT = "pack_count"  # Packs on the same bus, at consecutive addresses
+DEFAULT_PACK_COUNT = 1
+
+# Seplos V2 per-command refresh intervals (seconds, 0 = every poll); V3
+# reads its PIC alarm/status block on the alarm interval
+CONF_ALARM_POLL_INTERVAL = "alarm_poll_interval"
+CONF_SETTINGS_POLL_INTERVAL = "settings_poll_interval"
+CONF_INFO_POLL_INTERVAL = "info_poll_interval"
+DEFAULT_ALARM_POLL_INTERVAL = 0
+DEFAULT_SETTINGS_POLL_INTERVAL = 600
+DEFAULT_INFO_POLL_INTERVAL = 3600
+
+# State write filtering for battery entities: a numeric state is only
+# written when it moves by more than its deadband (absolute per device
+# class, or a percentage of the last written value), at most once per
+# minimum publish interval, and at least once per heartbeat interval
+# (seconds, 0 = off)
+CONF_DEADBAND_VOLTAGE = "deadband_voltage"  # mV
+CONF_DEADBAND_CURRENT = "deadband_current"  # A
+CONF_DEADBAND_POWER = "deadband_power"  # W
+CONF_DEADBAND_TEMPERATURE = "deadband_temperature"  # °C
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+DEFAULT_DEADBAND_VOLTAGE = 1  # absorbs ±1 mV of cell voltage jitter
+DEFAULT_DEADBAND_CURRENT = 0
+DEFAULT_DEADBAND_POWER = 0
+DEFAULT_DEADBAND_TEMPERATURE = 0
+DEFAULT_DEADBAND_PERCENT = 0
+DEFAULT_MIN_PUBLISH_INTERVAL = 0
+DEFAULT_HEARTBEAT_INTERVAL = 0
+
+# Fast startup: once an entry has been read, entities are created from
+# the stored entity schema and the first read runs in the background
+# instead of delaying Home Assistant startup
+CONF_FAST_STARTUP = "fast_startup"
+DEFAULT_FAST_STARTUP = True
 
 # Battery addresses for Seplos V2
 BATTERY_ADDRESSES = {
@@ -126,142 +163,8 @@ SENSOR_UNITS = {
     "systemState": None,
     "disconnectionState0": None,
     "disconnectionState1": None,
-    # Temperature protection sensors (these are settings, not measurements)
-    "charging_high_temperature_protection": "°C",
-    "charging_high_temperature_recovery": "°C",
-    "charging_low_temperature_protection": "°C",
-    "charging_low_temperature_recovery": "°C",
-    "discharge_high_temperature_protection": "°C",
-    "discharge_high_temperature_recovery": "°C",
-    "discharge_low_temperature_protection": "°C",
-    "discharge_low_temperature_recovery": "°C",
-    "charging_under_temperature_protection": "°C",
-    "charging_under_temperature_recovery": "°C",
-    "discharge_high_temperature_warning": "°C",
-    "power_high_temperature_alarm": "°C",
-    "power_high_temperature_recovery": "°C",
-    "power_over_temperature_protection": "°C",
-    "power_over_temperature_recovery": "°C",
-    # Current protection sensors
-    "charging_overcurrent_warning": "A",
-    "charging_overcurrent_recovery": "A",
-    "discharge_overcurrent_warning": "A",
-    "discharge_overcurrent_recovery": "A",
-    "charge_overcurrent_protection": "A",
-    "discharge_overcurrent_protection": "A",
-    "transient_overcurrent_protection": "A",
-    "charge_overcurrent_delay": "s",
-    "discharge_overcurrent_delay": "s",
-    "transient_overcurrent_delay": "ms",
-    "overcurrent_delay_recovery": "s",
-    "overcurrent_recovery_times": "times",
-    "charge_current_limit_delay": "min",
-    # Voltage protection sensors
-    "monomer_high_voltage_alarm": "mV",
-    "monomer_overvoltage_protection": "mV",
-    "monomer_overvoltage_recovery": "mV",
-    "monomer_undervoltage_protection": "mV",
-    "monomer_undervoltage_recovery": "mV",
-    "equalization_opening_voltage": "mV",
-    "battery_low_voltage_forbidden_charging": "mV",
-    "total_voltage_overvoltage_protection": "V",
-    "total_voltage_undervoltage_protection": "V",
-    "total_pressure_undervoltage_recovery": "V",
-    "charging_overvoltage_protection": "V",
-    "charging_overvoltage_recovery": "V",
-    # Additional temperature protection sensors
-    "charging_high_temperature_warning": "°C",
-    "charging_high_temperature_recovery": "°C",
-    "charging_low_temperature_warning": "°C",
-    "charging_low_temperature_recovery": "°C",
-    "charging_over_temperature_protection": "°C",
-    "charging_over_temperature_recovery": "°C",
-    "charging_under_temperature_protection": "°C",
-    "charging_under_temperature_recovery": "°C",
-    "discharge_high_temperature_warning": "°C",
-    "discharge_high_temperature_recovery": "°C",
-    "discharge_low_temperature_warning": "°C",
-    "discharge_low_temperature_recovery": "°C",
-    "discharge_over_temperature_protection": "°C",
-    "discharge_over_temperature_recovery": "°C",
-    "discharge_under_temperature_protection": "°C",
-    "discharge_under_temperature_recovery": "°C",
-    "cell_low_temperature_heating": "°C",
-    "ambient_high_temperature_alarm": "°C",
-    "ambient_high_temperature_recovery": "°C",
-    "ambient_low_temperature_alarm": "°C",
-    "ambient_low_temperature_recovery": "°C",
-    "environment_over_temperature_protection": "°C",
-    "environment_over_temperature_recovery": "°C",
-    "environment_under_temperature_protection": "°C",
-    "environment_under_temperature_recovery": "°C",
-    "power_high_temperature_alarm": "°C",
-    "power_high_temperature_recovery": "°C",
-    "power_over_temperature_protection": "°C",
-    "power_over_temperature_recovery": "°C",
-    # SOC sensor
-    "soc_ah": "Ah",
-    # Settings sensors with _settings suffix (from 47H codes)
-    "monomer_high_voltage_alarm_settings": "mV",
-    "monomer_overvoltage_protection_settings": "mV",
-    "monomer_overvoltage_recovery_settings": "mV",
-    "monomer_undervoltage_protection_settings": "mV",
-    "monomer_undervoltage_recovery_settings": "mV",
-    "equalization_opening_voltage_settings": "mV",
-    "battery_low_voltage_forbidden_charging_settings": "mV",
-    "total_voltage_overvoltage_protection_settings": "V",
-    "total_voltage_undervoltage_protection_settings": "V",
-    "total_pressure_undervoltage_recovery_settings": "V",
-    "charging_overvoltage_protection_settings": "V",
-    "charging_overvoltage_recovery_settings": "V",
-    "charging_high_temperature_warning_settings": "°C",
-    "charging_high_temperature_recovery_settings": "°C",
-    "charging_low_temperature_warning_settings": "°C",
-    "charging_low_temperature_recovery_settings": "°C",
-    "charging_over_temperature_protection_settings": "°C",
-    "charging_over_temperature_recovery_settings": "°C",
-    "charging_under_temperature_protection_settings": "°C",
-    "charging_under_temperature_recovery_settings": "°C",
-    "discharge_high_temperature_warning_settings": "°C",
-    "discharge_high_temperature_recovery_settings": "°C",
-    "discharge_low_temperature_warning_settings": "°C",
-    "discharge_low_temperature_recovery_settings": "°C",
-    "discharge_over_temperature_protection_settings": "°C",
-    "discharge_over_temperature_recovery_settings": "°C",
-    "discharge_under_temperature_protection_settings": "°C",
-    "discharge_under_temperature_recovery_settings": "°C",
-    "cell_low_temperature_heating_settings": "°C",
-    "ambient_high_temperature_alarm_settings": "°C",
-    "ambient_high_temperature_recovery_settings": "°C",
-    "ambient_low_temperature_alarm_settings": "°C",
-    "ambient_low_temperature_recovery_settings": "°C",
-    "environment_over_temperature_protection_settings": "°C",
-    "environment_over_temperature_recovery_settings": "°C",
-    "environment_under_temperature_protection_settings": "°C",
-    "environment_under_temperature_recovery_settings": "°C",
-    "power_high_temperature_alarm_settings": "°C",
-    "power_high_temperature_recovery_settings": "°C",
-    "power_over_temperature_protection_settings": "°C",
-    "power_over_temperature_recovery_settings": "°C",
-    "charging_overcurrent_warning_settings": "A",
-    "charging_overcurrent_recovery_settings": "A",
-    "discharge_overcurrent_warning_settings": "A",
-    "discharge_overcurrent_recovery_settings": "A",
-    "charge_overcurrent_protection_settings": "A",
-    "discharge_overcurrent_protection_settings": "A",
-    "transient_overcurrent_protection_settings": "A",
-    "charge_overcurrent_delay_settings": "s",
-    "discharge_overcurrent_delay_settings": "s",
-    "transient_overcurrent_delay_settings": "ms",
-    "overcurrent_delay_recovery_settings": "s",
-    "overcurrent_recovery_times_settings": "times",
-    "charge_current_limit_delay_settings": "min",
-    "battery_rated_capacity_settings": "Ah",
-    "remaining_capacity_alarm_settings": "%",
-    "remaining_capacity_protection_settings": "%",
-    "interval_charge_capacity_settings": "%",
-    "cycle_cumulative_capacity_settings": "%",
-    "soc_ah_settings": "Ah",
+    # 47H settings ("*_settings" keys) take their units from
+    # integrations/seplos_v2/settings_fields.py
 }
 
 # Seplos V2 alarm mappings (from reference file)
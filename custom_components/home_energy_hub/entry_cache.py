@@ -0,0 +1,113 @@
+"""Per config entry state kept across Home Assistant restarts.
+
+After every update the coordinator data is saved to Home Assistant
+storage with its entity schema (for each pack, the keys its last read
+reported). On the next start setup restores the data and creates the
+entities from it straight away, while the first read of a slow bus runs
+in the background (see async_setup_entry). Until that read succeeds the
+restored states carry a ``stale`` attribute.
+
+Writes are throttled: a change is written SAVE_DELAY seconds after the
+first unsaved update, and on shutdown.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Seconds between writes
+SAVE_DELAY = 60
+
+# State attribute of entities showing restored, not yet refreshed data
+ATTR_STALE = "stale"
+
+# Pack address -> entity keys
+EntitySchema = Dict[str, List[str]]
+
+
+def pack_schema(data: Mapping[str, Mapping[str, Any]]) -> EntitySchema:
+    """Return the entity schema of coordinator data keyed by pack address."""
+    return {address: list(snapshot) for address, snapshot in data.items()}
+
+
+class EntryCache:
+    """The stored state of one config entry.
+
+    *schema* and *dump* turn coordinator data into the entity schema and
+    JSON-serialisable data; they run when the data is written, not on
+    every update.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry,
+                 schema: Callable[[Any], EntitySchema] = pack_schema,
+                 dump: Callable[[Any], Any] = dict) -> None:
+        self._store: Store[Dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self._schema = schema
+        self._dump = dump
+        self.schema: EntitySchema = {}
+        self.data: Any = None  # restored coordinator data
+        self._stored_data: Any = None
+        self._latest: Any = None
+        self._save_pending = False
+
+    async def async_load(self) -> EntitySchema:
+        """Load the stored state and return its entity schema, empty if none."""
+        try:
+            stored = await self._store.async_load() or {}
+        except Exception as err:  # a corrupt file must not block setup
+            _LOGGER.warning("Ignoring unreadable cache %s: %s", self._store.path, err)
+            stored = {}
+        self.schema = stored.get("schema", {})
+        self._stored_data = stored.get("data")
+        return self.schema
+
+    def restore(self, load: Callable[[Any], Any]) -> Any:
+        """Return the stored coordinator data rebuilt by *load*, None if none."""
+        if not self._stored_data:
+            return None
+        try:
+            self.data = load(self._stored_data)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring stored data of %s: %s", self._store.key, err)
+            self.data = None
+        self._stored_data = None
+        return self.data
+
+    def is_restored(self, data: Any) -> bool:
+        """Return True if *data* is the restored data, not a read."""
+        return data is not None and data is self.data
+
+    @callback
+    def async_update(self, data: Any) -> None:
+        """Save *data* as the entry's latest coordinator data."""
+        if not data or self.is_restored(data):
+            return
+        self._latest = data
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        self._save_pending = False
+        return {"schema": self._schema(self._latest), "data": self._dump(self._latest)}
+
+    async def async_remove(self) -> None:
+        """Delete the stored state."""
+        await self._store.async_remove()
+
+
+def stale_attributes(coordinator, attributes: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Return *attributes*, flagged stale while *coordinator* shows restored data."""
+    cache: Optional[EntryCache] = getattr(coordinator, "entry_cache", None)
+    if cache is None or not cache.is_restored(coordinator.data):
+        return attributes
+    return {**(attributes or {}), ATTR_STALE: True}
@@ -1 +1,81 @@
-"""Integrations module."""
\ No newline at end of file
+"""Integrations module.
+
+Every integration package declares, in its __init__, how the root entry
+point sets it up:
+
+    PLATFORMS           platforms the config entry is forwarded to
+    FAST_STARTUP        whether entities can be created from a stored
+                        schema alone, before the first read
+    create_coordinator  (hass, entry) -> the entry's DataUpdateCoordinator
+    prepare_registries  (hass, entry, coordinator), before the platforms
+    entity_schema       coordinator data -> {address: entity keys}
+    dump_data           coordinator data -> JSON-serialisable data
+    load_data           the output of dump_data -> coordinator data
+    ENTITIES            platform -> (coordinator, entry, schema) -> list
+                        of entities for the keys in schema
+
+The root __init__ and platform modules only dispatch through this
+registry, so each entry gets one coordinator, one first refresh and one
+set of entities. Entities for keys that appear in later reads are added
+as they appear.
+"""
+
+from types import ModuleType
+from typing import Dict, Optional, Set
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from ..const import CONF_INTEGRATION_TYPE, DOMAIN
+from . import geo_ihd, seplos_v2, seplos_v3
+
+# integration_type -> package under integrations/; imported up front so
+# no import runs on the event loop
+INTEGRATIONS: Dict[str, ModuleType] = {
+    "geo_ihd": geo_ihd,
+    "seplos_v2": seplos_v2,
+    "seplos_v3": seplos_v3,
+}
+
+
+def get_integration(entry: ConfigEntry) -> Optional[ModuleType]:
+    """Return the integration package of a config entry, None if unknown."""
+    return INTEGRATIONS.get(entry.data.get(CONF_INTEGRATION_TYPE))
+
+
+@callback
+def async_setup_platform_entities(
+    hass: HomeAssistant, entry: ConfigEntry, platform: str, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Add the entities the entry's integration has on *platform*.
+
+    Entities are created from the coordinator data, or from the stored
+    schema while the first read is still running, and again for new keys
+    after every update.
+    """
+    integration = get_integration(entry)
+    factory = integration.ENTITIES.get(platform) if integration is not None else None
+    if factory is None:
+        return
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    added: Dict[str, Set[str]] = {}
+
+    @callback
+    def async_add_new_entities() -> None:
+        if coordinator.data:
+            schema = integration.entity_schema(coordinator.data)
+        else:
+            schema = coordinator.entry_cache.schema
+        new = {}
+        for address, keys in schema.items():
+            known = added.setdefault(address, set())
+            keys = [key for key in keys if key not in known]
+            if keys:
+                known.update(keys)
+                new[address] = keys
+        if new:
+            async_add_entities(factory(coordinator, entry, new))
+
+    async_add_new_entities()
+    entry.async_on_unload(coordinator.async_add_listener(async_add_new_entities))
@@ -5,31 +5,50 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 
 from .coordinator import GeoIhdCoordinator
-from .sensor import GeoIhdSensor
+from .sensor import build_sensors
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
-    """Set up GEO IHD sensors."""
+PLATFORMS = ("sensor",)
+
+# Sensors take their names and units from the API response, so they
+# can only be created early from restored data
+FAST_STARTUP = False
+
+ENTITIES = {
+    "sensor": build_sensors,
+}
+
+
+def create_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> GeoIhdCoordinator:
+    """Return the coordinator polling the GEO API."""
+    return GeoIhdCoordinator(hass, entry)
+
+
+def entity_schema(data: dict) -> dict:
+    """Return the reading keys; the IHD has no packs, so one empty address."""
+    return {"": list(data)}
+
+
+def dump_data(data: dict) -> dict:
+    """Return the readings to store; they are plain JSON already."""
+    return data
+
+
+def load_data(stored: dict) -> dict:
+    """Rebuild readings saved with dump_data."""
+    return dict(stored)
+
+
+def prepare_registries(hass: HomeAssistant, entry: ConfigEntry, coordinator: GeoIhdCoordinator) -> None:
+    """Register the electricity and gas devices."""
     device_registry = dr.async_get(hass)
     username = entry.data.get("username")
-    coordinator = GeoIhdCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
-
-    # Register devices
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={("home_energy_hub", entry.entry_id, username, "electric")},
-        manufacturer="Geo Home",
-        name=f"Geo Home IHD - Electricity",
-        model="Geo IHD",
-        sw_version="v1.0",
-    )
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={("home_energy_hub", entry.entry_id, username, "gas")},
-        manufacturer="Geo Home",
-        name=f"Geo Home IHD - Gas",
-        model="Geo IHD",
-        sw_version="v1.0",
-    )
-
-    async_add_entities([GeoIhdSensor(coordinator, key, entry.entry_id, username) for key in coordinator.data.keys()])
\ No newline at end of file
+
+    for fuel in ("electric", "gas"):
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={("home_energy_hub", "geo_ihd", entry.entry_id, username, fuel)},
+            manufacturer="Geo Home",
+            name=f"Geo IHD",
+            model="Geo IHD",
+            sw_version="v1.0",
+        )
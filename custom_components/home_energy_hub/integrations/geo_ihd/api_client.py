@@ -11,37 +11,25 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class GeoHomeAPIClient:
-    """Client for Geo Home API."""
+    """Client for Geo Home API.
 
-    def __init__(self, username: str, password: str, base_url: str = "https://api.geotogether.com") -> None:
+    Requests go through the given session, which the caller owns. With
+    Home Assistant's shared session, connections to the API are pooled
+    and kept alive between polls instead of being set up for each one.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, username: str, password: str,
+                 base_url: str = "https://api.geotogether.com") -> None:
         self.username = username
         self.password = password
         self.base_url = base_url
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session = session
         self._token: Optional[str] = None
         self._token_expires: Optional[datetime] = None
 
-    async def __aenter__(self):
-        await self._ensure_session()
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self._close_session()
-
-    async def _ensure_session(self) -> None:
-        """Ensure aiohttp session is created."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-
-    async def _close_session(self) -> None:
-        """Close aiohttp session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-
     async def _make_request(self, url: str, method: str = 'GET', headers: Optional[Dict[str, str]] = None,
                            json_body: Optional[Dict[str, Any]] = None, retries: int = 3) -> Dict[str, Any]:
         """Make HTTP request with retry logic."""
-        await self._ensure_session()
         full_url = self.base_url + url
         request_headers = headers or {}
 
@@ -1,13 +1,16 @@
 """Data coordinator for GEO IHD."""
 
+import asyncio
 from datetime import datetime, timedelta
 import logging
-from typing import Any, Optional
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from ...change_filter import entry_filter
 from .api_client import GeoHomeAPIClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,8 +22,16 @@ class GeoIhdCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._config = entry.data
         self.entry_id = entry.entry_id
         self.username = self._config.get("username")
-        self._api_client: Optional[GeoHomeAPIClient] = None
+        # One client for the life of the entry, on Home Assistant's shared
+        # session, so polls reuse pooled keep-alive connections
+        self._api_client = GeoHomeAPIClient(
+            async_get_clientsession(hass),
+            self.username,
+            self._config.get("password"),
+            self._config.get("host", "https://api.geotogether.com"),
+        )
         self._cache = {}
+        self.change_filter = entry_filter(entry.data)
         super().__init__(
             hass, _LOGGER, name="GEO IHD", update_interval=timedelta(seconds=self._config.get("sensor_update_frequency", 30))
         )
@@ -45,7 +56,13 @@ class GeoIhdCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         return self._cache.get(cache_key, {}).get('data')
 
     async def _get_consolidated_data(self) -> dict[str, Any]:
-        """Fetch consolidated data from API with caching."""
+        """Fetch consolidated data from API with caching.
+
+        The endpoints whose cached data has expired are fetched together,
+        after a single authentication. Only the first poll (or the first
+        after a failure) reads the device data on its own, because the
+        meter endpoints need the system ID it holds.
+        """
         cache_key_token = f"token_{self.entry_id}"
         cache_key_system_id = f"system_id_{self.entry_id}"
         cache_key_periodic_data = f"periodic_data_{self.entry_id}"
@@ -53,48 +70,29 @@ class GeoIhdCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         cache_key_device_data = f"device_data_{self.entry_id}"
 
         try:
-            # Initialize API client
-            if self._api_client is None:
-                self._api_client = GeoHomeAPIClient(
-                    self.username,
-                    self._config.get("password"),
-                    self._config.get("host", "https://api.geotogether.com")
-                )
-
-            async with self._api_client:
-                # Get or cache system ID
-                if not self._is_cache_valid(cache_key_system_id, timedelta(hours=1)):
-                    if not self._is_cache_valid(cache_key_device_data, timedelta(hours=1)):
-                        device_data = await self._api_client.get_device_data()
-                        self._update_cache(cache_key_device_data, device_data)
-                    else:
-                        device_data = self._get_cached_data(cache_key_device_data)
-
-                    system_id = device_data["systemRoles"][0]["systemId"]
-                    self._update_cache(cache_key_system_id, system_id)
-                else:
-                    system_id = self._get_cached_data(cache_key_system_id)
+            await self._api_client.authenticate()
 
-                # Get periodic data
-                if not self._is_cache_valid(cache_key_periodic_data, timedelta(minutes=10)):
-                    periodic_meter_data = await self._api_client.get_periodic_meter_data(system_id)
-                    self._update_cache(cache_key_periodic_data, periodic_meter_data)
-                else:
-                    periodic_meter_data = self._get_cached_data(cache_key_periodic_data)
+            # The system ID is kept until a poll fails
+            if self._get_cached_data(cache_key_system_id) is None:
+                device_data = await self._api_client.get_device_data()
+                self._update_cache(cache_key_device_data, device_data)
+                self._update_cache(cache_key_system_id, device_data["systemRoles"][0]["systemId"])
+            system_id = self._get_cached_data(cache_key_system_id)
 
-                # Get live data
-                if not self._is_cache_valid(cache_key_live_data, timedelta(seconds=30)):
-                    live_meter_data = await self._api_client.get_live_meter_data(system_id)
-                    self._update_cache(cache_key_live_data, live_meter_data)
-                else:
-                    live_meter_data = self._get_cached_data(cache_key_live_data)
+            # Fetch every endpoint whose data has expired at once
+            fetches = {}
+            if not self._is_cache_valid(cache_key_device_data, timedelta(hours=1)):
+                fetches[cache_key_device_data] = self._api_client.get_device_data()
+            if not self._is_cache_valid(cache_key_periodic_data, timedelta(minutes=10)):
+                fetches[cache_key_periodic_data] = self._api_client.get_periodic_meter_data(system_id)
+            if not self._is_cache_valid(cache_key_live_data, timedelta(seconds=30)):
+                fetches[cache_key_live_data] = self._api_client.get_live_meter_data(system_id)
+            for cache_key, result in zip(fetches, await asyncio.gather(*fetches.values())):
+                self._update_cache(cache_key, result)
 
-                # Get device data if not cached
-                if not self._is_cache_valid(cache_key_device_data, timedelta(hours=1)):
-                    device_data = await self._api_client.get_device_data()
-                    self._update_cache(cache_key_device_data, device_data)
-                else:
-                    device_data = self._get_cached_data(cache_key_device_data)
+            periodic_meter_data = self._get_cached_data(cache_key_periodic_data)
+            live_meter_data = self._get_cached_data(cache_key_live_data)
+            device_data = self._get_cached_data(cache_key_device_data)
 
             return {
                 'PeriodicMeterData': periodic_meter_data,
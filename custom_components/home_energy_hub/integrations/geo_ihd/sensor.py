@@ -4,7 +4,10 @@ from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, Sen
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-class GeoIhdSensor(CoordinatorEntity, RestoreSensor):
+from ...change_filter import ChangeFilteredEntity
+from ...entry_cache import stale_attributes
+
+class GeoIhdSensor(ChangeFilteredEntity, CoordinatorEntity, RestoreSensor):
     """Sensor for GEO IHD data."""
 
     def __init__(self, coordinator, key: str, entry_id: str, username: str) -> None:
@@ -48,11 +51,19 @@ class GeoIhdSensor(CoordinatorEntity, RestoreSensor):
             name="Geo IHD",
         )
 
+    def _watched_value(self):
+        return self.state
+
     @property
     def state(self):
         """Return the state of the sensor."""
         return self.coordinator.data[self._key]['state']
 
+    @property
+    def extra_state_attributes(self):
+        """Flag restored readings until the first update."""
+        return stale_attributes(self.coordinator)
+
     @property
     def native_unit_of_measurement(self):
         """Return the unit of measurement."""
@@ -67,3 +78,9 @@ class GeoIhdSensor(CoordinatorEntity, RestoreSensor):
     def state_class(self):
         """Return the state class of the sensor."""
         return self._attr_state_class
+
+
+def build_sensors(coordinator, entry, schema: dict) -> list:
+    """Return one sensor per GEO IHD reading in *schema*."""
+    username = entry.data.get("username")
+    return [GeoIhdSensor(coordinator, key, entry.entry_id, username) for keys in schema.values() for key in keys]
@@ -2,64 +2,75 @@
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 
+from .binary_sensor import build_binary_sensors
 from .coordinator import SeplosV2Coordinator
-from ...const import DOMAIN
+from .sensor import build_sensors
+from .modbus_processor import CELL_VOLTAGES, TEMPERATURES
+from ...entry_cache import pack_schema
+from ...snapshot import PackSnapshot, dump_packs, load_packs
+from ...utils import pack_id_suffix
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Seplos V2 from a config entry."""
-    import logging
-    from homeassistant.helpers import device_registry as dr
-    
-    _LOGGER = logging.getLogger(__name__)
-    _LOGGER.info("Setting up Seplos V2 integration for entry: %s", entry.entry_id)
-    
-    # Create coordinator
-    coordinator = SeplosV2Coordinator(hass, entry)
-    
-    # Perform initial data refresh to ensure we have data before setting up entities
-    await coordinator.async_config_entry_first_refresh()
-    
-    # Store coordinator in hass.data
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-    
-    # Get configuration for device names
+# The data maps pack addresses to snapshots, like every pack integration
+entity_schema = pack_schema
+dump_data = dump_packs
+
+PLATFORMS = ("sensor", "binary_sensor")
+
+# Entities only need their pack address and key, so they can be
+# created from the stored schema before the first read
+FAST_STARTUP = True
+
+ENTITIES = {
+    "sensor": build_sensors,
+    "binary_sensor": build_binary_sensors,
+}
+
+
+def create_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> SeplosV2Coordinator:
+    """Return the coordinator polling the entry's packs."""
+    return SeplosV2Coordinator(hass, entry)
+
+
+def load_data(stored: dict) -> dict[str, PackSnapshot]:
+    """Rebuild coordinator data saved with dump_data."""
+    return load_packs(stored, CELL_VOLTAGES, TEMPERATURES)
+
+
+def prepare_registries(hass: HomeAssistant, entry: ConfigEntry, coordinator: SeplosV2Coordinator) -> None:
+    """Register the BMS and Settings devices of every pack."""
     name_prefix = entry.data.get("name_prefix", "Seplos BMS HA")
-    
-    # Register devices in device registry (like GEO IHD does)
     device_registry = dr.async_get(hass)
     
-    # Create BMS device
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={("home_energy_hub", f"seplos_v2_{entry.entry_id}")},
-        manufacturer="Seplos",
-        name=f"{name_prefix}",
-        model="V2 BMS",
-        sw_version=coordinator.data.get("software_version", "Unknown"),
-    )
-    
-    # Create Settings device
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={("home_energy_hub", f"seplos_v2_{entry.entry_id}_settings")},
-        manufacturer="Seplos",
-        name=f"{name_prefix} Settings",
-        model="V2 Settings",
-        sw_version=coordinator.data.get("software_version", "Unknown"),
-    )
-    
-    # Set up sensors and binary sensors
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "binary_sensor"])
-    
-    _LOGGER.info("Seplos V2 integration setup complete - created BMS and Settings devices")
-    return True
+    for address in coordinator.addresses:
+        pack_suffix = pack_id_suffix(entry.data, address)
+        pack_name = f"{name_prefix} {address}" if pack_suffix else f"{name_prefix}"
+        sw_version = coordinator.data.get(address, {}).get("software_version", "Unknown")
+
+        # Create BMS device
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={("home_energy_hub", f"seplos_v2_{entry.entry_id}{pack_suffix}")},
+            manufacturer="Seplos",
+            name=pack_name,
+            model="V2 BMS",
+            sw_version=sw_version,
+        )
+        
+        # Create Settings device
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={("home_energy_hub", f"seplos_v2_{entry.entry_id}{pack_suffix}_settings")},
+            manufacturer="Seplos",
+            name=f"{pack_name} Settings",
+            model="V2 Settings",
+            sw_version=sw_version,
+        )
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    if await hass.config_entries.async_unload_platforms(entry, ["sensor", "binary_sensor"]):
-        hass.data[DOMAIN].pop(entry.entry_id)
-        return True
-    return False
\ No newline at end of file
+    # Balancing states used to be created as sensors as well as binary
+    # sensors; drop the sensor copies left in the entity registry
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if entity.domain == "sensor" and "_balancer_active_cell_" in entity.unique_id:
+            entity_registry.async_remove(entity.entity_id)
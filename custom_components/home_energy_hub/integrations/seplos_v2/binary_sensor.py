@@ -2,97 +2,81 @@
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
+from ...change_filter import ChangeFilteredEntity
+from ...entry_cache import stale_attributes
 from ...const import CONF_NAME_PREFIX
+from ...snapshot import make_accessor
+from ...utils import pack_id_suffix
+from .descriptions import BINARY_SENSOR_PREFIX, describe_binary_sensor
 
 
-class SeplosV2BinarySensor(CoordinatorEntity, BinarySensorEntity):
+class SeplosV2BinarySensor(ChangeFilteredEntity, CoordinatorEntity, BinarySensorEntity):
     """Binary sensor for Seplos V2 balancing states."""
 
-    def __init__(self, coordinator, key: str, config_entry: ConfigEntry) -> None:
+    def __init__(self, coordinator, key: str, config_entry: ConfigEntry, address: str | None = None) -> None:
         super().__init__(coordinator)
         self._key = key
         self.config_entry = config_entry
         
         # Get configuration
         name_prefix = config_entry.data.get(CONF_NAME_PREFIX, "Seplos BMS HA")
-        battery_address = config_entry.data.get("battery_address", "0x00")
+        battery_address = address or config_entry.data.get("battery_address", "0x00")
+        self._address = battery_address
         
         # Full entity name — already includes prefix, so disable has_entity_name
         # to prevent HA 2024+ from doubling it with the device name prefix.
         self._attr_has_entity_name = False
-        sensor_display_name = self._get_sensor_name(key)
-        self._attr_name = f"{name_prefix} {battery_address} {sensor_display_name}"
+        description = describe_binary_sensor(key)
+        self._attr_name = f"{name_prefix} {battery_address} {description.name}"
         
         # Use stable unique_id based on entry_id — NOT the user-configurable name_prefix.
         # This prevents entity duplication when the prefix is changed.
-        snake_case_key = self._camel_to_snake(key)
-        self._attr_unique_id = f"seplos_v2_{config_entry.entry_id}_{snake_case_key}"
+        pack_suffix = pack_id_suffix(config_entry.data, battery_address)
+        self._attr_unique_id = f"seplos_v2_{config_entry.entry_id}{pack_suffix}_{description.unique_id_suffix}"
         
         # Set device info
         self._attr_device_info = DeviceInfo(
-            identifiers={("home_energy_hub", f"seplos_v2_{config_entry.entry_id}")},
-            name=f"{name_prefix}",
+            identifiers={("home_energy_hub", f"seplos_v2_{config_entry.entry_id}{pack_suffix}")},
+            name=f"{name_prefix} {battery_address}" if pack_suffix else f"{name_prefix}",
             manufacturer="Seplos",
             model="V2 BMS",
-            sw_version=self.coordinator.data.get("software_version", "Unknown"),
+            sw_version=self.coordinator.data.get(battery_address, {}).get("software_version", "Unknown"),
         )
+        self._read = make_accessor(key)
 
-    def _camel_to_snake(self, name: str) -> str:
-        """Convert camelCase to snake_case."""
-        import re
-        # Insert underscores before capital letters
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-        # Insert underscores between letters and numbers
-        s3 = re.sub('([a-zA-Z])([0-9])', r'\1_\2', s2)
-        s4 = re.sub('([0-9])([a-zA-Z])', r'\1_\2', s3)
-        # Convert to lowercase
-        return s4.lower()
+    def _watched_value(self):
+        return self.is_on
 
-    def _get_sensor_name(self, key: str) -> str:
-        """Get human readable sensor name from key."""
-        name_map = {
-            "balancerActiveCell1": "Balancer Active Cell 1",
-            "balancerActiveCell2": "Balancer Active Cell 2",
-            "balancerActiveCell3": "Balancer Active Cell 3",
-            "balancerActiveCell4": "Balancer Active Cell 4",
-            "balancerActiveCell5": "Balancer Active Cell 5",
-            "balancerActiveCell6": "Balancer Active Cell 6",
-            "balancerActiveCell7": "Balancer Active Cell 7",
-            "balancerActiveCell8": "Balancer Active Cell 8",
-            "balancerActiveCell9": "Balancer Active Cell 9",
-            "balancerActiveCell10": "Balancer Active Cell 10",
-            "balancerActiveCell11": "Balancer Active Cell 11",
-            "balancerActiveCell12": "Balancer Active Cell 12",
-            "balancerActiveCell13": "Balancer Active Cell 13",
-            "balancerActiveCell14": "Balancer Active Cell 14",
-            "balancerActiveCell15": "Balancer Active Cell 15",
-            "balancerActiveCell16": "Balancer Active Cell 16",
-        }
-        
-        # If not in mapping, convert from camelCase to proper spacing
-        if key not in name_map:
-            # Convert camelCase to space-separated words
-            spaced_name = re.sub(r'([a-z])([A-Z])', r'\1 \2', key)
-            # Handle numbers after words
-            spaced_name = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', spaced_name)
-            # Handle numbers before words
-            spaced_name = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', spaced_name)
-            return spaced_name.title()
-            
-        return name_map.get(key, key.replace("_", " ").title())
+    @property
+    def available(self) -> bool:
+        """Return True if the pack answered the last poll."""
+        return super().available and self._address in self.coordinator.data
 
     @property
     def is_on(self):
         """Return the state of the binary sensor."""
-        return self.coordinator.data.get(self._key, False)
+        snapshot = self.coordinator.data.get(self._address)
+        return bool(self._read(snapshot)) if snapshot is not None else False
+
+    @property
+    def extra_state_attributes(self):
+        """Flag restored states until the first read."""
+        return stale_attributes(self.coordinator)
 
     @property
     def icon(self):
         """Return the icon for the binary sensor."""
-        return "mdi:battery"
\ No newline at end of file
+        return "mdi:battery"
+
+
+def build_binary_sensors(coordinator, entry: ConfigEntry, schema: dict) -> list:
+    """Return the cell balancing binary sensors for the keys in *schema*."""
+    return [
+        SeplosV2BinarySensor(coordinator, key, entry, address)
+        for address, keys in schema.items()
+        for key in keys
+        if key.startswith(BINARY_SENSOR_PREFIX)
+    ]
@@ -8,46 +8,131 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from ...connectors import create_connector_client
-from .modbus_processor import parse_seplos_response
-from ...const import CONF_INTEGRATION_TYPE
+from ...connectors.seplos_v2_protocol import (
+    CID2_ALARMS, CID2_DEVICE_INFO, CID2_SETTINGS, CID2_TELEMETRY, V2_COMMAND_CODES,
+)
+from ...connectors.session import ConnectorSession
+from .modbus_processor import merge_seplos_sections, parse_seplos_section
+from ...change_filter import entry_filter
+from ...scheduler import CommandScheduler
+from ...snapshot import PackSnapshot
+from ...utils import get_pack_addresses
+from ...const import (
+    CONF_INTEGRATION_TYPE,
+    CONF_ALARM_POLL_INTERVAL, CONF_SETTINGS_POLL_INTERVAL, CONF_INFO_POLL_INTERVAL,
+    DEFAULT_ALARM_POLL_INTERVAL, DEFAULT_SETTINGS_POLL_INTERVAL, DEFAULT_INFO_POLL_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-class SeplosV2Coordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator for Seplos V2."""
+class SeplosV2Coordinator(DataUpdateCoordinator[dict[str, PackSnapshot]]):
+    """Coordinator for Seplos V2.
+
+    Owns a persistent connector session so the serial port (or telnet
+    socket) stays open between polls instead of being reopened each time.
+    Every pack on the bus is polled through that one session, and the
+    data maps each pack address to a PackSnapshot.
+
+    Telemetry (42H) is read on every poll; alarms (44H), settings (47H)
+    and device info (51H) are read on their own intervals and the last
+    parsed result for each is merged into the pack snapshot.
+    """
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        self._client = None
         self.config_entry = entry
         self._integration_type = entry.data[CONF_INTEGRATION_TYPE]
+        self._session = ConnectorSession(hass, entry.data, self._integration_type)
+        self.addresses = get_pack_addresses(entry.data)
+        self.change_filter = entry_filter(entry.data)
+        intervals = {
+            CID2_TELEMETRY: 0,
+            CID2_ALARMS: entry.data.get(CONF_ALARM_POLL_INTERVAL, DEFAULT_ALARM_POLL_INTERVAL),
+            CID2_SETTINGS: entry.data.get(CONF_SETTINGS_POLL_INTERVAL, DEFAULT_SETTINGS_POLL_INTERVAL),
+            CID2_DEVICE_INFO: entry.data.get(CONF_INFO_POLL_INTERVAL, DEFAULT_INFO_POLL_INTERVAL),
+        }
+        self._schedulers = {address: CommandScheduler(intervals, V2_COMMAND_CODES) for address in self.addresses}
+        # Last parsed result per pack and CID2 code
+        self._sections: dict[str, dict[str, dict[str, Any]]] = {address: {} for address in self.addresses}
         super().__init__(
             hass, _LOGGER, name="Seplos V2", update_interval=timedelta(seconds=entry.data.get("poll_interval", 30))
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @property
+    def connection_health(self) -> dict[str, Any]:
+        """Return the health state of the connector session."""
+        return self._session.health
+
+    async def async_request_command_refresh(self, *codes: str) -> None:
+        """Re-read the given CID2 commands on the next (immediate) poll."""
+        for scheduler in self._schedulers.values():
+            scheduler.request(codes)
+        await self.async_request_refresh()
+
+    async def _async_update_data(self) -> dict[str, PackSnapshot]:
         """Fetch data via Seplos V2 protocol."""
         try:
-            self._client = await create_connector_client(
-                self.hass, self.config_entry.data, self._integration_type
-            )
-            
+            client = await self._session.async_get_client()
+
             # Use Seplos V2 protocol to read data
-            if hasattr(self._client, 'read_seplos_data'):
-                data = await self._client.read_seplos_data(self.config_entry.data)
-                if not data:
-                    _LOGGER.warning("No data received from Seplos V2 device")
-                    return {}
-                    
-                processed = parse_seplos_response(data, self.config_entry.data)
-                await self._client.close()
-                return processed
-            else:
+            if not hasattr(client, 'read_seplos_data'):
                 # Fallback for other connector types (if any)
                 raise UpdateFailed("Seplos V2 protocol not supported by connector")
-                
+
+            packs = {}
+            for address in self.addresses:
+                pack = await self._async_update_pack(client, address)
+                if pack:
+                    packs[address] = pack
+
+            if not packs:
+                _LOGGER.warning("No data received from Seplos V2 device")
+                await self._session.async_record_failure(UpdateFailed("No data received"))
+                return {}
+
+            self._session.record_success()
+            return packs
+
         except Exception as err:
-            if self._client:
-                await self._client.close()
+            await self._session.async_record_failure(err)
             _LOGGER.error("Seplos V2 update failed: %s", err)
-            raise UpdateFailed(f"Seplos V2 update failed: {err}")
\ No newline at end of file
+            raise UpdateFailed(f"Seplos V2 update failed: {err}")
+
+    async def _async_update_pack(self, client, address: str) -> PackSnapshot | None:
+        """Poll the commands due for one pack and return its snapshot."""
+        scheduler = self._schedulers[address]
+        sections = self._sections[address]
+        codes = scheduler.due()
+
+        _LOGGER.debug("Seplos V2 pack %s commands due: %s", address, codes)
+        data = await client.read_seplos_data(self.config_entry.data, codes, address)
+        if len(data) < len(codes):
+            # Responses are matched to commands by order, so a short
+            # reply cannot be attributed reliably.
+            _LOGGER.warning("Pack %s: expected %d responses, got %d", address, len(codes), len(data))
+            return None
+        if not any(data):
+            _LOGGER.warning("Pack %s did not respond", address)
+            return None
+
+        fresh = set()
+        for code, frame in zip(codes, data):
+            if not frame:
+                # Timed out; still due, so it is retried next poll
+                continue
+            section = parse_seplos_section(code, frame, self.config_entry.data)
+            if section:
+                sections[code] = section
+                scheduler.mark_polled(code)
+                fresh.add(code)
+
+        if CID2_TELEMETRY in codes and CID2_TELEMETRY not in fresh:
+            # Only the slow-interval sections may be served from cache
+            _LOGGER.warning("Pack %s: no valid telemetry (42H) this poll", address)
+            return None
+
+        return merge_seplos_sections(sections, self.config_entry.data)
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and close the connector session."""
+        await super().async_shutdown()
+        await self._session.async_close()
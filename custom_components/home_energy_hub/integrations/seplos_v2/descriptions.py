@@ -0,0 +1,198 @@
+"""Entity descriptions for Seplos V2.
+
+Every key the V2 parser produces is described once, at import: unique-id
+suffix, display name, unit, device and state class, and whether it
+belongs to the pack's Settings device. Entities look their description
+up instead of deriving it from the key. Keys not known in advance (more
+cells than the table covers) are described on first use and cached.
+"""
+
+from functools import cache
+import re
+from typing import Dict, NamedTuple, Optional
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from ...const import SENSOR_UNITS
+from .modbus_processor import _INTERPRETED_ALARM_KEYS
+from .settings_fields import SETTINGS_FIELDS, SETTINGS_FIELDS_BY_KEY
+
+SETTINGS_SUFFIX = "_settings"
+
+# Cells and temperatures described up front; higher counts are cached
+_TABLE_CELLS = 16
+_TABLE_TEMPERATURES = 8
+
+
+class V2SensorDescription(NamedTuple):
+    """How one V2 key is exposed as an entity."""
+
+    key: str
+    unique_id_suffix: str  # appended to the pack's entity id prefix
+    name: str  # appended to "<name prefix> <address>"
+    unit: Optional[str] = None
+    device_class: Optional[SensorDeviceClass] = None
+    state_class: Optional[SensorStateClass] = None
+    settings: bool = False  # on the Settings device rather than the BMS
+
+
+_CAMEL_PATTERNS = (
+    # Insert underscores before capital letters
+    (re.compile('(.)([A-Z][a-z]+)'), r'\1_\2'),
+    (re.compile('([a-z0-9])([A-Z])'), r'\1_\2'),
+    # Insert underscores between letters and numbers
+    (re.compile('([a-zA-Z])([0-9])'), r'\1_\2'),
+    (re.compile('([0-9])([a-zA-Z])'), r'\1_\2'),
+)
+
+
+def camel_to_snake(name: str) -> str:
+    """Convert camelCase to snake_case, splitting numbers off words."""
+    for pattern, replacement in _CAMEL_PATTERNS:
+        name = pattern.sub(replacement, name)
+    return name.lower()
+
+
+_NAMES = {
+    "cellsCount": "Number of Cells",
+    "resCap": "Residual Capacity",
+    "capacity": "Capacity",
+    "soc": "State of Charge",
+    "ratedCapacity": "Rated Capacity",
+    "cycles": "Cycles",
+    "soh": "State of Health",
+    "portVoltage": "Port Voltage",
+    "current": "Current",
+    "voltage": "Voltage",
+    "battery_watts": "Battery Watts",
+    "full_charge_watts": "Full Charge Watts",
+    "full_charge_amps": "Full Charge Amps",
+    "remaining_watts": "Remaining Watts",
+    "capacity_watts": "Capacity Watts",
+    "highest_cell_voltage": "Highest Cell Voltage",
+    "highest_cell_number": "Cell Number of Highest Voltage",
+    "lowest_cell_voltage": "Lowest Cell Voltage",
+    "lowest_cell_number": "Cell Number of Lowest Voltage",
+    "cell_difference": "Cell Voltage Difference",
+    "power_temperature": "Power Temperature",
+    "environment_temperature": "Environment Temperature",
+    "device_name": "Device Name",
+    "software_version": "Software Version",
+    "manufacturer_name": "Manufacturer Name",
+    "customNumber": "Custom Number",
+}
+
+# Alarm and state sensors hold text, so they get no device or state class
+_TEXT_KEYS = frozenset((
+    "currentAlarm", "voltageAlarm", "alarmEvent0", "alarmEvent1", "alarmEvent2",
+    "alarmEvent3", "alarmEvent4", "alarmEvent5", "alarmEvent6", "alarmEvent7",
+    "onOffState", "equilibriumState0", "equilibriumState1", "systemState",
+    "disconnectionState0", "disconnectionState1",
+))
+
+_NAME_WORDS = ("alarm", "state", "active", "equilibrium", "disconnection")
+
+
+def _sensor_name(key: str) -> str:
+    if key.startswith("cell_") and key.endswith("_voltage"):
+        return f"Cell Voltage {key.split('_')[1]}"
+    if key.startswith("cell_temperature_"):
+        return f"Cell Temperature {key.split('_')[2]}"
+    if any(word in key.lower() for word in _NAME_WORDS):
+        return camel_to_snake(key).replace('_', ' ').title()
+    return _NAMES.get(key, key.replace("_", " ").title())
+
+
+def _device_class(key: str) -> Optional[SensorDeviceClass]:
+    if "temperature" in key:
+        return SensorDeviceClass.TEMPERATURE
+    if "voltage" in key:
+        return SensorDeviceClass.VOLTAGE
+    if "current" in key:
+        return SensorDeviceClass.CURRENT
+    if "power" in key or "watts" in key:
+        return SensorDeviceClass.POWER
+    # soc_ah is a capacity in Ah, which energy_storage does not accept
+    if "soc" in key and "ah" not in key.lower():
+        return SensorDeviceClass.BATTERY
+    if "capacity" in key and "ah" in key.lower():
+        return SensorDeviceClass.ENERGY_STORAGE
+    return None
+
+
+def _state_class(key: str) -> Optional[SensorStateClass]:
+    if any(word in key for word in ("voltage", "current", "power", "temperature", "soc", "capacity")):
+        return SensorStateClass.MEASUREMENT
+    if "cycles" in key:
+        return SensorStateClass.TOTAL_INCREASING
+    return None
+
+
+def _build_sensor(key: str) -> V2SensorDescription:
+    settings = key.endswith(SETTINGS_SUFFIX)
+    base = key[:-len(SETTINGS_SUFFIX)] if settings else key
+    name = _sensor_name(base)
+    field = SETTINGS_FIELDS_BY_KEY.get(base) if settings else None
+    if field is not None:
+        return V2SensorDescription(
+            key, camel_to_snake(base), name, field.unit,
+            SensorDeviceClass(field.device_class) if field.device_class else None,
+            SensorStateClass(field.state_class) if field.state_class else None,
+            settings=True,
+        )
+    if key in _TEXT_KEYS:
+        return V2SensorDescription(key, camel_to_snake(key), name, settings=settings)
+    return V2SensorDescription(
+        key, camel_to_snake(base), name, SENSOR_UNITS.get(key), _device_class(key), _state_class(key), settings,
+    )
+
+
+def _build_binary_sensor(key: str) -> V2SensorDescription:
+    # balancerActiveCell12 -> Balancer Active Cell 12
+    return V2SensorDescription(key, camel_to_snake(key), camel_to_snake(key).replace('_', ' ').title())
+
+
+# Keys of the 42H, 44H, 51H and 47H parse results, in that order
+_SENSOR_KEYS = (
+    "cellsCount", "current", "voltage", "resCap", "capacity", "soc", "ratedCapacity", "cycles",
+    "soh", "portVoltage", "customNumber", "highest_cell_voltage", "highest_cell_number",
+    "lowest_cell_voltage", "lowest_cell_number", "cell_difference", "battery_watts",
+    "full_charge_watts", "full_charge_amps", "remaining_watts", "capacity_watts",
+    *(f"cell_{i}_voltage" for i in range(1, _TABLE_CELLS + 1)),
+    *(f"cell_temperature_{i}" for i in range(1, _TABLE_TEMPERATURES + 1)),
+    "power_temperature", "environment_temperature",
+    *_INTERPRETED_ALARM_KEYS, "equilibriumState0_raw", "equilibriumState1_raw",
+    "device_name", "software_version", "manufacturer_name",
+    *(field.key + SETTINGS_SUFFIX for field in SETTINGS_FIELDS),
+)
+
+# Keys exposed as binary sensors rather than sensors
+BINARY_SENSOR_PREFIX = "balancerActiveCell"
+
+SENSOR_DESCRIPTIONS: Dict[str, V2SensorDescription] = {key: _build_sensor(key) for key in _SENSOR_KEYS}
+BINARY_SENSOR_DESCRIPTIONS: Dict[str, V2SensorDescription] = {
+    key: _build_binary_sensor(key)
+    for key in (f"{BINARY_SENSOR_PREFIX}{i}" for i in range(1, _TABLE_CELLS + 1))
+}
+
+
+@cache
+def _describe_other_sensor(key: str) -> V2SensorDescription:
+    return _build_sensor(key)
+
+
+@cache
+def _describe_other_binary_sensor(key: str) -> V2SensorDescription:
+    return _build_binary_sensor(key)
+
+
+def describe_sensor(key: str) -> V2SensorDescription:
+    """Return the description of sensor *key*."""
+    description = SENSOR_DESCRIPTIONS.get(key)
+    return description if description is not None else _describe_other_sensor(key)
+
+
+def describe_binary_sensor(key: str) -> V2SensorDescription:
+    """Return the description of binary sensor *key*."""
+    description = BINARY_SENSOR_DESCRIPTIONS.get(key)
+    return description if description is not None else _describe_other_binary_sensor(key)
@@ -0,0 +1,195 @@
+"""Field layout of the Seplos V2 47H (system parameters) response.
+
+The table below is the single description of the 47H block: the parser
+compiles it into one struct.Struct, and the sensor platform reads units
+and device classes from it. Offsets are byte positions in DATAI.
+"""
+
+import struct
+from typing import Dict, NamedTuple, Optional, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class SettingField(NamedTuple):
+    """One 47H parameter: value = (raw - bias) / scale."""
+
+    key: str
+    offset: int
+    fmt: str = "H"  # struct code: "H", "h" or "B"
+    scale: float = 1
+    bias: int = 0
+    unit: Optional[str] = None
+    device_class: Optional[str] = None
+
+    @property
+    def state_class(self) -> Optional[str]:
+        """Return the sensor state class for this field."""
+        return "measurement" if self.unit is not None else None
+
+
+def _cell_volts(key: str, offset: int) -> SettingField:
+    return SettingField(key, offset, scale=1000.0, unit="V", device_class="voltage")
+
+
+def _pack_volts(key: str, offset: int) -> SettingField:
+    return SettingField(key, offset, scale=100.0, unit="V", device_class="voltage")
+
+
+def _kelvin(key: str, offset: int) -> SettingField:
+    # Temperatures are sent in 0.1 K
+    return SettingField(key, offset, scale=10.0, bias=2731, unit="°C", device_class="temperature")
+
+
+def _amps(key: str, offset: int, fmt: str = "H", scale: float = 100.0) -> SettingField:
+    return SettingField(key, offset, fmt, scale, unit="A", device_class="current")
+
+
+def _byte(key: str, offset: int, unit: Optional[str] = None, scale: float = 1) -> SettingField:
+    return SettingField(key, offset, "B", scale, unit=unit)
+
+
+SETTINGS_FIELDS = (
+    # Cell voltage limits
+    _cell_volts("monomer_high_voltage_alarm", 0),
+    _cell_volts("monomer_high_pressure_recovery", 2),
+    _cell_volts("monomer_low_pressure_alarm", 4),
+    _cell_volts("monomer_low_pressure_recovery", 6),
+    _cell_volts("monomer_overvoltage_protection", 8),
+    _cell_volts("monomer_overvoltage_recovery", 10),
+    _cell_volts("monomer_undervoltage_protection", 12),
+    _cell_volts("monomer_undervoltage_recovery", 14),
+    _cell_volts("equalization_opening_voltage", 16),
+    _cell_volts("battery_low_voltage_forbidden_charging", 18),
+    # Pack voltage limits
+    _pack_volts("total_pressure_high_pressure_alarm", 20),
+    _pack_volts("total_pressure_high_pressure_recovery", 22),
+    _pack_volts("total_pressure_low_pressure_alarm", 24),
+    _pack_volts("total_pressure_low_pressure_recovery", 26),
+    _pack_volts("total_voltage_overvoltage_protection", 28),
+    _pack_volts("total_pressure_overpressure_recovery", 30),
+    _pack_volts("total_voltage_undervoltage_protection", 32),
+    _pack_volts("total_pressure_undervoltage_recovery", 34),
+    _pack_volts("charging_overvoltage_protection", 36),
+    _pack_volts("charging_overvoltage_recovery", 38),
+    # Charge temperature limits
+    _kelvin("charging_high_temperature_warning", 40),
+    _kelvin("charging_high_temperature_recovery", 42),
+    _kelvin("charging_low_temperature_warning", 44),
+    _kelvin("charging_low_temperature_recovery", 46),
+    _kelvin("charging_over_temperature_protection", 48),
+    _kelvin("charging_over_temperature_recovery", 50),
+    _kelvin("charging_under_temperature_protection", 52),
+    _kelvin("charging_under_temperature_recovery", 54),
+    # Discharge temperature limits
+    _kelvin("discharge_high_temperature_warning", 56),
+    _kelvin("discharge_high_temperature_recovery", 58),
+    _kelvin("discharge_low_temperature_warning", 60),
+    _kelvin("discharge_low_temperature_recovery", 62),
+    _kelvin("discharge_over_temperature_protection", 64),
+    _kelvin("discharge_over_temperature_recovery", 66),
+    _kelvin("discharge_under_temperature_protection", 68),
+    _kelvin("discharge_under_temperature_recovery", 70),
+    # Cell heating
+    _kelvin("cell_low_temperature_heating", 72),
+    _kelvin("cell_heating_recovery", 74),
+    # Ambient / environment temperature limits
+    _kelvin("ambient_high_temperature_alarm", 76),
+    _kelvin("ambient_high_temperature_recovery", 78),
+    _kelvin("ambient_low_temperature_alarm", 80),
+    _kelvin("ambient_low_temperature_recovery", 82),
+    _kelvin("environment_over_temperature_protection", 84),
+    _kelvin("environment_over_temperature_recovery", 86),
+    _kelvin("environment_under_temperature_protection", 88),
+    _kelvin("environment_under_temperature_recovery", 90),
+    # Power board temperature limits
+    _kelvin("power_high_temperature_alarm", 92),
+    _kelvin("power_high_temperature_recovery", 94),
+    _kelvin("power_over_temperature_protection", 96),
+    _kelvin("power_over_temperature_recovery", 98),
+    # Current limits (discharge values are signed)
+    _amps("charging_overcurrent_warning", 100),
+    _amps("charging_overcurrent_recovery", 102),
+    _amps("discharge_overcurrent_warning", 104, "h"),
+    _amps("discharge_overcurrent_recovery", 106, "h"),
+    _amps("charge_overcurrent_protection", 108),
+    _amps("discharge_overcurrent_protection", 110, "h"),
+    _amps("transient_overcurrent_protection", 112, "h", 10000.0),
+    # Timing and capacity
+    SettingField("output_soft_start_delay", 114),
+    SettingField("battery_rated_capacity", 116, scale=100.0, unit="Ah"),
+    SettingField("soc_ah", 118, scale=100.0, unit="Ah"),
+    # Cell invalidation and equalization
+    _byte("cell_invalidation_recovery", 120),
+    _byte("cell_invalidation_differential_pressure", 121),
+    _byte("equalization_opening_pressure_difference", 122),
+    _byte("equalization_closing_pressure_difference", 123),
+    _byte("static_equilibrium_time", 124),
+    _byte("battery_number_in_series", 125),
+    # Overcurrent delays
+    _byte("charge_overcurrent_delay", 126, "s"),
+    _byte("discharge_overcurrent_delay", 127, "s"),
+    _byte("transient_overcurrent_delay", 128, "ms"),
+    _byte("overcurrent_delay_recovery", 129, "s"),
+    _byte("overcurrent_recovery_times", 130, "times"),
+    # Charge activation
+    _byte("charge_current_limit_delay", 131, "min"),
+    _byte("charge_activation_delay", 132),
+    _byte("charging_activation_interval", 133),
+    _byte("charge_activation_times", 134),
+    # Recording and standby
+    _byte("work_record_interval", 135),
+    _byte("standby_recording_interval", 136),
+    _byte("standby_shutdown_delay", 137),
+    # Capacity alarms
+    _byte("remaining_capacity_alarm", 138, "%"),
+    _byte("remaining_capacity_protection", 139, "%"),
+    _byte("interval_charge_capacity", 140, "%"),
+    _byte("cycle_cumulative_capacity", 141, "%"),
+    # Connection fault and impedance compensation
+    _byte("connection_fault_impedance", 142, scale=10.0),
+    _byte("compensation_point_1_position", 143),
+    _byte("compensation_point_1_impedance", 144, scale=10.0),
+    _byte("compensation_point_2_position", 145),
+    _byte("compensation_point_2_impedance", 146, scale=10.0),
+)
+
+SETTINGS_FIELDS_BY_KEY: Dict[str, SettingField] = {field.key: field for field in SETTINGS_FIELDS}
+
+
+def _compile(fields) -> struct.Struct:
+    """Build one big-endian Struct covering every field, padding gaps."""
+    fmt = [">"]
+    position = 0
+    for field in sorted(fields, key=lambda f: f.offset):
+        if field.offset < position:
+            raise ValueError(f"47H field {field.key} overlaps the previous field")
+        if field.offset > position:
+            fmt.append(f"{field.offset - position}x")
+        fmt.append(field.fmt)
+        position = field.offset + struct.calcsize(">" + field.fmt)
+    return struct.Struct("".join(fmt))
+
+
+SETTINGS_STRUCT = _compile(SETTINGS_FIELDS)
+
+# (key, bias, scale) in struct order; scale None keeps the raw integer
+_CONVERSIONS = tuple(
+    (field.key, field.bias, field.scale if field.scale != 1 or field.bias else None)
+    for field in sorted(SETTINGS_FIELDS, key=lambda f: f.offset)
+)
+
+
+def decode_settings(datai: Buffer) -> Dict[str, Union[int, float]]:
+    """Decode a 47H DATAI block into {key: value}.
+
+    Blocks shorter than the table are zero-filled, so older firmware that
+    sends fewer parameters still decodes the leading ones.
+    """
+    if len(datai) < SETTINGS_STRUCT.size:
+        datai = bytes(datai).ljust(SETTINGS_STRUCT.size, b"\0")
+
+    settings = {}
+    for (key, bias, scale), raw in zip(_CONVERSIONS, SETTINGS_STRUCT.unpack_from(datai)):
+        settings[key] = raw if scale is None else (raw - bias) / scale
+    return settings
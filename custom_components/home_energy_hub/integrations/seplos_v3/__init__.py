@@ -2,46 +2,52 @@
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 
 from .coordinator import SeplosV3Coordinator
-from ...const import DOMAIN
+from .sensor import build_sensors
+from .data_parser import CELL_VOLTAGES, TEMPERATURES
+from ...entry_cache import pack_schema
+from ...snapshot import PackSnapshot, dump_packs, load_packs
+from ...utils import pack_id_suffix
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Seplos V3 from a config entry."""
-    import logging
-    from homeassistant.helpers import device_registry as dr
-    
-    _LOGGER = logging.getLogger(__name__)
-    _LOGGER.info("Setting up Seplos V3 integration for entry: %s", entry.entry_id)
-    
-    coordinator = SeplosV3Coordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
-    
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-    
+# The data maps pack addresses to snapshots, like every pack integration
+entity_schema = pack_schema
+dump_data = dump_packs
+
+PLATFORMS = ("sensor",)
+
+# Entities only need their pack address and key, so they can be
+# created from the stored schema before the first read
+FAST_STARTUP = True
+
+ENTITIES = {
+    "sensor": build_sensors,
+}
+
+
+def create_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> SeplosV3Coordinator:
+    """Return the coordinator polling the entry's packs."""
+    return SeplosV3Coordinator(hass, entry)
+
+
+def load_data(stored: dict) -> dict[str, PackSnapshot]:
+    """Rebuild coordinator data saved with dump_data."""
+    return load_packs(stored, CELL_VOLTAGES, TEMPERATURES)
+
+
+def prepare_registries(hass: HomeAssistant, entry: ConfigEntry, coordinator: SeplosV3Coordinator) -> None:
+    """Register the BMS device of every pack."""
     name_prefix = entry.data.get("name_prefix", "Seplos BMS V3")
     
     device_registry = dr.async_get(hass)
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={("home_energy_hub", f"seplos_v3_{entry.entry_id}")},
-        manufacturer="Seplos",
-        name=f"{name_prefix}",
-        model="V3 BMS",
-        sw_version="Unknown",
-    )
-    
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
-    
-    _LOGGER.info("Seplos V3 integration setup complete")
-    return True
-
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    if await hass.config_entries.async_unload_platforms(entry, ["sensor"]):
-        if entry.entry_id in hass.data.get(DOMAIN, {}):
-            hass.data[DOMAIN].pop(entry.entry_id)
-        return True
-    return False
+    for address in coordinator.addresses:
+        pack_suffix = pack_id_suffix(entry.data, address, "0x01")
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={("home_energy_hub", f"seplos_v3_{entry.entry_id}{pack_suffix}")},
+            manufacturer="Seplos",
+            name=f"{name_prefix} {address}" if pack_suffix else f"{name_prefix}",
+            model="V3 BMS",
+            sw_version="Unknown",
+        )
@@ -8,65 +8,153 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from ...const import CONF_CONNECTOR_TYPE, CONF_HOST, CONF_PORT, CONF_SERIAL_PORT, CONF_BAUD_RATE
-from .data_parser import build_commands_for_address, extract_data_from_message
+from ...connectors.bus import BusArbiter, async_release_bus
+from ...const import (
+    CONF_CONNECTOR_TYPE, CONF_HOST, CONF_PORT, CONF_SERIAL_PORT, CONF_BAUD_RATE,
+    CONF_ALARM_POLL_INTERVAL, DEFAULT_ALARM_POLL_INTERVAL,
+)
+from .data_parser import decode_block, merge_blocks
+from .register_map import V3_BLOCK_KEYS, V3_BLOCKS, ReadRequest, plan_reads
+from ...change_filter import entry_filter
+from ...scheduler import CommandScheduler
+from ...snapshot import PackSnapshot
+from ...utils import get_pack_addresses
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds before re-reading an optional block the pack did not answer
+_UNANSWERED_RETRY = 600
 
-class SeplosV3Coordinator(DataUpdateCoordinator[dict[str, Any]]):
+
+class SeplosV3Coordinator(DataUpdateCoordinator[dict[str, PackSnapshot]]):
     """Coordinator for Seplos V3 Modbus RTU.
 
     Uses the dedicated V3 Modbus RTU transport (seplos_v3_serial) instead
-    of the V2 ASCII-based connector clients.
+    of the V2 ASCII-based connector clients. Each register block in the
+    map has its own refresh interval; the blocks due for every pack on
+    the bus are planned into the fewest reads and sent in one exchange.
+    The last decoded values of each block are merged into a PackSnapshot
+    per pack address. The coordinator joins the shared bus arbiter on its
+    first poll and leaves it on shutdown, so the port stays open between
+    polls and is shared with any other entry on the same adapter.
     """
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.config_entry = entry
         self._connector_type = entry.data.get(CONF_CONNECTOR_TYPE, "usb_serial")
+        self.addresses = get_pack_addresses(entry.data, "0x01")
+        self.change_filter = entry_filter(entry.data)
+        self._bus: BusArbiter | None = None
+        intervals = {
+            "pia": 0,
+            "pib": 0,
+            "pic": entry.data.get(CONF_ALARM_POLL_INTERVAL, DEFAULT_ALARM_POLL_INTERVAL),
+        }
+        self._schedulers = {address: CommandScheduler(intervals, V3_BLOCK_KEYS) for address in self.addresses}
+        # Last decoded values per pack and register block
+        self._sections: dict[str, dict[str, dict[str, Any]]] = {address: {} for address in self.addresses}
         super().__init__(
             hass, _LOGGER, name="Seplos V3",
             update_interval=timedelta(seconds=entry.data.get("poll_interval", 30))
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> dict[str, PackSnapshot]:
         """Fetch data via Seplos V3 Modbus RTU protocol."""
         try:
-            battery_addr = int(self.config_entry.data.get("battery_address", "0x01"), 0)
-            commands = build_commands_for_address(battery_addr)
-            _LOGGER.debug("V3 commands: %s", commands)
-
-            if self._connector_type == "telnet_serial":
-                data = await self._send_telnet(commands)
-            elif self._connector_type == "usb_serial":
-                data = await self._send_serial(commands)
-            else:
-                raise UpdateFailed(f"Unsupported connector: {self._connector_type}")
-
-            if not data or len(data) < 2:
+            reads: list[tuple[str, ReadRequest]] = []
+            # Non-optional blocks due per pack; a pack is published only if all decode
+            required: dict[str, set[str]] = {}
+            for address in self.addresses:
+                due = self._schedulers[address].due()
+                blocks = [block for block in V3_BLOCKS if block.key in due]
+                required[address] = {block.key for block in blocks if not block.optional}
+                for request in plan_reads(blocks):
+                    reads.append((address, request))
+            commands = [request.command(int(address, 0)) for address, request in reads]
+            optional = [all(block.optional for block in request.blocks) for _, request in reads]
+            _LOGGER.debug("V3 commands: %s", [command.hex() for command in commands])
+
+            data = await self._send(commands, optional)
+
+            decoded: dict[str, set[str]] = {address: set() for address in self.addresses}
+            for (address, request), frame in zip(reads, data):
+                decoded[address].update(self._store_response(address, request, frame))
+
+            packs = {}
+            for address in self.addresses:
+                # Cached values stand in only for blocks not due this poll
+                if not decoded[address] or not required[address] <= decoded[address]:
+                    _LOGGER.warning("Insufficient V3 data received for pack %s", address)
+                    continue
+                packs[address] = merge_blocks(self._sections[address])
+                _LOGGER.debug("V3 pack %s data keys: %s", address, list(packs[address]))
+
+            if not packs:
                 _LOGGER.warning("Insufficient V3 data received")
                 return {}
 
-            processed = extract_data_from_message(data)
-            _LOGGER.debug("V3 data keys: %s", list(processed.keys()))
-            return processed
+            return packs
 
         except Exception as err:
             _LOGGER.error("Seplos V3 update failed: %s", err)
             raise UpdateFailed(f"Seplos V3 update failed: {err}")
 
-    async def _send_serial(self, commands: list[str]) -> list[str]:
-        """Send commands via USB-RS485 serial."""
-        from ...connectors.seplos_v3_serial import send_serial_commands_async
-
-        port = self.config_entry.data.get(CONF_SERIAL_PORT, "/dev/ttyUSB0")
-        baudrate = self.config_entry.data.get(CONF_BAUD_RATE, 19200)
-        return await send_serial_commands_async(commands, port=port, baudrate=baudrate)
-
-    async def _send_telnet(self, commands: list[str]) -> list[str]:
-        """Send commands via Telnet serial bridge."""
-        from ...connectors.seplos_v3_serial import send_telnet_commands_async
-
-        host = self.config_entry.data[CONF_HOST]
-        port = self.config_entry.data.get(CONF_PORT, 23)
-        return await send_telnet_commands_async(commands, host=host, port=port)
+    def _store_response(self, address: str, request: ReadRequest, frame: bytes) -> set[str]:
+        """Decode the blocks in one response; return the keys that decoded."""
+        scheduler = self._schedulers[address]
+        decoded: set[str] = set()
+        if not frame:
+            for block in request.blocks:
+                if block.optional:
+                    # The pack may not implement it: try again later
+                    scheduler.defer(block.key, _UNANSWERED_RETRY)
+            return decoded
+
+        # The transport has validated the frame; slice out the data
+        for key, block_data in request.split(memoryview(frame)[3:-2]).items():
+            values = decode_block(key, block_data)
+            if values:
+                self._sections[address][key] = values
+                scheduler.mark_polled(key)
+                decoded.add(key)
+        return decoded
+
+    @property
+    def connection_health(self) -> dict[str, Any]:
+        """Return the statistics of the shared bus and its calibration."""
+        from ...connectors.seplos_v3_serial import link_calibration
+
+        if self._bus is None:
+            return {"bus": {}, "link": None}
+        calibration = link_calibration(self._bus)
+        return {"bus": self._bus.stats, "link": calibration._asdict() if calibration else None}
+
+    def _acquire_bus(self) -> BusArbiter:
+        """Join the serial port or TCP bridge configured for this entry."""
+        from ...connectors.bus import serial_bus, tcp_bus
+
+        data = self.config_entry.data
+        if self._connector_type == "telnet_serial":
+            return tcp_bus(data[CONF_HOST], data.get(CONF_PORT, 23))
+        if self._connector_type == "usb_serial":
+            return serial_bus(data.get(CONF_SERIAL_PORT, "/dev/ttyUSB0"), data.get(CONF_BAUD_RATE, 19200))
+        raise UpdateFailed(f"Unsupported connector: {self._connector_type}")
+
+    async def _send(self, commands: list[bytes], optional: list[bool]) -> list[bytes]:
+        """Send commands over the shared bus; *optional* flags optional reads."""
+        from ...connectors.seplos_v3_serial import send_modbus_commands
+
+        if self._bus is None:
+            self._bus = self._acquire_bus()
+        if self._connector_type == "telnet_serial":
+            return await send_modbus_commands(self._bus, commands, timeout=3)
+        # A shared port runs at its first user's speed
+        baudrate = self._bus.baudrate or self.config_entry.data.get(CONF_BAUD_RATE, 19200)
+        return await send_modbus_commands(self._bus, commands, timeout=2, baudrate=baudrate, optional=optional)
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and leave the shared bus."""
+        await super().async_shutdown()
+        bus, self._bus = self._bus, None
+        if bus is not None:
+            await async_release_bus(bus)
@@ -1,275 +1,176 @@
 """Seplos V3 Modbus RTU data parser — ported from bms_connector.
 
 Credits: Christian F5UII (@f5uii) for the Modbus RTU implementation.
+
+Each register block is described by a field table, compiled once into a
+struct.Struct. Decoding a block is a single unpack_from() on the response
+bytes (or a memoryview slice of them) with the values written straight
+into the result dict. Cell voltages and temperatures are kept as raw
+words in array('H') and scaled by the PackSnapshot when read.
 """
 
 import struct
 import logging
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from ...connectors.checksum import frame_crc_ok, modbus_crc
+from ...snapshot import PackSnapshot, Series, read_words
 
 _LOGGER = logging.getLogger(__name__)
 
+Buffer = Union[bytes, bytearray, memoryview]
+
 
-def modbus_crc(data: bytes) -> bytes:
-    """Calculate the Modbus RTU CRC (little-endian, 2 bytes)."""
-    crc = 0xFFFF
-    for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x0001:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return struct.pack('<H', crc)
-
-
-def verify_crc(frame_hex: str) -> bool:
-    """Verify CRC of a received Modbus frame."""
-    try:
-        raw = bytes.fromhex(frame_hex)
-        if len(raw) < 4:
-            return False
-        payload = raw[:-2]
-        received_crc = raw[-2:]
-        expected_crc = modbus_crc(payload)
-        return received_crc == expected_crc
-    except Exception:
-        return False
-
-
-def build_read_command(addr: int, register: int, count: int) -> str:
-    """Build a Modbus RTU 0x04 (Read Input Registers) command as hex string."""
-    payload = bytes([addr, 0x04]) + struct.pack('>HH', register, count)
-    crc = modbus_crc(payload)
-    return (payload + crc).hex()
-
-
-def build_commands_for_address(battery_addr: int) -> list:
-    """Return PIA + PIB commands for a given battery address.
-
-    PIA: register 0x1000, 18 registers (0x12) — pack global data
-    PIB: register 0x1100, 26 registers (0x1A) — cell voltages + temperatures
+def build_read_command(addr: int, register: int, count: int, function: int = 0x04) -> bytes:
+    """Build a Modbus RTU read command.
+
+    *function* defaults to 0x04 (Read Input Registers); 0x01 reads coils.
     """
-    cmd_pia = build_read_command(battery_addr, 0x1000, 0x12)
-    cmd_pib = build_read_command(battery_addr, 0x1100, 0x1A)
-    return [cmd_pia, cmd_pib]
-
-
-def convert_bytes_to_data(data_type: str, byte1: int, byte2: int):
-    """Convert two bytes to typed value (UINT16 or INT16)."""
-    if data_type == "UINT16":
-        return (byte1 << 8) | byte2
-    elif data_type == "INT16":
-        value = (byte1 << 8) | byte2
-        if value & 0x8000:
-            value -= 0x10000
-        return value
-    return None
-
-
-class V3PIA:
-    """Pack Info A: pack-level battery data."""
-
-    def __init__(self):
-        self.pack_voltage = 0.0
-        self.current = 0.0
-        self.remaining_capacity = 0.0
-        self.total_capacity = 0.0
-        self.total_discharge_capacity = 0.0
-        self.soc = 0.0
-        self.soh = 0.0
-        self.cycle = 0
-        self.avg_cell_voltage = 0.0
-        self.avg_cell_temperature = 0.0
-        self.max_cell_voltage = 0.0
-        self.min_cell_voltage = 0.0
-        self.max_cell_temperature = 0.0
-        self.min_cell_temperature = 0.0
-        self.max_discharge_current = 0.0
-        self.max_charge_current = 0.0
-
-
-class V3PIB:
-    """Pack Info B: cell voltages and temperatures."""
-
-    def __init__(self):
-        self.cell1_voltage = 0.0
-        self.cell2_voltage = 0.0
-        self.cell3_voltage = 0.0
-        self.cell4_voltage = 0.0
-        self.cell5_voltage = 0.0
-        self.cell6_voltage = 0.0
-        self.cell7_voltage = 0.0
-        self.cell8_voltage = 0.0
-        self.cell9_voltage = 0.0
-        self.cell10_voltage = 0.0
-        self.cell11_voltage = 0.0
-        self.cell12_voltage = 0.0
-        self.cell13_voltage = 0.0
-        self.cell14_voltage = 0.0
-        self.cell15_voltage = 0.0
-        self.cell16_voltage = 0.0
-        self.cell_temperature_1 = 0.0
-        self.cell_temperature_2 = 0.0
-        self.cell_temperature_3 = 0.0
-        self.cell_temperature_4 = 0.0
-        self.environment_temperature = 0.0
-        self.power_temperature = 0.0
-
-
-def decode_pia_response(response: str):
-    """Decode a PIA Modbus response into a V3PIA object."""
-    if not response:
-        return None
-    if response.startswith("~"):
-        response = response[1:]
-
-    if not verify_crc(response):
-        _LOGGER.warning("PIA CRC invalid for %s", response)
-
-    try:
-        raw = bytes.fromhex(response)
-    except ValueError:
-        return None
-
-    if len(raw) < 41:
-        _LOGGER.warning("PIA frame too short (%d bytes)", len(raw))
-        return None
-
-    data = raw[3:-2]
-    pia = V3PIA()
-
-    try:
-        pia.pack_voltage             = convert_bytes_to_data("UINT16", data[0],  data[1])  * 0.01
-        pia.current                  = convert_bytes_to_data("INT16",  data[2],  data[3])  * 0.01
-        pia.remaining_capacity       = convert_bytes_to_data("UINT16", data[4],  data[5])  * 0.01
-        pia.total_capacity           = convert_bytes_to_data("UINT16", data[6],  data[7])  * 0.01
-        pia.total_discharge_capacity = convert_bytes_to_data("UINT16", data[8],  data[9])  * 10
-        pia.soc                      = convert_bytes_to_data("UINT16", data[10], data[11]) * 0.1
-        pia.soh                      = convert_bytes_to_data("UINT16", data[12], data[13]) * 0.1
-        pia.cycle                    = convert_bytes_to_data("UINT16", data[14], data[15])
-        pia.avg_cell_voltage         = convert_bytes_to_data("UINT16", data[16], data[17]) * 0.001
-        pia.avg_cell_temperature     = convert_bytes_to_data("UINT16", data[18], data[19]) * 0.1 - 273.15
-        pia.max_cell_voltage         = convert_bytes_to_data("UINT16", data[20], data[21]) * 0.001
-        pia.min_cell_voltage         = convert_bytes_to_data("UINT16", data[22], data[23]) * 0.001
-        pia.max_cell_temperature     = convert_bytes_to_data("UINT16", data[24], data[25]) * 0.1 - 273.15
-        pia.min_cell_temperature     = convert_bytes_to_data("UINT16", data[26], data[27]) * 0.1 - 273.15
-        if len(data) >= 32:
-            pia.max_discharge_current = convert_bytes_to_data("UINT16", data[30], data[31])
-        if len(data) >= 34:
-            pia.max_charge_current    = convert_bytes_to_data("UINT16", data[32], data[33])
-    except IndexError:
-        return None
-
-    return pia
-
-
-def decode_pib_response(response: str):
-    """Decode a PIB Modbus response into a V3PIB object."""
-    if not response:
-        return None
-    if response.startswith("~"):
-        response = response[1:]
-
-    if not verify_crc(response):
-        _LOGGER.warning("PIB CRC invalid for %s", response)
-
-    try:
-        raw = bytes.fromhex(response)
-    except ValueError:
-        return None
-
-    if len(raw) < 57:
-        _LOGGER.warning("PIB frame too short (%d bytes)", len(raw))
-        return None
-
-    data = raw[3:-2]
-    pib = V3PIB()
-
-    try:
-        pib.cell1_voltage  = convert_bytes_to_data("UINT16", data[0],  data[1])  * 0.001
-        pib.cell2_voltage  = convert_bytes_to_data("UINT16", data[2],  data[3])  * 0.001
-        pib.cell3_voltage  = convert_bytes_to_data("UINT16", data[4],  data[5])  * 0.001
-        pib.cell4_voltage  = convert_bytes_to_data("UINT16", data[6],  data[7])  * 0.001
-        pib.cell5_voltage  = convert_bytes_to_data("UINT16", data[8],  data[9])  * 0.001
-        pib.cell6_voltage  = convert_bytes_to_data("UINT16", data[10], data[11]) * 0.001
-        pib.cell7_voltage  = convert_bytes_to_data("UINT16", data[12], data[13]) * 0.001
-        pib.cell8_voltage  = convert_bytes_to_data("UINT16", data[14], data[15]) * 0.001
-        pib.cell9_voltage  = convert_bytes_to_data("UINT16", data[16], data[17]) * 0.001
-        pib.cell10_voltage = convert_bytes_to_data("UINT16", data[18], data[19]) * 0.001
-        pib.cell11_voltage = convert_bytes_to_data("UINT16", data[20], data[21]) * 0.001
-        pib.cell12_voltage = convert_bytes_to_data("UINT16", data[22], data[23]) * 0.001
-        pib.cell13_voltage = convert_bytes_to_data("UINT16", data[24], data[25]) * 0.001
-        pib.cell14_voltage = convert_bytes_to_data("UINT16", data[26], data[27]) * 0.001
-        pib.cell15_voltage = convert_bytes_to_data("UINT16", data[28], data[29]) * 0.001
-        pib.cell16_voltage = convert_bytes_to_data("UINT16", data[30], data[31]) * 0.001
-        pib.cell_temperature_1 = convert_bytes_to_data("UINT16", data[32], data[33]) * 0.1 - 273.15
-        pib.cell_temperature_2 = convert_bytes_to_data("UINT16", data[34], data[35]) * 0.1 - 273.15
-        pib.cell_temperature_3 = convert_bytes_to_data("UINT16", data[36], data[37]) * 0.1 - 273.15
-        pib.cell_temperature_4 = convert_bytes_to_data("UINT16", data[38], data[39]) * 0.1 - 273.15
-        if len(data) >= 50:
-            pib.environment_temperature = convert_bytes_to_data("UINT16", data[48], data[49]) * 0.1 - 273.15
-        if len(data) >= 52:
-            pib.power_temperature = convert_bytes_to_data("UINT16", data[50], data[51]) * 0.1 - 273.15
-    except IndexError:
-        return None
-
-    return pib
-
-
-def extract_data_from_message(msg, config_battery_address=None):
-    """Parse PIA and PIB responses into a flat dict for the coordinator.
-
-    Returns a dict like:
-    {
-        "pack_voltage": 51.2,
-        "current": -5.0,
-        "cell1_voltage": 3.201,
-        ...
-    }
+    payload = struct.pack('>BBHH', addr, function, register, count)
+    return payload + modbus_crc(payload)
+
+
+class RegisterField(NamedTuple):
+    """One register: value = raw * scale + offset, rounded to *digits*."""
+
+    key: Optional[str]  # None for a reserved register
+    fmt: str = "H"  # "H" or "h"
+    scale: float = 1
+    offset: float = 0
+    digits: Optional[int] = None  # None keeps the integer result
+
+
+_RESERVED = RegisterField(None)
+
+
+def _cell_volts(key: str) -> RegisterField:
+    return RegisterField(key, scale=0.001, digits=3)
+
+
+def _kelvin(key: str, digits: int) -> RegisterField:
+    # Temperatures are sent in 0.1 K
+    return RegisterField(key, scale=0.1, offset=-273.15, digits=digits)
+
+
+# PIA: 0x1000, 18 registers — pack global data
+PIA_FIELDS = (
+    RegisterField("pack_voltage", scale=0.01, digits=3),
+    RegisterField("current", "h", 0.01, digits=3),
+    RegisterField("remaining_capacity", scale=0.01, digits=3),
+    RegisterField("total_capacity", scale=0.01, digits=3),
+    RegisterField("total_discharge_capacity", scale=10),
+    RegisterField("soc", scale=0.1, digits=3),
+    RegisterField("soh", scale=0.1, digits=3),
+    RegisterField("cycle"),
+    _cell_volts("avg_cell_voltage"),
+    _kelvin("avg_cell_temperature", 3),
+    _cell_volts("max_cell_voltage"),
+    _cell_volts("min_cell_voltage"),
+    _kelvin("max_cell_temperature", 3),
+    _kelvin("min_cell_temperature", 3),
+    _RESERVED,
+    RegisterField("max_discharge_current"),
+    RegisterField("max_charge_current"),
+    # 0x1011 is not decoded
+)
+
+# PIB: 0x1100, 26 registers — 16 cell voltages, 4 cell temperatures,
+# then the fields below
+PIB_CELLS = 16
+PIB_TEMPERATURES = 4
+CELL_VOLTAGES = Series("cell{}_voltage", scale=0.001, digits=3)
+TEMPERATURES = Series("cell_temperature_{}", scale=0.1, offset=-273.15, digits=1)
+
+PIB_FIELDS = (
+    _RESERVED,
+    _RESERVED,
+    _RESERVED,
+    _RESERVED,
+    _kelvin("environment_temperature", 1),
+    _kelvin("power_temperature", 1),
+)
+
+
+class _Layout(NamedTuple):
+    struct: struct.Struct
+    # (key, scale, offset, digits) per non-reserved field, in struct order
+    conversions: Tuple[tuple, ...]
+    offset: int  # byte offset of the first field in the block
+
+
+def _compile(fields, offset: int = 0) -> _Layout:
+    """Build one big-endian Struct for a block, skipping reserved registers."""
+    fmt = "".join("2x" if field.key is None else field.fmt for field in fields)
+    conversions = tuple(
+        (field.key, field.scale, field.offset, field.digits) for field in fields if field.key is not None
+    )
+    return _Layout(struct.Struct(">" + fmt), conversions, offset)
+
+
+_LAYOUTS: Dict[str, _Layout] = {
+    "pia": _compile(PIA_FIELDS),
+    "pib": _compile(PIB_FIELDS, 2 * (PIB_CELLS + PIB_TEMPERATURES)),
+}
+
+# First coil of the PIC block
+PIC_START = 0x1200
+
+
+def decode_pic_data(data: Buffer) -> dict:
+    """Decode the PIC coil block into 16-bit status flag words.
+
+    Coils arrive packed LSB first; each word holds 16 consecutive coils
+    and is keyed by the address of its first coil, so bit n of
+    status_flags_1210 is coil 0x1210 + n.
     """
-    pia_data = None
-    pib_data = None
+    return {
+        f"status_flags_{PIC_START + 16 * i:04x}": int.from_bytes(data[2 * i:2 * i + 2], "little")
+        for i in range(len(data) // 2)
+    }
 
-    if not msg or len(msg) < 2:
-        _LOGGER.error("Need at least 2 response frames (PIA + PIB)")
-        return {}
 
-    for idx, response in enumerate(msg):
-        if isinstance(response, str) and response.startswith("~"):
-            response = response[1:]
+def decode_block(key: str, data: Buffer) -> dict:
+    """Decode the data of register block *key* into coordinator data."""
+    if key == "pic":
+        return decode_pic_data(data)
 
-        if idx == 0:
-            pia_data = decode_pia_response(response)
-        elif idx == 1:
-            pib_data = decode_pib_response(response)
+    layout = _LAYOUTS.get(key)
+    if layout is None or len(data) < layout.offset + layout.struct.size:
+        _LOGGER.warning("Could not decode V3 block %s (%d bytes)", key, len(data))
+        return {}
 
     result = {}
+    if key == "pib":
+        result["cell_voltages"] = read_words(data, 0, PIB_CELLS)
+        result["temperatures"] = read_words(data, 2 * PIB_CELLS, PIB_TEMPERATURES)
+    raw_values = layout.struct.unpack_from(data, layout.offset)
+    for (name, scale, offset, digits), raw in zip(layout.conversions, raw_values):
+        value = raw * scale + offset
+        result[name] = value if digits is None else round(value, digits)
+    return result
 
-    if pia_data:
-        for attr in ["pack_voltage", "current", "remaining_capacity", "total_capacity",
-                      "total_discharge_capacity", "soc", "soh", "cycle",
-                      "avg_cell_voltage", "avg_cell_temperature",
-                      "max_cell_voltage", "min_cell_voltage",
-                      "max_cell_temperature", "min_cell_temperature",
-                      "max_discharge_current", "max_charge_current"]:
-            val = getattr(pia_data, attr, None)
-            if val is not None:
-                result[attr] = round(val, 3) if isinstance(val, float) else val
-
-    if pib_data:
-        for i in range(1, 17):
-            val = getattr(pib_data, f"cell{i}_voltage", None)
-            if val is not None:
-                result[f"cell{i}_voltage"] = round(val, 3)
-
-        for i in range(1, 5):
-            val = getattr(pib_data, f"cell_temperature_{i}", None)
-            if val is not None:
-                result[f"cell_temperature_{i}"] = round(val, 1)
-
-        if pib_data.environment_temperature:
-            result["environment_temperature"] = round(pib_data.environment_temperature, 1)
-        if pib_data.power_temperature:
-            result["power_temperature"] = round(pib_data.power_temperature, 1)
 
-    return result
+def decode_response(key: str, frame: Buffer) -> dict:
+    """Validate a complete read response for block *key* and decode it.
+
+    The transport already checks frames as they arrive; this is for
+    frames from elsewhere (captures, fixtures).
+    """
+    if len(frame) < 5 or frame[2] != len(frame) - 5 or not frame_crc_ok(frame):
+        _LOGGER.warning("Invalid V3 %s response (%d bytes)", key, len(frame))
+        return {}
+    return decode_block(key, memoryview(frame)[3:-2])
+
+
+def merge_blocks(sections: Dict[str, dict]) -> PackSnapshot:
+    """Merge the last decoded values of each block into a pack snapshot.
+
+    *sections* maps block keys to the output of decode_block and may hold
+    results from different polls; it is not modified.
+    """
+    values = {}
+    for section in sections.values():
+        values.update(section)
+    cells = values.pop("cell_voltages", None)
+    temperatures = values.pop("temperatures", None)
+    return PackSnapshot(values, cells, temperatures, CELL_VOLTAGES, TEMPERATURES)
@@ -0,0 +1,87 @@
+"""Seplos V3 register map and read planning.
+
+The map lists every block the integration reads: its Modbus function,
+start address and size. plan_reads() turns the blocks due on a poll
+into the fewest read requests: blocks read with the same function whose
+ranges touch or overlap are merged into one request (up to the Modbus
+per-request limit), blocks separated by a gap are read separately, so
+no unmapped address is ever requested.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from .data_parser import Buffer, build_read_command
+
+FC_READ_COILS = 0x01
+FC_READ_INPUT_REGISTERS = 0x04
+
+# Largest count a single request may ask for
+_MAX_COUNT = {FC_READ_COILS: 2000, FC_READ_INPUT_REGISTERS: 125}
+
+
+class RegisterBlock(NamedTuple):
+    """A contiguous range read and decoded as one unit."""
+
+    key: str
+    function: int
+    start: int
+    count: int  # registers, or bits for coil reads
+    optional: bool = False  # not implemented by every firmware
+
+
+# PIA: pack-level data; PIB: cell voltages and temperatures;
+# PIC: alarm and status flags (coils)
+V3_BLOCKS: Tuple[RegisterBlock, ...] = (
+    RegisterBlock("pia", FC_READ_INPUT_REGISTERS, 0x1000, 0x12),
+    RegisterBlock("pib", FC_READ_INPUT_REGISTERS, 0x1100, 0x1A),
+    RegisterBlock("pic", FC_READ_COILS, 0x1200, 0x90, optional=True),
+)
+
+V3_BLOCK_KEYS = tuple(block.key for block in V3_BLOCKS)
+
+
+class ReadRequest(NamedTuple):
+    """One Modbus read covering one or more blocks."""
+
+    function: int
+    start: int
+    count: int
+    blocks: Tuple[RegisterBlock, ...]
+
+    def command(self, address: int) -> bytes:
+        """Return the request for the pack at *address*."""
+        return build_read_command(address, self.start, self.count, self.function)
+
+    def split(self, data: Buffer) -> Dict[str, Buffer]:
+        """Cut the response data (without header and CRC) into blocks.
+
+        Register blocks are slices of *data*, so a memoryview stays
+        zero-copy.
+        """
+        blocks = {}
+        if self.function == FC_READ_COILS:
+            bits = int.from_bytes(data, "little")
+            for block in self.blocks:
+                value = (bits >> (block.start - self.start)) & ((1 << block.count) - 1)
+                blocks[block.key] = value.to_bytes((block.count + 7) // 8, "little")
+        else:
+            for block in self.blocks:
+                offset = (block.start - self.start) * 2
+                blocks[block.key] = data[offset:offset + block.count * 2]
+        return blocks
+
+
+def plan_reads(blocks: Iterable[RegisterBlock]) -> List[ReadRequest]:
+    """Return the read requests covering *blocks*, in address order."""
+    requests: List[ReadRequest] = []
+    for block in sorted(blocks, key=lambda b: (b.function, b.start)):
+        if requests:
+            last = requests[-1]
+            end = max(last.start + last.count, block.start + block.count)
+            if (last.function == block.function and block.start <= last.start + last.count
+                    and end - last.start <= _MAX_COUNT[block.function]):
+                requests[-1] = last._replace(count=end - last.start, blocks=last.blocks + (block,))
+                continue
+        requests.append(ReadRequest(block.function, block.start, block.count, (block,)))
+    requests.sort(key=lambda request: request.start)
+    return requests
@@ -2,14 +2,19 @@
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from ...const import DOMAIN, CONF_NAME_PREFIX
+from ...change_filter import ChangeFilteredEntity
+from ...entry_cache import stale_attributes
+from ...const import CONF_NAME_PREFIX
+from ...snapshot import make_accessor
+from ...utils import pack_id_suffix
+from .data_parser import CELL_VOLTAGES, PIC_START, TEMPERATURES
 import logging
 
+_LOGGER = logging.getLogger(__name__)
+
 
 # V3 sensor definitions: (key, display_name, unit, device_class, state_class)
 V3_SENSORS = [
@@ -43,52 +48,72 @@ for i in range(1, 5):
 V3_SENSORS.append(("environment_temperature", "Environment Temperature", "°C", SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT))
 V3_SENSORS.append(("power_temperature", "Power Temperature", "°C", SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT))
 
+# PIC alarm/status flags, one word per 16 coils
+for address in range(PIC_START, PIC_START + 0x90, 16):
+    V3_SENSORS.append((f"status_flags_{address:04x}", f"Status Flags 0x{address:04X}", None, None, None))
+
+V3_SENSOR_DEFS = {sensor_def[0]: sensor_def for sensor_def in V3_SENSORS}
+
 
-class SeplosV3Sensor(CoordinatorEntity, SensorEntity):
+class SeplosV3Sensor(ChangeFilteredEntity, CoordinatorEntity, SensorEntity):
     """Sensor for Seplos V3 data."""
 
-    def __init__(self, coordinator, key: str, config_entry: ConfigEntry, sensor_def: tuple) -> None:
+    def __init__(self, coordinator, key: str, config_entry: ConfigEntry, sensor_def: tuple,
+                 address: str | None = None) -> None:
         super().__init__(coordinator)
         self._key = key
         self.config_entry = config_entry
 
         name_prefix = config_entry.data.get(CONF_NAME_PREFIX, "Seplos BMS V3")
-        battery_address = config_entry.data.get("battery_address", "0x00")
+        battery_address = address or config_entry.data.get("battery_address", "0x00")
+        self._address = battery_address
         sensor_display_name = sensor_def[1]
 
+        # Additional packs on the same bus get the pack address in their ids
+        pack_suffix = pack_id_suffix(config_entry.data, battery_address, "0x01")
+
         self._attr_has_entity_name = False
         self._attr_name = f"{name_prefix} {battery_address} {sensor_display_name}"
-        self._attr_unique_id = f"seplos_v3_{config_entry.entry_id}_{key}"
+        self._attr_unique_id = f"seplos_v3_{config_entry.entry_id}{pack_suffix}_{key}"
         self._attr_native_unit_of_measurement = sensor_def[2]
         self._attr_device_class = sensor_def[3]
         self._attr_state_class = sensor_def[4]
 
         self._attr_device_info = DeviceInfo(
-            identifiers={("home_energy_hub", f"seplos_v3_{config_entry.entry_id}")},
-            name=f"{name_prefix}",
+            identifiers={("home_energy_hub", f"seplos_v3_{config_entry.entry_id}{pack_suffix}")},
+            name=f"{name_prefix} {battery_address}" if pack_suffix else f"{name_prefix}",
             manufacturer="Seplos",
             model="V3 BMS",
             sw_version="Unknown",
         )
+        self._read = make_accessor(key, CELL_VOLTAGES, TEMPERATURES)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the pack answered the last poll."""
+        return super().available and self._address in self.coordinator.data
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get(self._key)
+        snapshot = self.coordinator.data.get(self._address)
+        return self._read(snapshot) if snapshot is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Flag restored values until the first read."""
+        return stale_attributes(self.coordinator)
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Seplos V3 sensors from a config entry."""
-    _LOGGER = logging.getLogger(__name__)
+def build_sensors(coordinator, entry: ConfigEntry, schema: dict) -> list:
+    """Return the Seplos V3 sensors for the keys of every pack in *schema*."""
     _LOGGER.debug("Setting up Seplos V3 sensors for entry: %s", entry.entry_id)
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-
-    sensor_defs = {s[0]: s for s in V3_SENSORS}
-    sensors = [SeplosV3Sensor(coordinator, key, entry, sensor_defs[key]) for key in coordinator.data if key in sensor_defs]
+    sensors = [
+        SeplosV3Sensor(coordinator, key, entry, V3_SENSOR_DEFS[key], address)
+        for address, keys in schema.items()
+        for key in keys
+        if key in V3_SENSOR_DEFS
+    ]
 
     _LOGGER.info("Created %d V3 sensors", len(sensors))
-    async_add_entities(sensors)
+    return sensors
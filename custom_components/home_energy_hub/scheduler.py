@@ -0,0 +1,46 @@
+"""Per-command poll scheduling, shared by the Seplos integrations."""
+
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class CommandScheduler:
+    """Decide which commands are due on each poll.
+
+    Each code (a V2 CID2 code, a V3 register block) has its own refresh
+    interval in seconds. An interval of 0 means the command is sent on
+    every poll. Commands that have never been answered, or that were
+    requested on demand, are always due.
+    """
+
+    def __init__(self, intervals: Dict[str, float], order: Optional[Sequence[str]] = None) -> None:
+        self._intervals = intervals
+        self._order = tuple(order if order is not None else intervals)
+        self._last_polled: Dict[str, float] = {}
+        self._requested: set = set()
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Return the codes to send this poll, in protocol order."""
+        now = time.monotonic() if now is None else now
+        due = []
+        for code in self._order:
+            last = self._last_polled.get(code)
+            interval = self._intervals.get(code, 0)
+            if code in self._requested or last is None or now - last >= interval:
+                due.append(code)
+        return due
+
+    def mark_polled(self, code: str, now: Optional[float] = None) -> None:
+        """Record a successful response to *code*."""
+        self._last_polled[code] = time.monotonic() if now is None else now
+        self._requested.discard(code)
+
+    def defer(self, code: str, delay: float, now: Optional[float] = None) -> None:
+        """Hold *code* back for *delay* seconds, e.g. after it was rejected."""
+        now = time.monotonic() if now is None else now
+        self._last_polled[code] = now - self._intervals.get(code, 0) + delay
+        self._requested.discard(code)
+
+    def request(self, codes: Iterable[str]) -> None:
+        """Force *codes* to be sent on the next poll."""
+        self._requested.update(codes)
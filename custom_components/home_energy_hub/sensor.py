@@ -4,48 +4,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_INTEGRATION_TYPE, DOMAIN
+from .integrations import async_setup_platform_entities
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
-    """Set up sensors based on integration type."""
-    integration_type = entry.data.get(CONF_INTEGRATION_TYPE)
-
-    if integration_type == "geo_ihd":
-        from homeassistant.helpers import device_registry as dr
-        from .integrations.geo_ihd.sensor import GeoIhdSensor
-
-        coordinator = hass.data[DOMAIN][entry.entry_id]
-        device_registry = dr.async_get(hass)
-        username = entry.data.get("username")
-
-        # Register devices
-        device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={("home_energy_hub", "geo_ihd", entry.entry_id, username, "electric")},
-            manufacturer="Geo Home",
-            name=f"Geo IHD",
-            model="Geo IHD",
-            sw_version="v1.0",
-        )
-        device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={("home_energy_hub", "geo_ihd", entry.entry_id, username, "gas")},
-            manufacturer="Geo Home",
-            name=f"Geo IHD",
-            model="Geo IHD",
-            sw_version="v1.0",
-        )
-
-        async_add_entities([GeoIhdSensor(coordinator, key, entry.entry_id, username) for key in coordinator.data.keys()])
-    elif integration_type == "seplos_v2":
-        from .integrations.seplos_v2.sensor import SeplosV2Sensor
-
-        coordinator = hass.data[DOMAIN][entry.entry_id]
-        async_add_entities([SeplosV2Sensor(coordinator, key, entry) for key in coordinator.data.keys()])
-    elif integration_type == "seplos_v3":
-        from .integrations.seplos_v3.sensor import async_setup_entry as seplos_v3_async_setup_entry
-
-        await seplos_v3_async_setup_entry(hass, entry, async_add_entities)
+    """Set up sensors for the entry's integration."""
+    async_setup_platform_entities(hass, entry, "sensor", async_add_entities)
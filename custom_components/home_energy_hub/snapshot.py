@@ -0,0 +1,184 @@
+"""Compact per-pack data, shared by the Seplos integrations.
+
+A PackSnapshot holds one pack's values after a poll. Per-cell readings
+stay as the raw 16-bit words from the frame, in array('H'), and are only
+scaled when an entity reads them; every other value lives in one flat
+dict. Entities resolve their key once, at construction, into an accessor
+that reads the value straight from the array or the dict.
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+from functools import cache
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+_BIG_ENDIAN_HOST = sys.byteorder == "big"
+
+# Highest per-cell index given a key (the cell count is a single byte)
+_MAX_SERIES_LEN = 255
+
+
+def read_words(data, start: int, count: int) -> array:
+    """Return *count* big-endian uint16 values from *data* as an array('H')."""
+    words = array('H')
+    words.frombytes(data[start:start + 2 * count])
+    if not _BIG_ENDIAN_HOST:
+        words.byteswap()
+    return words
+
+
+class Series(NamedTuple):
+    """Entity keys and scaling of one array of raw words.
+
+    Word i is keyed key_format.format(i + 1), except the last
+    len(tail_keys) words, which take those keys in order.
+    """
+
+    key_format: str
+    scale: float = 1
+    offset: float = 0
+    digits: Optional[int] = None  # None keeps the integer result
+    tail_keys: Tuple[str, ...] = ()
+
+    def value(self, words: array, index: int) -> Any:
+        """Return the scaled value of word *index*, None if absent."""
+        if index >= 0:
+            if index >= len(words) - len(self.tail_keys):
+                return None
+        elif -index > len(words):
+            return None
+        value = words[index] * self.scale + self.offset
+        return value if self.digits is None else round(value, self.digits)
+
+
+@cache
+def series_keys(series: Series, count: int) -> Tuple[str, ...]:
+    """Return the keys of a *count* word array, in word order."""
+    tail = series.tail_keys[max(len(series.tail_keys) - count, 0):]
+    return tuple(series.key_format.format(i + 1) for i in range(count - len(tail))) + tail
+
+
+@cache
+def _series_index(series: Series) -> Dict[str, int]:
+    """Map every key *series* can produce to its word index."""
+    index = {series.key_format.format(i + 1): i for i in range(_MAX_SERIES_LEN)}
+    tail = len(series.tail_keys)
+    index.update({key: i - tail for i, key in enumerate(series.tail_keys)})
+    return index
+
+
+def series_index(series: Series, key: str) -> Optional[int]:
+    """Return the word index *key* reads in *series*, or None."""
+    if not series.key_format:
+        return None
+    return _series_index(series).get(key)
+
+
+# A series nothing is keyed by
+NO_SERIES = Series("")
+
+
+def make_accessor(key: str, cell_series: Series = NO_SERIES,
+                  temperature_series: Series = NO_SERIES) -> Callable[["PackSnapshot"], Any]:
+    """Return a function reading *key* from a PackSnapshot.
+
+    The key is matched against the series once, so the returned function
+    is a single index or dict lookup.
+    """
+    index = series_index(cell_series, key)
+    if index is not None:
+        return lambda snapshot: cell_series.value(snapshot.cells, index)
+    index = series_index(temperature_series, key)
+    if index is not None:
+        return lambda snapshot: temperature_series.value(snapshot.temperatures, index)
+    return lambda snapshot: snapshot.values.get(key)
+
+_EMPTY = array('H')
+
+
+class PackSnapshot(Mapping):
+    """One pack's values after a poll.
+
+    Reads like a dict of entity key to value, but per-cell values are
+    computed from the raw word arrays on access. *balancing* is a bit
+    mask of the cells being balanced, bit 0 for cell 1.
+    """
+
+    __slots__ = ("values", "cells", "temperatures", "cell_series", "temperature_series", "balancing")
+
+    def __init__(self, values: Dict[str, Any], cells: Optional[array] = None,
+                 temperatures: Optional[array] = None, cell_series: Series = NO_SERIES,
+                 temperature_series: Series = NO_SERIES, balancing: int = 0) -> None:
+        self.values = values
+        self.cells = _EMPTY if cells is None else cells
+        self.temperatures = _EMPTY if temperatures is None else temperatures
+        self.cell_series = cell_series
+        self.temperature_series = temperature_series
+        self.balancing = balancing
+
+    def accessor(self, key: str) -> Callable[["PackSnapshot"], Any]:
+        """Return a function reading *key* from snapshots laid out like this one."""
+        return make_accessor(key, self.cell_series, self.temperature_series)
+
+    def cell_attributes(self, index: int) -> Optional[Dict[str, bool]]:
+        """Return the lowest/highest/balancing state of cell *index*."""
+        cells = self.cells
+        if index >= len(cells):
+            return None
+        voltage = cells[index]
+        return {
+            'CELL_STATE_LOWEST': voltage == min(cells),
+            'CELL_STATE_HIGHEST': voltage == max(cells),
+            'CELL_STATE_BALANCING': bool(self.balancing & (1 << index)),
+        }
+
+    def as_stored(self) -> Dict[str, Any]:
+        """Return the snapshot as JSON-serialisable data (see from_stored)."""
+        return {
+            "values": self.values,
+            "cells": self.cells.tolist(),
+            "temperatures": self.temperatures.tolist(),
+            "balancing": self.balancing,
+        }
+
+    @classmethod
+    def from_stored(cls, stored: Mapping, cell_series: Series = NO_SERIES,
+                    temperature_series: Series = NO_SERIES) -> "PackSnapshot":
+        """Rebuild a snapshot from the output of as_stored."""
+        return cls(dict(stored["values"]), array('H', stored["cells"]), array('H', stored["temperatures"]),
+                   cell_series, temperature_series, stored.get("balancing", 0))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.values:
+            return self.values[key]
+        value = self.accessor(key)(self)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def _series_keys(self) -> Tuple[str, ...]:
+        return (series_keys(self.cell_series, len(self.cells))
+                + series_keys(self.temperature_series, len(self.temperatures)))
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.values
+        yield from self._series_keys()
+
+    def __len__(self) -> int:
+        return len(self.values) + len(self.cells) + len(self.temperatures)
+
+    def __repr__(self) -> str:
+        return f"PackSnapshot({dict(self)!r})"
+
+
+def dump_packs(data: Mapping[str, PackSnapshot]) -> Dict[str, Dict[str, Any]]:
+    """Return coordinator data keyed by pack address as JSON-serialisable data."""
+    return {address: snapshot.as_stored() for address, snapshot in data.items()}
+
+
+def load_packs(stored: Mapping[str, Mapping], cell_series: Series = NO_SERIES,
+               temperature_series: Series = NO_SERIES) -> Dict[str, PackSnapshot]:
+    """Rebuild the output of dump_packs."""
+    return {address: PackSnapshot.from_stored(pack, cell_series, temperature_series)
+            for address, pack in stored.items()}
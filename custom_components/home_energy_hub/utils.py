@@ -1,3 +1,27 @@
 """Utility functions for Home Energy Hub."""
 
-# Add helper functions here if needed
\ No newline at end of file
+from typing import Any, Dict, List
+
+from .const import CONF_BATTERY_ADDRESS, CONF_PACK_COUNT, DEFAULT_PACK_COUNT
+
+
+def get_pack_addresses(config: Dict[str, Any], default_address: str = "0x00") -> List[str]:
+    """Return the battery addresses polled by a config entry.
+
+    Packs sharing one RS485 bus use consecutive addresses starting at the
+    configured battery address.
+    """
+    base = int(config.get(CONF_BATTERY_ADDRESS, default_address), 0)
+    count = int(config.get(CONF_PACK_COUNT, DEFAULT_PACK_COUNT))
+    return [f"0x{base + i:02X}" for i in range(max(count, 1))]
+
+
+def pack_id_suffix(config: Dict[str, Any], address: str, default_address: str = "0x00") -> str:
+    """Return the unique-id/device suffix for the pack at *address*.
+
+    The first pack keeps the suffix-less ids used before multi-pack
+    support, so existing entities and devices are preserved.
+    """
+    if address == get_pack_addresses(config, default_address)[0]:
+        return ""
+    return f"_{address}"